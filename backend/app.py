@@ -6,6 +6,11 @@ from routes.auth_routes import auth_bp
 from routes.user_routes import user_bp
 from routes.resume_routes import resume_bp
 from routes.payment_routes import payment_bp
+from utils.upstream import upstream_client, upstream_breaker, upstream_bulkhead
+from utils.jobs import generation_jobs
+from utils.generation_cache import generation_cache
+from models.resume import download_counters
+from utils.upload import UploadRequest, upload_body_limit
 import os
 
 def create_app():
@@ -21,6 +26,12 @@ def create_app():
     # Load configuration
     app.config.from_object(Config)
     
+    # Uploads are parsed straight into spools (see utils/upload.py) and the body size
+    # is capped while it is read
+    app.request_class = UploadRequest
+    if not app.config.get('MAX_CONTENT_LENGTH'):
+        app.config['MAX_CONTENT_LENGTH'] = upload_body_limit()
+    
     # Enable CORS
     CORS(app, resources={
         r"/api/*": {
@@ -79,7 +90,13 @@ def create_app():
     def health():
         return jsonify({
             'status': 'healthy',
-            'database': 'connected'
+            'database': 'connected',
+            'upstream_pool': upstream_client.pool_stats(),
+            'upstream_circuit': upstream_breaker.stats(),
+            'upstream_bulkhead': upstream_bulkhead.stats(),
+            'generation_jobs': generation_jobs.stats(),
+            'generation_cache': generation_cache.stats(),
+            'download_counters': download_counters.stats()
         })
     
     # Error handlers
@@ -0,0 +1,32 @@
+"""
+Timing helpers shared by the benchmark scripts.
+"""
+import statistics
+import time
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (fraction 0.95 = p95)"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def time_runs(func, arg, runs, warmup=0):
+    """
+    Time func(arg).
+
+    Args:
+        warmup: Untimed calls first (caches, lazy imports, translation tables)
+
+    Returns:
+        tuple: (p50 ms, p95 ms)
+    """
+    for _ in range(warmup):
+        func(arg)
+    timings = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        func(arg)
+        timings.append((time.perf_counter() - began) * 1000)
+    timings.sort()
+    return statistics.median(timings), percentile(timings, 0.95)
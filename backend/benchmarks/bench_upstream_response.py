@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory and time of handling a generated-PDF response,
+old path (response.json(), str(), full b64decode for the size) vs the
+streamed low-copy path in utils/pdf_payload.py.
+
+Peak memory is measured with tracemalloc and includes the response body.
+
+Usage:
+    python benchmarks/bench_upstream_response.py [--sizes 100 1000 5000] [--runs 20]
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.pdf_payload import read_body, extract_pdf_bytes
+
+
+def make_response(body):
+    response = requests.models.Response()
+    response.status_code = 200
+    response.headers['Content-Length'] = str(len(body))
+    response.raw = BytesIO(body)
+    return response
+
+
+def legacy_handle(response):
+    """The previous send_to_aws_api / generate_resume response handling"""
+    response_data = response.json()
+    base64_pdf = response_data.get('pdf_base64') or response_data.get('body') or response_data
+    pdf_data = base64_pdf if isinstance(base64_pdf, str) else str(base64_pdf)
+    pdf_bytes = base64.b64decode(pdf_data)
+    return pdf_data, len(pdf_bytes)
+
+
+def new_handle(response):
+    body = read_body(response)
+    pdf_bytes = extract_pdf_bytes(body)
+    del body
+    return pdf_bytes, len(pdf_bytes)
+
+
+def measure(func, body, runs):
+    timings, peak = [], 0
+    for _ in range(runs):
+        response = make_response(body)
+        tracemalloc.start()
+        began = time.perf_counter()
+        result = func(response)
+        timings.append((time.perf_counter() - began) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del result
+    return statistics.median(timings), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000], help='PDF sizes in KB')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'PDF KB':>7} {'legacy p50':>11} {'new p50':>9} {'legacy peak':>12} {'new peak':>10} {'peak ratio':>11}")
+    for size_kb in args.sizes:
+        pdf = b'%PDF-1.4\n' + os.urandom(size_kb * 1024)
+        body = json.dumps({'pdf_base64': base64.b64encode(pdf).decode('ascii')}).encode()
+        legacy_pdf, legacy_size = legacy_handle(make_response(body))
+        assert new_handle(make_response(body)) == (base64.b64decode(legacy_pdf), legacy_size)
+        legacy_ms, legacy_mb = measure(legacy_handle, body, args.runs)
+        new_ms, new_mb = measure(new_handle, body, args.runs)
+        print(f"{size_kb:>7} {legacy_ms:>9.2f}ms {new_ms:>7.2f}ms {legacy_mb:>10.2f}MB {new_mb:>8.2f}MB "
+              f"{legacy_mb / new_mb:>10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
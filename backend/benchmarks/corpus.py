@@ -0,0 +1,230 @@
+"""
+Synthetic resume corpus for the extraction benchmarks.
+
+Documents are generated on the fly so the corpus needs no binary fixtures:
+PDFs come from a minimal PDF writer (Helvetica, one or two columns), DOCX
+from python-docx and DOC from a minimal OLE2 + FIB writer. Text is seeded
+from the resumes in extracted_texts/ when present.
+"""
+import glob
+import os
+import struct
+import textwrap
+from io import BytesIO
+
+import docx
+
+EXTRACTED_TEXTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'extracted_texts')
+
+_FALLBACK_SEED = """Jane Doe
+Senior Software Engineer
+jane.doe@example.com | +1 555 0100 | github.com/janedoe
+Professional Summary
+Engineer with eight years of experience building web services, data pipelines and developer tooling.
+Experience
+Led the migration of a monolith to services, cutting p95 latency by 40 percent.
+Built a document processing pipeline handling two million files per day.
+Education
+B.Sc. Computer Science, State University
+Technical Skills
+Python, Go, TypeScript, PostgreSQL, MongoDB, Redis, Kubernetes, AWS"""
+
+
+def load_seed_lines():
+    """Resume lines taken from extracted_texts/ (falls back to a built-in resume)"""
+    lines = []
+    for path in sorted(glob.glob(os.path.join(EXTRACTED_TEXTS_DIR, '*.txt'))):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        start = content.find('RESUME TEXT:')
+        end = content.find('JOB DESCRIPTION:')
+        if start == -1:
+            continue
+        body = content[start:end if end != -1 else None].splitlines()[2:]
+        lines.extend(line for line in body if line.strip() and not line.startswith('='))
+    return lines or _FALLBACK_SEED.splitlines()
+
+
+def _take(seed, count, offset=0):
+    return [seed[(offset + i) % len(seed)] for i in range(count)]
+
+
+# --- PDF ----------------------------------------------------------------------
+
+def _pdf_escape(text):
+    text = text.encode('cp1252', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(pages, columns=1, padding=0):
+    """
+    Build a PDF with one text block per page.
+
+    Args:
+        pages: list of pages, each a list of text lines
+        columns: 1, or 2 for a two-column layout (lines alternate between columns)
+        padding: size in bytes of an unreferenced filler stream (stands in for fonts/images)
+    """
+    width = 90 if columns == 1 else 45
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for lines in pages:
+        wrapped = [part for line in lines for part in textwrap.wrap(line, width) or ['']]
+        ops = ['BT', '/F1 10 Tf']
+        for i, line in enumerate(wrapped):
+            column, row = (0, i) if columns == 1 else (i % 2, i // 2)
+            ops.append(f"1 0 0 1 {50 + column * 280} {750 - row * 13} Tm ({_pdf_escape(line)}) Tj")
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1')
+
+        page_number = len(objects) + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(f"{page_number} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+    if padding > 0:
+        objects.append(b"<< /Length %d >>\nstream\n" % padding + b"0" * padding + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b''.join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# --- DOCX ---------------------------------------------------------------------
+
+def build_docx(lines, tables=0, header=True):
+    """Build a DOCX with body paragraphs, an optional header and skills tables"""
+    document = docx.Document()
+    if header:
+        document.sections[0].header.paragraphs[0].text = lines[0]
+    for line in lines:
+        document.add_paragraph(line)
+    for t in range(tables):
+        table = document.add_table(rows=6, cols=3)
+        for row in range(6):
+            for col in range(3):
+                table.cell(row, col).text = lines[(t * 18 + row * 3 + col) % len(lines)][:40]
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+# --- DOC (Word 97-2003) ---------------------------------------------------------
+
+_SECTOR = 512
+_ENDOFCHAIN = 0xFFFFFFFE
+_FREESECT = 0xFFFFFFFF
+_FATSECT = 0xFFFFFFFD
+_NOSTREAM = 0xFFFFFFFF
+
+
+def _compound_file(streams):
+    """Write a version 3 OLE2 compound file holding the given {name: bytes} streams"""
+    sectors, fat = [], {}
+
+    def write_chain(data):
+        count = max(1, -(-len(data) // _SECTOR))
+        start = len(sectors)
+        for i in range(count):
+            sectors.append(data[i * _SECTOR:(i + 1) * _SECTOR].ljust(_SECTOR, b'\0'))
+            fat[start + i] = start + i + 1 if i < count - 1 else _ENDOFCHAIN
+        return start
+
+    mini, minifat, entries = b'', [], []
+    for name, data in streams.items():
+        if len(data) < 4096:
+            start, count = len(minifat), max(1, -(-len(data) // 64))
+            minifat.extend(start + i + 1 if i < count - 1 else _ENDOFCHAIN for i in range(count))
+            mini += data.ljust(count * 64, b'\0')
+        else:
+            start = write_chain(data)
+        entries.append((name, start, len(data)))
+
+    mini_start = write_chain(mini) if mini else _ENDOFCHAIN
+    minifat_start = write_chain(struct.pack(f'<{len(minifat)}I', *minifat)) if minifat else _ENDOFCHAIN
+
+    def entry(name, kind, start, size, child=_NOSTREAM, right=_NOSTREAM):
+        encoded = name.encode('utf-16-le') + b'\0\0'
+        return (encoded.ljust(64, b'\0') + struct.pack('<HBB', len(encoded), kind, 1)
+                + struct.pack('<III', _NOSTREAM, right, child) + b'\0' * 36
+                + struct.pack('<IQ', start, size))
+
+    directory = entry('Root Entry', 5, mini_start, len(mini), child=1)
+    for i, (name, start, size) in enumerate(entries):
+        directory += entry(name, 2, start, size, right=i + 2 if i + 1 < len(entries) else _NOSTREAM)
+    dir_start = write_chain(directory)
+
+    fat_sectors = 1
+    while (len(sectors) + fat_sectors) * 4 > fat_sectors * _SECTOR:
+        fat_sectors += 1
+    first_fat = len(sectors)
+    for i in range(fat_sectors):
+        fat[first_fat + i] = _FATSECT
+    table = [fat.get(i, _FREESECT) for i in range(fat_sectors * _SECTOR // 4)]
+    raw_fat = struct.pack(f'<{len(table)}I', *table)
+    sectors.extend(raw_fat[i * _SECTOR:(i + 1) * _SECTOR] for i in range(fat_sectors))
+
+    difat = [first_fat + i for i in range(fat_sectors)] + [_FREESECT] * (109 - fat_sectors)
+    header = (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\0' * 16
+              + struct.pack('<HHHHH', 0x3E, 3, 0xFFFE, 9, 6) + b'\0' * 6
+              + struct.pack('<9I', 0, fat_sectors, dir_start, 0, 4096, minifat_start,
+                            1 if minifat else 0, _ENDOFCHAIN, 0)
+              + struct.pack('<109I', *difat))
+    return header + b''.join(sectors)
+
+
+def build_doc(lines):
+    """Build a Word 97 .doc whose main story is the given paragraphs (one cp1252 piece)"""
+    text = '\r'.join(lines).encode('cp1252', 'replace') + b'\r'
+    fib = bytearray(1024)
+    struct.pack_into('<HH', fib, 0, 0xA5EC, 0x00C1)
+    struct.pack_into('<H', fib, 0x0A, 0x0200)  # fWhichTblStm -> 1Table
+    struct.pack_into('<H', fib, 32, 14)        # csw
+    struct.pack_into('<H', fib, 62, 22)        # cslw
+    struct.pack_into('<i', fib, 64 + 3 * 4, len(text))  # ccpText
+    struct.pack_into('<H', fib, 152, 93)       # cbRgFcLcb
+
+    plc = struct.pack('<II', 0, len(text)) + struct.pack('<HIH', 0, (len(fib) * 2) | 0x40000000, 0)
+    clx = b'\x02' + struct.pack('<I', len(plc)) + plc
+    struct.pack_into('<II', fib, 154 + 33 * 8, 0, len(clx))  # fcClx / lcbClx
+
+    word = (bytes(fib) + text).ljust(4096, b'\0')
+    return _compound_file({'WordDocument': word, '1Table': clx})
+
+
+# --- Corpus -------------------------------------------------------------------
+
+def build_corpus():
+    """
+    Build the benchmark corpus.
+
+    Returns:
+        list of dicts: {'name', 'kind' ('pdf'/'docx'/'doc'), 'data'}
+    """
+    seed = load_seed_lines()
+    corpus = []
+    for label, pages in (('1p', 1), ('3p', 3), ('10p', 10)):
+        page_lines = [_take(seed, 50, offset=p * 50) for p in range(pages)]
+        corpus.append({'name': f'pdf-{label}-1col', 'kind': 'pdf', 'data': build_pdf(page_lines)})
+        corpus.append({'name': f'pdf-{label}-2col', 'kind': 'pdf',
+                       'data': build_pdf(page_lines, columns=2)})
+    for label, count, tables in (('short', 40, 0), ('long', 300, 2), ('tables', 80, 8)):
+        corpus.append({'name': f'docx-{label}', 'kind': 'docx',
+                       'data': build_docx(_take(seed, count), tables=tables)})
+    for label, count in (('short', 40), ('long', 300)):
+        corpus.append({'name': f'doc-{label}', 'kind': 'doc', 'data': build_doc(_take(seed, count))})
+    return corpus
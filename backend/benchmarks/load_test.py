@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test for the resume API.
+
+Starts user flows at a fixed target rate (open loop, so a slow server does
+not slow the arrivals down) against a running backend. Each flow:
+    register -> login -> process (PDF upload) -> generate -> download
+Generation is followed through its job status endpoint until it finishes.
+Reports throughput, error counts and p50/p95/p99 latency per endpoint, plus
+how late flows started when the client itself ran out of workers.
+
+Run the backend against the local stand-in, not the real AWS endpoint:
+    python benchmarks/upstream_stub.py --latency 8 --jitter 4 --pdf-kb 120
+    AWS_RESUME_API=http://127.0.0.1:8765/ python app.py
+    python benchmarks/load_test.py --rate 2 --duration 60
+
+Registration creates real users in the configured database; use a test
+database. --email-domain must pass email validation (deliverability).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks._util import percentile
+from benchmarks.corpus import build_pdf, load_seed_lines
+
+ENDPOINTS = ('register', 'login', 'process', 'generate', 'generation-status',
+             'generate (end to end)', 'download')
+
+
+class Recorder:
+    """Thread-safe latency / status recorder per endpoint"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.flows = {'started': 0, 'completed': 0, 'failed': 0}
+        self.start_lag = []
+
+    def record(self, endpoint, status, seconds):
+        with self.lock:
+            self.timings[endpoint].append(seconds * 1000)
+            self.statuses[endpoint][status] += 1
+
+    def flow(self, outcome):
+        with self.lock:
+            self.flows[outcome] += 1
+
+
+class FlowError(Exception):
+    pass
+
+
+def timed(recorder, endpoint, session, method, url, ok=(200,), **kwargs):
+    began = time.perf_counter()
+    try:
+        response = session.request(method, url, **kwargs)
+        status = response.status_code
+    except requests.RequestException as e:
+        recorder.record(endpoint, type(e).__name__, time.perf_counter() - began)
+        raise FlowError(f"{endpoint}: {type(e).__name__}")
+    recorder.record(endpoint, status, time.perf_counter() - began)
+    if status not in ok:
+        raise FlowError(f"{endpoint}: HTTP {status}")
+    return response
+
+
+def run_flow(args, recorder, pdf_bytes, flow_id):
+    """One register -> login -> process -> generate -> download flow"""
+    base = args.base_url.rstrip('/')
+    email = f"loadtest-{flow_id}@{args.email_domain}"
+    session = requests.Session()
+    timeout = args.request_timeout
+
+    timed(recorder, 'register', session, 'POST', f"{base}/api/auth/register", ok=(201,), timeout=timeout,
+          json={'name': 'Load Test', 'email': email, 'password': args.password})
+    login = timed(recorder, 'login', session, 'POST', f"{base}/api/auth/login", timeout=timeout,
+                  json={'email': email, 'password': args.password})
+    auth = {'Authorization': f"Bearer {login.json()['token']}"}
+
+    timed(recorder, 'process', session, 'POST', f"{base}/api/resume/process", headers=auth, timeout=timeout,
+          data={'jobDescription': args.job_description},
+          files={'resumeFile': ('resume.pdf', pdf_bytes, 'application/pdf')})
+
+    began = time.perf_counter()
+    generate = timed(recorder, 'generate', session, 'POST', f"{base}/api/resume/generate-resume",
+                     ok=(200, 202), headers=auth, timeout=timeout,
+                     json={'job_description': f"{args.job_description} #{flow_id}"})
+    data = generate.json()['data']
+    if generate.status_code == 202:
+        deadline = time.monotonic() + args.generation_timeout
+        while True:
+            if time.monotonic() > deadline:
+                recorder.record('generate (end to end)', 'timeout', time.perf_counter() - began)
+                raise FlowError('generate: job did not finish in time')
+            time.sleep(args.poll_interval)
+            job = timed(recorder, 'generation-status', session, 'GET', f"{base}{data['status_url']}",
+                        headers=auth, timeout=timeout).json()['data']
+            if job['status'] in ('succeeded', 'failed'):
+                break
+        recorder.record('generate (end to end)', job['status'], time.perf_counter() - began)
+        if job['status'] == 'failed':
+            raise FlowError(f"generate: {job.get('error', 'failed')[:80]}")
+        data = job['result']
+    else:
+        recorder.record('generate (end to end)', generate.status_code, time.perf_counter() - began)
+
+    if data.get('resume_id'):
+        timed(recorder, 'download', session, 'GET', f"{base}/api/resume/download/{data['resume_id']}",
+              headers=auth, timeout=timeout)
+
+
+def summarize(recorder, elapsed):
+    summary = {}
+    for endpoint in ENDPOINTS:
+        timings = sorted(recorder.timings.get(endpoint, []))
+        if not timings:
+            continue
+        statuses = {str(k): v for k, v in recorder.statuses[endpoint].items()}
+        summary[endpoint] = {
+            'requests': len(timings),
+            'throughput_per_sec': round(len(timings) / elapsed, 2),
+            'statuses': statuses,
+            'p50_ms': round(statistics.median(timings), 1),
+            'p95_ms': round(percentile(timings, 0.95), 1),
+            'p99_ms': round(percentile(timings, 0.99), 1),
+            'max_ms': round(timings[-1], 1),
+        }
+    return summary
+
+
+def print_summary(summary, recorder, elapsed):
+    print(f"\n{'endpoint':<24} {'reqs':>6} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses")
+    for endpoint, row in summary.items():
+        print(f"{endpoint:<24} {row['requests']:>6} {row['throughput_per_sec']:>7.2f} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}  {row['statuses']}")
+    lag = sorted(recorder.start_lag)
+    print(f"\nFlows: {recorder.flows} in {elapsed:.1f}s")
+    if lag:
+        print(f"Flow start lag: p50 {statistics.median(lag):.1f}ms, max {lag[-1]:.1f}ms "
+              "(high values mean the client, not the server, was the bottleneck)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--rate', type=float, default=1.0, help='flows started per second')
+    parser.add_argument('--duration', type=float, default=60, help='seconds to keep starting flows')
+    parser.add_argument('--max-in-flight', type=int, default=200, help='client worker threads')
+    parser.add_argument('--email-domain', default='gmail.com')
+    parser.add_argument('--password', default='loadtest-password')
+    parser.add_argument('--job-description', default='Senior backend engineer, Python, AWS')
+    parser.add_argument('--pages', type=int, default=2, help='pages in the uploaded resume PDF')
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--request-timeout', type=float, default=120)
+    parser.add_argument('--generation-timeout', type=float, default=300)
+    parser.add_argument('--output', help='also write the summary to this JSON file')
+    args = parser.parse_args()
+
+    seed = load_seed_lines()
+    pdf_bytes = build_pdf([[seed[(p * 50 + i) % len(seed)] for i in range(50)] for p in range(args.pages)])
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    total = max(1, int(args.rate * args.duration))
+
+    def flow(n, scheduled):
+        with recorder.lock:
+            recorder.start_lag.append(max(0.0, time.perf_counter() - scheduled) * 1000)
+        recorder.flow('started')
+        try:
+            run_flow(args, recorder, pdf_bytes, f"{run_id}-{n}")
+            recorder.flow('completed')
+        except (FlowError, ValueError, KeyError) as e:
+            recorder.flow('failed')
+            print(f"✗ Flow {n} failed: {str(e)}")
+
+    print(f"Starting {total} flows at {args.rate}/s against {args.base_url} (run {run_id})")
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.max_in_flight) as executor:
+        for n in range(total):
+            scheduled = began + n / args.rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(flow, n, scheduled)
+    elapsed = time.perf_counter() - began
+
+    summary = summarize(recorder, elapsed)
+    print_summary(summary, recorder, elapsed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'args': vars(args), 'flows': recorder.flows, 'elapsed_s': round(elapsed, 2),
+                       'endpoints': summary}, f, indent=2)
+    return 0 if recorder.flows['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmark suite.
+
+Times the resume extractors (the utils.extraction entry points
+/api/resume/process uses, so the process pool is included) over the
+synthetic corpus in benchmarks/corpus.py and reports, per extractor and
+document:
+    - p50 / p95 latency
+    - peak RSS (this process or the busiest extraction worker)
+    - throughput per core with the pool saturated
+
+Results are compared with a baseline recorded on the same machine; any p50
+slower or throughput lower than the tolerance allows fails the run (exit
+code 1), so slowdowns are caught before deployment. Absolute timings only
+mean something on the hardware they were measured on, so baselines are not
+kept in the repository: record one with --update-baseline on the machine
+that runs the gate (the default path is git-ignored). Without a usable
+baseline (none, or one from a different machine/configuration) the gate
+cannot check anything and fails with exit code 2, unless
+--allow-missing-baseline is given. See benchmarks/README.md for how CI
+records its own baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--runs 20] [--tolerance 0.25]
+    python benchmarks/run_benchmarks.py --update-baseline
+    python benchmarks/run_benchmarks.py --allow-missing-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks._util import time_runs
+from benchmarks.corpus import build_corpus
+from utils import extraction
+from utils.extraction import extract_pdf_text, extract_docx_text, extract_doc_text, EXTRACTION_WORKERS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Extractors timed for each document kind
+EXTRACTORS = {
+    'pdf': [
+        ('extract_pdf_text', extract_pdf_text),
+        ('pdf_layout_only', partial(extract_pdf_text, mode='layout')),
+    ],
+    'docx': [('extract_docx_text', extract_docx_text)],
+    'doc': [('extract_doc_text', extract_doc_text)],
+}
+
+
+def _worker_peak_rss_kb():
+    """Peak RSS (VmHWM) of the live extraction workers; Linux only"""
+    pool = extraction._pool
+    peak = 0
+    for pid in (pool.worker_pids() if pool is not None else []):
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        peak = max(peak, int(line.split()[1]))
+        except OSError:
+            pass
+    return peak
+
+
+def peak_rss_mb():
+    """High-water RSS of this process and of the busiest extraction worker, in MB"""
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        own //= 1024  # bytes on macOS, KB elsewhere
+    return round(max(own, _worker_peak_rss_kb()) / 1024, 1)
+
+
+def bench_latency(func, data, runs, warmup=2):
+    for _ in range(warmup):
+        if not func(data):
+            raise RuntimeError("Extractor returned no text")
+    p50, p95 = time_runs(func, data, runs)
+    return {
+        'p50_ms': round(p50, 3),
+        'p95_ms': round(p95, 3),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_throughput(func, documents, rounds):
+    """Docs/second per pool worker with enough concurrent callers to keep every worker busy"""
+    jobs = [doc['data'] for doc in documents] * rounds
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=EXTRACTION_WORKERS * 2) as executor:
+        list(executor.map(func, jobs))
+    elapsed = time.perf_counter() - began
+    cores = max(1, min(EXTRACTION_WORKERS, os.cpu_count() or 1))
+    return round(len(jobs) / elapsed / cores, 2)
+
+
+def run_suite(runs, rounds):
+    corpus = build_corpus()
+    results = {}
+    for kind, extractors in EXTRACTORS.items():
+        documents = [doc for doc in corpus if doc['kind'] == kind]
+        for extractor_name, func in extractors:
+            for doc in documents:
+                key = f"{extractor_name}:{doc['name']}"
+                results[key] = bench_latency(func, doc['data'], runs)
+                results[key]['size_kb'] = round(len(doc['data']) / 1024, 1)
+                print_row(key, results[key])
+            key = f"{extractor_name}:throughput"
+            results[key] = {'docs_per_sec_per_core': bench_throughput(func, documents, rounds)}
+            print(f"{key:<44} {results[key]['docs_per_sec_per_core']:>10.2f} docs/s/core")
+    return results
+
+
+def print_row(key, row):
+    rss = f"{row['peak_rss_mb']:.1f}MB" if row['peak_rss_mb'] is not None else 'n/a'
+    print(f"{key:<44} p50 {row['p50_ms']:>9.2f}ms  p95 {row['p95_ms']:>9.2f}ms  peak RSS {rss}")
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'extraction_workers': EXTRACTION_WORKERS,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions against the baseline"""
+    regressions = []
+    for key, base in baseline.get('results', {}).items():
+        current = results.get(key)
+        if current is None:
+            continue
+        if 'p50_ms' in base and current['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{key}: p50 {current['p50_ms']:.2f}ms vs baseline {base['p50_ms']:.2f}ms")
+        if 'docs_per_sec_per_core' in base and \
+                current['docs_per_sec_per_core'] < base['docs_per_sec_per_core'] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {current['docs_per_sec_per_core']:.2f} docs/s/core "
+                f"vs baseline {base['docs_per_sec_per_core']:.2f}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resume extraction benchmark suite')
+    parser.add_argument('--runs', type=int, default=20, help='timed runs per document')
+    parser.add_argument('--rounds', type=int, default=5, help='corpus passes for the throughput test')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--output', help='also write results to this JSON file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--allow-missing-baseline', action='store_true',
+                        help='report only (exit 0) when there is no baseline for this machine')
+    args = parser.parse_args()
+
+    print(f"Machine: {machine_info()}\n")
+    results = run_suite(args.runs, args.rounds)
+    report = {'machine': machine_info(), 'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Baseline written to {args.baseline}")
+        return 0
+
+    problem = None
+    if not os.path.exists(args.baseline):
+        problem = f"No baseline at {args.baseline}"
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('machine') != machine_info():
+            problem = f"Baseline was recorded on a different machine/configuration: {baseline.get('machine')}"
+    if problem:
+        if args.allow_missing_baseline:
+            print(f"\n[WARNING] {problem} - gate skipped (--allow-missing-baseline)")
+            return 0
+        print(f"\n✗ {problem} - nothing to compare against")
+        print("   Record one on this machine with --update-baseline (see benchmarks/README.md)")
+        return 2
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"\n[OK] No regressions beyond {args.tolerance:.0%} against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the resume-generation API, with latency and error injection.
+
+Speaks the same JSON contract as the AWS endpoint: POST
+{"resume_data": ..., "job_description": ...} returns {"pdf_base64": ...}
+(or {"body": ...} with --response-field body) holding a real PDF of the
+submitted text, padded to --pdf-kb. Gzip request bodies
+(Content-Encoding: gzip) are accepted. Faults can be injected from the
+command line or changed while it runs, so the circuit breaker and bulkhead
+in utils/circuit_breaker.py can be exercised offline; with realistic
+latency and PDF size it is the upstream for benchmarks/load_test.py.
+
+Usage:
+    python benchmarks/upstream_stub.py [--port 8765] [--latency 0.5] [--jitter 0.2]
+                                       [--pdf-kb 120] [--response-field pdf_base64|body]
+                                       [--error-rate 0.3] [--error-status 502]
+                                       [--hang-rate 0.1] [--hang 90]
+
+    # Point the backend at it
+    AWS_RESUME_API=http://127.0.0.1:8765/ python app.py
+
+    # Change faults while it runs / read counters
+    curl -X POST localhost:8765/__control -d '{"error_rate": 1.0}'
+    curl localhost:8765/__control
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.corpus import build_pdf
+
+CONTROL_PATH = '/__control'
+
+
+class StubState:
+    """Fault settings and counters shared by the handler threads"""
+
+    SETTINGS = ('latency', 'jitter', 'pdf_kb', 'response_field',
+                'error_rate', 'error_status', 'hang_rate', 'hang')
+
+    def __init__(self, latency=0.5, jitter=0.0, pdf_kb=0.0, response_field='pdf_base64',
+                 error_rate=0.0, error_status=500, hang_rate=0.0, hang=90.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.pdf_kb = pdf_kb
+        self.response_field = response_field
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        self.hang = hang
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'ok': 0, 'errors': 0, 'hangs': 0, 'bad_requests': 0,
+                         'bytes_received': 0}
+
+    def update(self, changes):
+        with self.lock:
+            for name in self.SETTINGS:
+                if name in changes:
+                    setattr(self, name, type(getattr(self, name))(changes[name]))
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def count_bytes(self, size):
+        with self.lock:
+            self.counters['bytes_received'] += size
+
+    def snapshot(self):
+        with self.lock:
+            settings = {name: getattr(self, name) for name in self.SETTINGS}
+            return {'settings': settings, 'counters': dict(self.counters)}
+
+
+def make_handler(state):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like API Gateway
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length)
+            state.count_bytes(len(body))
+            if self.headers.get('Content-Encoding', '').lower() == 'gzip':
+                try:
+                    body = gzip.decompress(body)
+                except (OSError, EOFError):
+                    raise ValueError('Invalid gzip body')
+            return json.loads(body or b'{}')
+
+        def do_GET(self):
+            if self.path == CONTROL_PATH:
+                self._send_json(200, state.snapshot())
+            else:
+                self._send_json(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            try:
+                payload = self._read_json()
+            except ValueError:
+                state.count('bad_requests')
+                self._send_json(400, {'error': 'Invalid JSON'})
+                return
+
+            if self.path == CONTROL_PATH:
+                state.update(payload)
+                self._send_json(200, state.snapshot())
+                return
+
+            state.count('requests')
+            if not isinstance(payload.get('resume_data'), str) or not payload['resume_data'].strip():
+                state.count('bad_requests')
+                self._send_json(400, {'error': 'resume_data is required'})
+                return
+
+            with state.lock:
+                latency = max(0.0, state.latency + random.uniform(-state.jitter, state.jitter))
+                hang = random.random() < state.hang_rate
+                fail = not hang and random.random() < state.error_rate
+                hang_seconds, error_status = state.hang, state.error_status
+                pdf_kb, response_field = state.pdf_kb, state.response_field
+
+            if hang:
+                state.count('hangs')
+                time.sleep(hang_seconds)  # Longer than the client's read timeout
+            time.sleep(latency)
+
+            if fail:
+                state.count('errors')
+                self._send_json(error_status, {'error': 'Injected upstream failure'})
+                return
+
+            lines = payload['resume_data'].splitlines() or ['']
+            pages = [lines[i:i + 50] for i in range(0, len(lines), 50)]
+            pdf = build_pdf(pages)
+            if len(pdf) < pdf_kb * 1024:
+                pdf = build_pdf(pages, padding=int(pdf_kb * 1024) - len(pdf))
+            state.count('ok')
+            self._send_json(200, {response_field: base64.b64encode(pdf).decode('ascii')})
+
+    return StubHandler
+
+
+def start_stub(port=0, **settings):
+    """
+    Start the stub in a background thread.
+
+    Returns:
+        tuple: (server, state, url) - call server.shutdown() to stop it
+    """
+    state = StubState(**settings)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_port}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- seconds added to latency')
+    parser.add_argument('--pdf-kb', type=float, default=0.0, help='pad generated PDFs to at least this size')
+    parser.add_argument('--response-field', choices=['pdf_base64', 'body'], default='pdf_base64')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='fraction that stall for --hang seconds')
+    parser.add_argument('--hang', type=float, default=90.0)
+    args = parser.parse_args()
+
+    server, state, url = start_stub(
+        port=args.port, latency=args.latency, jitter=args.jitter, pdf_kb=args.pdf_kb,
+        response_field=args.response_field, error_rate=args.error_rate,
+        error_status=args.error_status, hang_rate=args.hang_rate, hang=args.hang
+    )
+    print(f"[OK] Upstream stub listening on {url}")
+    print(f"     Settings: {state.snapshot()['settings']}")
+    print(f"     Control:  {url.rstrip('/')}{CONTROL_PATH}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\nCounters: {state.snapshot()['counters']}")
+
+
+if __name__ == '__main__':
+    main()
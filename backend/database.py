@@ -28,9 +28,15 @@ class Database:
             
             Database.db = Database.client[Config.MONGODB_DATABASE]
             
-            # Create indexes
-            Database.db.users.create_index('email', unique=True)
-            
+            # Create missing indexes from the registry in indexes.py. A failure here (an index
+            # with the same keys under another name, no createIndex rights) must not take
+            # the connection down: log it and leave it to `python indexes.py apply`
+            try:
+                from indexes import apply_indexes
+                apply_indexes(Database.db)
+            except Exception as e:
+                print(f"[WARNING] Index creation failed, continuing without it: {str(e)}")
+
             print(f"[OK] Connected to MongoDB: {Config.MONGODB_DATABASE}")
             return True
             
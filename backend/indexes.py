@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Declarative MongoDB index registry.
+
+INDEXES lists every index the app relies on, per collection, with the
+queries it serves. apply_indexes() creates the missing ones; it runs at
+startup (Database.initialize) and from the command line. HOT_QUERIES are
+the queries on the request path; check_query_plans() explains each of
+them and reports any that would scan the whole collection (COLLSCAN),
+so a new query pattern without an index fails the check instead of
+slowing down as the collections grow.
+
+Usage:
+    python indexes.py list     # registry vs indexes present in the database
+    python indexes.py apply    # create missing indexes
+    python indexes.py check    # explain hot queries; exit 1 on any COLLSCAN
+"""
+import sys
+from datetime import datetime
+
+from bson.objectid import ObjectId
+from pymongo import IndexModel
+
+INDEXES = {
+    'users': [
+        {'keys': [('email', 1)], 'unique': True,
+         'serves': 'login, registration duplicate check'},
+    ],
+    'resumes': [
+        {'keys': [('user_id', 1), ('created_at', -1), ('_id', -1)],
+         'serves': 'history pages (keyset on created_at, _id), user stats rebuild $match'},
+        {'keys': [('user_id', 1), ('resume_hash', 1), ('job_description_hash', 1), ('created_at', -1)],
+         'serves': 'generation cache lookup'},
+    ],
+}
+
+
+def _index_name(keys):
+    """Name MongoDB gives an index by default (so indexes created earlier are recognized)"""
+    return '_'.join(f"{field}_{direction}" for field, direction in keys)
+
+
+def apply_indexes(db, verbose=True):
+    """
+    Create every registered index that is missing.
+
+    Args:
+        db: pymongo Database
+
+    Returns:
+        dict: collection -> {'created': [...], 'present': [...], 'unmanaged': [...]}
+    """
+    report = {}
+    for collection_name, specs in INDEXES.items():
+        collection = db[collection_name]
+        existing = set(collection.index_information())
+        models = []
+        for spec in specs:
+            options = {key: value for key, value in spec.items() if key not in ('keys', 'serves')}
+            models.append(IndexModel(spec['keys'], name=_index_name(spec['keys']), **options))
+        missing = [model for model in models if model.document['name'] not in existing]
+        if missing:
+            collection.create_indexes(missing)
+
+        names = [model.document['name'] for model in models]
+        report[collection_name] = {
+            'created': [name for name in names if name not in existing],
+            'present': [name for name in names if name in existing],
+            'unmanaged': sorted(existing - set(names) - {'_id_'}),
+        }
+        if verbose:
+            for name in report[collection_name]['created']:
+                print(f"[OK] Created index {collection_name}.{name}")
+            for name in report[collection_name]['unmanaged']:
+                print(f"[WARNING] Index {collection_name}.{name} is not in the registry")
+    return report
+
+
+def hot_queries():
+    """
+    The queries on the request path, with representative values.
+
+    Returns:
+        list: dicts with name, collection and either find (filter, projection, sort, limit)
+            or pipeline (aggregate)
+    """
+    from models.resume import Resume
+    from utils.pagination import encode_cursor, keyset_query
+
+    user_id = str(ObjectId())
+    history = {'user_id': user_id}
+    return [
+        {'name': 'user by email', 'collection': 'users',
+         'filter': {'email': 'someone@example.com'}},
+        {'name': 'user by id', 'collection': 'users',
+         'filter': {'_id': ObjectId()}},
+        {'name': 'resume history, first page', 'collection': 'resumes',
+         'filter': history, 'projection': Resume.SUMMARY_PROJECTION,
+         'sort': [('created_at', -1), ('_id', -1)], 'limit': 21},
+        {'name': 'resume history, next page', 'collection': 'resumes',
+         'filter': keyset_query(history, encode_cursor(datetime.utcnow(), ObjectId())),
+         'projection': Resume.SUMMARY_PROJECTION,
+         'sort': [('created_at', -1), ('_id', -1)], 'limit': 21},
+        {'name': 'resume by id', 'collection': 'resumes',
+         'filter': {'_id': ObjectId()}, 'projection': Resume.DETAIL_FIELDS},
+        {'name': 'generation cache lookup', 'collection': 'resumes',
+         'filter': {'user_id': user_id, 'resume_hash': '0' * 64, 'job_description_hash': '0' * 64,
+                    'status': 'completed', 'created_at': {'$gte': datetime.utcnow()}},
+         'sort': [('created_at', -1)], 'limit': 1},
+        {'name': 'user resume stats', 'collection': 'user_stats',
+         'filter': {'_id': user_id}},
+        {'name': 'user resume stats rebuild', 'collection': 'resumes',
+         'pipeline': [
+             {'$match': {'user_id': user_id}},
+             {'$group': {'_id': '$user_id', 'total_resumes': {'$sum': 1},
+                         'total_downloads': {'$sum': {'$ifNull': ['$download_count', 0]}}}}
+         ]},
+    ]
+
+
+def _plan_stages(explain, stages=None):
+    """All stage names in the chosen plans of an explain result (rejected plans are skipped)"""
+    stages = set() if stages is None else stages
+    if isinstance(explain, dict):
+        if isinstance(explain.get('stage'), str):
+            stages.add(explain['stage'])
+        for key, value in explain.items():
+            if key not in ('rejectedPlans', 'allPlansExecution'):
+                _plan_stages(value, stages)
+    elif isinstance(explain, list):
+        for item in explain:
+            _plan_stages(item, stages)
+    return stages
+
+
+def explain_query(db, query):
+    """Explain one hot query and return the set of plan stages it uses"""
+    collection = db[query['collection']]
+    if 'pipeline' in query:
+        explain = db.command('aggregate', query['collection'], pipeline=query['pipeline'], explain=True)
+    else:
+        cursor = collection.find(query['filter'], query.get('projection'))
+        if query.get('sort'):
+            cursor = cursor.sort(query['sort'])
+        if query.get('limit'):
+            cursor = cursor.limit(query['limit'])
+        explain = cursor.explain()
+    return _plan_stages(explain)
+
+
+def check_query_plans(db, verbose=True):
+    """
+    Explain every hot query.
+
+    Returns:
+        list: names of the queries whose plan contains a COLLSCAN (empty when all use indexes)
+    """
+    failures = []
+    for query in hot_queries():
+        stages = explain_query(db, query)
+        if 'COLLSCAN' in stages:
+            failures.append(query['name'])
+        if verbose:
+            mark = '✗' if 'COLLSCAN' in stages else '[OK]'
+            print(f"{mark} {query['name']}: {', '.join(sorted(stages))}")
+    return failures
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    if command not in ('list', 'apply', 'check'):
+        print(__doc__)
+        return 2
+
+    from database import Database
+    if not Database.initialize():
+        print("✗ MongoDB is not available")
+        return 1
+    db = Database.get_db()
+
+    try:
+        if command == 'apply':
+            apply_indexes(db)
+            return 0
+
+        if command == 'check':
+            failures = check_query_plans(db)
+            if failures:
+                print(f"✗ {len(failures)} hot query(ies) fall back to COLLSCAN: {', '.join(failures)}")
+                return 1
+            print("[OK] All hot queries use an index")
+            return 0
+
+        for collection_name, specs in INDEXES.items():
+            existing = db[collection_name].index_information()
+            print(f"\n{collection_name}:")
+            for spec in specs:
+                name = _index_name(spec['keys'])
+                state = 'present' if name in existing else 'MISSING'
+                print(f"  {name:<60} {state:<8} {spec['serves']}")
+            for name in sorted(set(existing) - {_index_name(spec['keys']) for spec in specs} - {'_id_'}):
+                print(f"  {name:<60} {'unmanaged':<8}")
+        return 0
+    finally:
+        Database.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Move PDFs saved inline as base64 (resumes.pdf_base64) into binary storage.
+
+Walks the resumes that still have pdf_base64 in _id order, a batch at a
+time: each PDF is decoded once, stored through utils/pdf_storage.py, and
+the resume is updated in one bulk write to reference it (pdf_ref) and
+drop pdf_base64. Safe to stop and re-run; resumes already moved are not
+selected again. Run it while the app is up - new resumes are already
+saved the new way.
+
+Usage:
+    python migrate_pdf_storage.py [--batch-size 100] [--limit N] [--dry-run]
+
+MongoDB does not hand freed space back to the OS by itself; run the
+`compact` command on the resumes collection afterwards to reclaim it.
+"""
+import argparse
+import os
+import sys
+import time
+
+from pymongo import UpdateOne
+
+# Add the backend directory to path
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, backend_dir)
+
+from database import Database
+from utils.pdf_storage import store_pdf_base64, delete_pdf, PdfStorageError
+
+INLINE_PDF_QUERY = {'pdf_base64': {'$type': 'string'}, 'pdf_ref': {'$exists': False}}
+
+
+def migrate(db, batch_size=100, limit=None, dry_run=False):
+    """
+    Migrate inline PDFs in batches.
+
+    Returns:
+        dict: counts of migrated, skipped (invalid base64) and raced (updated elsewhere) resumes
+    """
+    counts = {'migrated': 0, 'skipped': 0, 'raced': 0, 'bytes_before': 0, 'bytes_after': 0}
+    last_id = None
+
+    while limit is None or counts['migrated'] + counts['skipped'] < limit:
+        query = dict(INLINE_PDF_QUERY)
+        if last_id is not None:
+            query['_id'] = {'$gt': last_id}
+        size = batch_size if limit is None else min(batch_size, limit - counts['migrated'] - counts['skipped'])
+        batch = list(db.resumes.find(query, {'pdf_base64': 1, 'original_filename': 1})
+                     .sort('_id', 1).limit(size))
+        if not batch:
+            break
+        last_id = batch[-1]['_id']
+
+        updates = []
+        stored = {}
+        for doc in batch:
+            counts['bytes_before'] += len(doc['pdf_base64'])
+            if dry_run:
+                counts['migrated'] += 1
+                continue
+            try:
+                pdf_ref = store_pdf_base64(doc['pdf_base64'], db=db, filename=doc.get('original_filename'))
+            except PdfStorageError as e:
+                print(f"[WARNING] Skipping resume {doc['_id']}: {str(e)}")
+                counts['skipped'] += 1
+                continue
+            stored[doc['_id']] = pdf_ref
+            counts['bytes_after'] += pdf_ref['size']
+            # Only if the resume was not migrated or rewritten meanwhile
+            updates.append(UpdateOne(
+                {'_id': doc['_id'], 'pdf_ref': {'$exists': False}, 'pdf_base64': doc['pdf_base64']},
+                {'$set': {'pdf_ref': pdf_ref}, '$unset': {'pdf_base64': ''}}
+            ))
+
+        if updates:
+            result = db.resumes.bulk_write(updates, ordered=False)
+            counts['migrated'] += result.modified_count
+            if result.modified_count < len(updates):
+                # Some resumes changed under us: drop the blobs nobody references
+                current = {doc['_id']: (doc.get('pdf_ref') or {}).get('id')
+                           for doc in db.resumes.find({'_id': {'$in': list(stored)}}, {'pdf_ref': 1})}
+                for resume_id, pdf_ref in stored.items():
+                    if current.get(resume_id) != pdf_ref['id']:
+                        delete_pdf(pdf_ref, db=db)
+                        counts['raced'] += 1
+
+        print(f"[OK] Batch up to {last_id}: {counts['migrated']} migrated, {counts['skipped']} skipped")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--limit', type=int, help='stop after this many resumes')
+    parser.add_argument('--dry-run', action='store_true', help='count what would be migrated, change nothing')
+    args = parser.parse_args()
+
+    if not Database.initialize():
+        print("✗ MongoDB is not available")
+        return 1
+    db = Database.get_db()
+
+    remaining = db.resumes.count_documents(INLINE_PDF_QUERY)
+    print(f"Resumes with inline PDFs: {remaining}")
+
+    began = time.time()
+    counts = migrate(db, batch_size=args.batch_size, limit=args.limit, dry_run=args.dry_run)
+    elapsed = time.time() - began
+
+    print(f"\n{'Would migrate' if args.dry_run else 'Migrated'} {counts['migrated']} resume(s) "
+          f"in {elapsed:.1f}s, skipped {counts['skipped']}, raced {counts['raced']}")
+    if counts['bytes_after']:
+        print(f"PDF bytes: {counts['bytes_before']} as base64 -> {counts['bytes_after']} binary")
+    Database.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
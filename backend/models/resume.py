@@ -1,37 +1,64 @@
+import base64
 from datetime import datetime
 from bson.objectid import ObjectId
 from database import Database
+from utils.pdf_storage import store_pdf
+from utils.pagination import encode_cursor, keyset_query
+from utils.write_behind import WriteBehindBuffer
 
 class Resume:
     """Resume Model for storing generated resumes"""
     
+    # Fields each read path needs (never the resume text or the PDF unless it serves it)
+    SUMMARY_PROJECTION = {
+        'original_filename': 1, 'status': 1, 'file_size_kb': 1, 'download_count': 1, 'created_at': 1,
+        # Whether a job description was given, without sending its text
+        'has_job_description': {'$gt': [{'$strLenCP': {'$ifNull': ['$job_description', '']}}, 0]}
+    }
+    DETAIL_FIELDS = ['user_id', 'original_filename', 'job_description', 'file_size_kb', 'status',
+                     'created_at', 'download_count', 'last_downloaded']
+    DOWNLOAD_FIELDS = ['user_id', 'created_at', 'pdf_ref', 'pdf_base64']
+    
     def __init__(self, user_id, original_filename, job_description, resume_text, 
-                 pdf_base64, file_size_kb, created_at=None):
+                 pdf_bytes, file_size_kb, created_at=None, resume_hash=None,
+                 job_description_hash=None, pdf_ref=None):
         self.user_id = user_id
         self.original_filename = original_filename
         self.job_description = job_description
         self.resume_text = resume_text
-        self.pdf_base64 = pdf_base64
+        self.pdf_bytes = pdf_bytes
+        # Reference to the raw PDF in binary storage (utils/pdf_storage.py), set by save()
+        self.pdf_ref = pdf_ref
         self.file_size_kb = file_size_kb
         self.status = 'completed'
         self.created_at = created_at or datetime.utcnow()
         self.download_count = 0
         self.last_downloaded = None
+        # Normalized text hashes used as the generation cache key
+        self.resume_hash = resume_hash
+        self.job_description_hash = job_description_hash
     
     def to_dict(self):
-        """Convert resume object to dictionary"""
-        return {
+        """Convert resume object to dictionary (the PDF by reference once it is in binary storage)"""
+        data = {
             'user_id': self.user_id,
             'original_filename': self.original_filename,
             'job_description': self.job_description,
             'resume_text': self.resume_text,
-            'pdf_base64': self.pdf_base64,
             'file_size_kb': self.file_size_kb,
             'status': self.status,
             'created_at': self.created_at,
             'download_count': self.download_count,
-            'last_downloaded': self.last_downloaded
+            'last_downloaded': self.last_downloaded,
+            'resume_hash': self.resume_hash,
+            'job_description_hash': self.job_description_hash
         }
+        if self.pdf_ref:
+            data['pdf_ref'] = self.pdf_ref
+        elif self.pdf_bytes:
+            # Binary storage failed: fall back to the legacy inline form
+            data['pdf_base64'] = base64.b64encode(self.pdf_bytes).decode('ascii')
+        return data
     
     def save(self):
         """Save resume to database"""
@@ -40,36 +67,65 @@ class Resume:
             if db is None:
                 print("[WARNING] Database not available - resume not saved to database")
                 return None
+            
+            # Store the PDF as raw bytes, referenced by ID; keep it inline only if that fails
+            if self.pdf_bytes and not self.pdf_ref:
+                try:
+                    self.pdf_ref = store_pdf(self.pdf_bytes, db=db, filename=self.original_filename)
+                except Exception as e:
+                    print(f"[WARNING] PDF binary storage failed, keeping it inline: {str(e)}")
                 
             resume_data = self.to_dict()
             result = db.resumes.insert_one(resume_data)
+            
+            # Keep the owner's stats counters in step (rebuilt from source if they do not exist yet)
+            Resume._increment_user_stats(db, self.user_id, total_resumes=1)
             return str(result.inserted_id)
         except Exception as e:
             print(f"❌ Error saving resume to database: {str(e)}")
             return None
     
     @staticmethod
-    def find_by_user_id(user_id, limit=None):
-        """Find resumes by user ID"""
+    def find_by_user_id(user_id, limit=20, cursor=None):
+        """
+        Find one page of a user's resumes, newest first.
+        
+        Args:
+            user_id: Owner of the resumes
+            limit: Page size
+            cursor: next_cursor from the previous page, or None for the first page
+            
+        Returns:
+            tuple: (list of resume summaries, next_cursor or None on the last page)
+            
+        Raises:
+            InvalidCursor: if cursor is malformed
+        """
+        query = keyset_query({'user_id': user_id}, cursor)
         try:
             db = Database.get_db()
             if db is None:
-                return []
-                
-            query = {'user_id': user_id}
-            cursor = db.resumes.find(query).sort('created_at', -1)
+                return [], None
             
-            if limit:
-                cursor = cursor.limit(limit)
+            # Keyset pagination on (created_at, _id): one extra row tells whether there is a next page
+            docs = list(
+                db.resumes.find(query, Resume.SUMMARY_PROJECTION)
+                .sort([('created_at', -1), ('_id', -1)])
+                .limit(limit + 1)
+            )
+            next_cursor = None
+            if len(docs) > limit:
+                docs = docs[:limit]
+                next_cursor = encode_cursor(docs[-1]['created_at'], docs[-1]['_id'])
             
             resumes = []
-            for resume_doc in cursor:
+            for resume_doc in docs:
                 # Convert to resume-like dict for frontend
                 resume_dict = {
                     'id': str(resume_doc['_id']),
                     'date': resume_doc['created_at'].strftime('%Y-%m-%d'),
                     'originalFile': resume_doc['original_filename'],
-                    'jobDesc': 'Provided' if resume_doc.get('job_description') else 'None',
+                    'jobDesc': 'Provided' if resume_doc.get('has_job_description') else 'None',
                     'status': resume_doc['status'].title(),
                     'file_size_kb': resume_doc.get('file_size_kb', 0),
                     'download_count': resume_doc.get('download_count', 0),
@@ -77,69 +133,251 @@ class Resume:
                 }
                 resumes.append(resume_dict)
             
-            return resumes
+            return resumes, next_cursor
         except Exception as e:
             print(f"❌ Error fetching user resumes: {str(e)}")
-            return []
+            return [], None
     
     @staticmethod
-    def find_by_id(resume_id):
-        """Find resume by ID"""
+    def find_by_id(resume_id, fields=None):
+        """Find resume by ID (only the given fields, if any; e.g. Resume.DETAIL_FIELDS)"""
         try:
             db = Database.get_db()
             if db is None:
                 return None
                 
-            resume_doc = db.resumes.find_one({'_id': ObjectId(resume_id)})
+            resume_doc = db.resumes.find_one({'_id': ObjectId(resume_id)}, fields)
             return resume_doc
         except Exception as e:
             print(f"❌ Error fetching resume by ID: {str(e)}")
             return None
     
     @staticmethod
-    def update_download_count(resume_id):
-        """Update download count and last downloaded timestamp"""
+    def find_by_generation_key(user_id, resume_hash, job_description_hash, newer_than=None):
+        """Find the user's latest completed resume generated from the same resume text and job description"""
         try:
             db = Database.get_db()
             if db is None:
-                return False
-                
-            result = db.resumes.update_one(
-                {'_id': ObjectId(resume_id)},
+                return None
+            
+            query = {
+                'user_id': user_id,
+                'resume_hash': resume_hash,
+                'job_description_hash': job_description_hash,
+                'status': 'completed'
+            }
+            if newer_than:
+                query['created_at'] = {'$gte': newer_than}
+            
+            projection = ['pdf_ref', 'pdf_base64', 'file_size_kb', 'original_filename', 'created_at']
+            return db.resumes.find_one(query, projection, sort=[('created_at', -1)])
+        except Exception as e:
+            print(f"❌ Error looking up cached resume: {str(e)}")
+            return None
+    
+    @staticmethod
+    def update_download_count(resume_id, user_id=None):
+        """
+        Count a download of a resume (and in its owner's stats).
+        
+        The increment is buffered and written in a batch by a background flush
+        (see _flush_download_counts), so the download does not wait for the database.
+        
+        Args:
+            resume_id: The downloaded resume
+            user_id: Its owner, if the caller already knows it (saves a lookup at flush time)
+            
+        Returns:
+            bool: True once the download is recorded
+        """
+        download_counters.add(str(resume_id), meta=user_id)
+        return True
+    
+    @staticmethod
+    def _flush_download_counts(batch):
+        """
+        Write buffered download counts: one bulk_write to resumes, one to user_stats.
+        
+        Returns:
+            list: resume IDs whose counts were not written (retried on the next flush)
+        """
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError
+        
+        db = Database.get_db()
+        if db is None:
+            raise Exception("Database not available")
+        
+        resume_ids = list(batch)
+        failed = []
+        try:
+            db.resumes.bulk_write([
+                UpdateOne(
+                    {'_id': ObjectId(resume_id)},
+                    {
+                        '$inc': {'download_count': batch[resume_id]['count']},
+                        '$set': {'last_downloaded': batch[resume_id]['last_at']}
+                    }
+                )
+                for resume_id in resume_ids
+            ], ordered=False)
+        except BulkWriteError as e:
+            # Unordered: everything except the reported writes was applied; retry only those
+            failed = [resume_ids[error['index']] for error in e.details.get('writeErrors', [])]
+            if not failed:
+                raise
+            batch = {resume_id: entry for resume_id, entry in batch.items() if resume_id not in set(failed)}
+        
+        # The resume counts are written; a failure from here on is left to rebuild_user_stats
+        # (raising would make the buffer write the resume counts twice)
+        try:
+            owners = {resume_id: entry['meta'] for resume_id, entry in batch.items() if entry['meta']}
+            unknown = [ObjectId(resume_id) for resume_id in batch if resume_id not in owners]
+            if unknown:
+                for resume_doc in db.resumes.find({'_id': {'$in': unknown}}, {'user_id': 1}):
+                    owners[str(resume_doc['_id'])] = resume_doc['user_id']
+            
+            downloads_by_user = {}
+            for resume_id, user_id in owners.items():
+                downloads_by_user[user_id] = downloads_by_user.get(user_id, 0) + batch[resume_id]['count']
+            now = datetime.utcnow()
+            db.user_stats.bulk_write([
+                UpdateOne({'_id': user_id}, {'$inc': {'total_downloads': count}, '$set': {'updated_at': now}})
+                for user_id, count in downloads_by_user.items()
+            ], ordered=False)
+        except Exception as e:
+            print(f"[WARNING] Failed to update download stats counters: {str(e)}")
+        return failed
+    
+    @staticmethod
+    def _aggregate_user_stats(db, user_id=None):
+        """Count resumes and downloads from the resumes themselves (one user, or all users)"""
+        pipeline = [
+            {'$group': {
+                '_id': '$user_id',
+                'total_resumes': {'$sum': 1},
+                'total_downloads': {'$sum': {'$ifNull': ['$download_count', 0]}}
+            }}
+        ]
+        if user_id is not None:
+            pipeline.insert(0, {'$match': {'user_id': user_id}})
+        return db.resumes.aggregate(pipeline)
+    
+    @staticmethod
+    def _increment_user_stats(db, user_id, total_resumes=0, total_downloads=0):
+        """Atomically bump a user's stats counters; builds them from source the first time"""
+        try:
+            result = db.user_stats.update_one(
+                {'_id': user_id},
                 {
-                    '$inc': {'download_count': 1},
-                    '$set': {'last_downloaded': datetime.utcnow()}
+                    '$inc': {'total_resumes': total_resumes, 'total_downloads': total_downloads},
+                    '$set': {'updated_at': datetime.utcnow()}
                 }
             )
-            return result.modified_count > 0
+            if result.matched_count == 0:
+                Resume._build_user_stats(db, user_id)
         except Exception as e:
-            print(f"❌ Error updating download count: {str(e)}")
-            return False
+            # The resume write itself succeeded; rebuild_user_stats repairs the counters
+            print(f"[WARNING] Failed to update stats counters for user {user_id}: {str(e)}")
+    
+    @staticmethod
+    def _count_user_resumes(db, user_id):
+        """One user's stats counted from the resumes collection"""
+        for row in Resume._aggregate_user_stats(db, user_id):
+            return {'total_resumes': row['total_resumes'], 'total_downloads': row['total_downloads']}
+        return {'total_resumes': 0, 'total_downloads': 0}
+    
+    @staticmethod
+    def _build_user_stats(db, user_id):
+        """
+        Create a user's stats document from source.
+        
+        If another request created it between the count and the insert, its counts may
+        predate this request's resume: recompute from the collection (which now holds
+        every resume saved so far) and overwrite, instead of keeping either stale count.
+        """
+        from pymongo.errors import DuplicateKeyError
+        
+        stats = Resume._count_user_resumes(db, user_id)
+        try:
+            db.user_stats.insert_one(dict(stats, _id=user_id, updated_at=datetime.utcnow()))
+        except DuplicateKeyError:
+            stats = Resume._count_user_resumes(db, user_id)
+            db.user_stats.update_one({'_id': user_id}, {'$set': dict(stats, updated_at=datetime.utcnow())})
+        return stats
+    
+    @staticmethod
+    def rebuild_user_stats(user_id=None, batch_size=500):
+        """
+        Repair job: recompute stats counters from the resumes collection.
+        
+        Counters changed by requests while it runs can be off by those requests; run it
+        when traffic is low, or again afterwards.
+        
+        Args:
+            user_id: Rebuild one user only; None rebuilds every user
+            batch_size: Users written per bulk write
+            
+        Returns:
+            int: number of users whose counters were rewritten
+        """
+        from pymongo import UpdateOne
+        
+        db = Database.get_db()
+        if db is None:
+            return 0
+        
+        started_at = datetime.utcnow()
+        updates = []
+        rebuilt = 0
+        for row in Resume._aggregate_user_stats(db, user_id):
+            updates.append(UpdateOne(
+                {'_id': row['_id']},
+                {'$set': {
+                    'total_resumes': row['total_resumes'],
+                    'total_downloads': row['total_downloads'],
+                    'updated_at': started_at
+                }},
+                upsert=True
+            ))
+            if len(updates) >= batch_size:
+                db.user_stats.bulk_write(updates, ordered=False)
+                rebuilt += len(updates)
+                updates = []
+        if updates:
+            db.user_stats.bulk_write(updates, ordered=False)
+            rebuilt += len(updates)
+        
+        # Users whose resumes are all gone (not touched above) go back to zero
+        stale = {'updated_at': {'$lt': started_at}}
+        if user_id is not None:
+            stale['_id'] = user_id
+        result = db.user_stats.update_many(
+            stale, {'$set': {'total_resumes': 0, 'total_downloads': 0, 'updated_at': started_at}}
+        )
+        return rebuilt + result.modified_count
     
     @staticmethod
     def get_user_stats(user_id):
-        """Get user resume statistics"""
+        """Get user resume statistics (a point lookup of the write-maintained counters)"""
         try:
             db = Database.get_db()
             if db is None:
                 return {'total_resumes': 0, 'total_downloads': 0}
-                
-            pipeline = [
-                {'$match': {'user_id': user_id}},
-                {'$group': {
-                    '_id': None,
-                    'total_resumes': {'$sum': 1},
-                    'total_downloads': {'$sum': '$download_count'}
-                }}
-            ]
             
-            result = list(db.resumes.aggregate(pipeline))
-            if result:
+            stats = db.user_stats.find_one({'_id': user_id}, {'total_resumes': 1, 'total_downloads': 1})
+            if stats:
                 return {
-                    'total_resumes': result[0]['total_resumes'],
-                    'total_downloads': result[0]['total_downloads']
+                    'total_resumes': stats.get('total_resumes', 0),
+                    'total_downloads': stats.get('total_downloads', 0)
                 }
-            return {'total_resumes': 0, 'total_downloads': 0}
+            
+            # No counters yet (user predates them): build them once from source
+            return Resume._build_user_stats(db, user_id)
         except Exception as e:
             print(f"❌ Error fetching user stats: {str(e)}")
-            return {'total_resumes': 0, 'total_downloads': 0}
\ No newline at end of file
+            return {'total_resumes': 0, 'total_downloads': 0}
+
+
+# Download counts are written behind, in batches (see Resume.update_download_count)
+download_counters = WriteBehindBuffer(Resume._flush_download_counts, name='download-counters')
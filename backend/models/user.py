@@ -202,6 +202,37 @@ class User:
             print(f"Error deducting credits: {str(e)}")
             return False
     
+    @staticmethod
+    def refund_credits(user_id, amount):
+        """
+        Give back credits that were deducted for work that never reached the generation API.
+        Uses atomic MongoDB $inc operation for concurrent safety.
+
+        Args:
+            user_id: The user's ObjectId as string
+            amount: Number of credits to return
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        db = Database.get_db()
+        try:
+            result = db.users.update_one(
+                {'_id': ObjectId(user_id)},
+                {'$inc': {'credits': amount, 'credits_used': -amount}}
+            )
+
+            if result.modified_count > 0:
+                print(f"[OK] Refunded {amount} credit(s) to user {user_id}")
+                return True
+            else:
+                print(f"✗ Failed to refund credits - user not found")
+                return False
+
+        except Exception as e:
+            print(f"Error refunding credits: {str(e)}")
+            return False
+
     @staticmethod
     def deduct_credit(user_id):
         """
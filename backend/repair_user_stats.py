@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Rebuild the per-user resume stats counters (user_stats) from the resumes collection.
+
+The counters are maintained on every resume save and download; this job
+recomputes them from source to repair drift (e.g. a write that failed
+half way) or after bulk changes to resumes. Run it when traffic is low:
+downloads and saves that land while it runs may be counted off by one
+until the next run.
+
+Usage:
+    python repair_user_stats.py [--user USER_ID] [--batch-size 500]
+"""
+import argparse
+import sys
+import time
+
+from database import Database
+from models.resume import Resume
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--user', help='rebuild one user only')
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    if not Database.initialize():
+        print("✗ MongoDB is not available")
+        return 1
+
+    began = time.time()
+    rebuilt = Resume.rebuild_user_stats(user_id=args.user, batch_size=args.batch_size)
+    print(f"[OK] Rebuilt stats for {rebuilt} user(s) in {time.time() - began:.1f}s")
+    Database.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
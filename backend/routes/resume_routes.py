@@ -1,23 +1,31 @@
-from flask import Blueprint, request, jsonify, send_file, Response, Response
-import pdfplumber
-import docx
-from io import BytesIO
+from flask import Blueprint, request, jsonify, send_file, make_response, Response, stream_with_context
+import base64
 import os
 import sys
-import tempfile
 import jwt
 from functools import wraps
 import requests
-import base64
 import json
-import re
 import time
-import binascii
+import queue
 from datetime import datetime
+from werkzeug.exceptions import RequestedRangeNotSatisfiable, RequestEntityTooLarge
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from config import Config
 from models.resume import Resume
-import binascii
+from utils.extraction import extract_pdf_text, extract_docx_text, extract_doc_text, ExtractionTimeout
+from utils.doc_reader import DocFormatError
+from utils.extraction_cache import extraction_cache, make_cache_key
+from utils.upload import ingest_upload, UploadTooLarge
+from utils.latex import clean_text_for_latex
+from utils.payload import minimize_resume_text, minimize_job_description
+from utils.upstream import upstream_client, upstream_breaker, upstream_bulkhead, UpstreamRejected, UPSTREAM_READ_TIMEOUT
+from utils.circuit_breaker import CircuitOpen, BulkheadFull
+from utils.pdf_payload import read_body, extract_pdf_bytes, InvalidPdfPayload
+from utils.jobs import generation_jobs, JobQueueFull, QUEUED, RUNNING, SUCCEEDED
+from utils.generation_cache import generation_cache, make_generation_key
+from utils.pdf_storage import open_resume_pdf, resume_pdf_bytes, pdf_etag, PdfStorageError
+from utils.pagination import InvalidCursor
 
 resume_bp = Blueprint('resume', __name__)
 
@@ -27,47 +35,17 @@ JWT_SECRET = Config.JWT_SECRET_KEY
 # Temporary storage for extracted data - now includes text directly
 extracted_data_storage = {}
 
-def clean_text_for_latex(text):
-    """
-    Clean extracted text to make it compatible with LaTeX compilation.
-    
-    Args:
-        text: Raw extracted text from PDF
-        
-    Returns:
-        Cleaned text safe for LaTeX processing
-    """
-    if not text:
-        return text
-    
-    # Remove or replace problematic characters
-    text = text.replace('\\', '')  # Remove backslashes
-    text = text.replace('{', '(')   # Replace curly braces
-    text = text.replace('}', ')')
-    text = text.replace('$', 'USD')  # Replace dollar signs
-    text = text.replace('#', 'No.')  # Replace hash symbols
-    text = text.replace('%', ' percent')  # Replace percentage signs
-    text = text.replace('&', ' and ')  # Replace ampersands
-    text = text.replace('_', ' ')    # Replace underscores
-    text = text.replace('^', '')     # Remove carets
-    text = text.replace('~', '')     # Remove tildes
-    
-    # Clean up multiple spaces and newlines
-    text = re.sub(r'\s+', ' ', text)  # Replace multiple spaces with single space
-    text = re.sub(r'\n+', '\n', text)  # Replace multiple newlines with single newline
-    
-    # Remove non-ASCII characters that might cause issues
-    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-    
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    
-    print(f"Text cleaned: {len(text)} characters after cleaning")
-    return text
+# Batch generation limits (override via environment)
+BATCH_MAX_JOB_DESCRIPTIONS = int(os.getenv('BATCH_MAX_JOB_DESCRIPTIONS', 20))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', 4))  # Upstream calls in flight per batch
+
+# Resume history page sizes
+HISTORY_PAGE_SIZE = int(os.getenv('HISTORY_PAGE_SIZE', 20))
+HISTORY_MAX_PAGE_SIZE = int(os.getenv('HISTORY_MAX_PAGE_SIZE', 100))
 
 def send_to_aws_api(resume_text, job_description, api_url):
     """
-    Send extracted text to AWS hosted API and get base64 PDF response.
+    Send extracted text to AWS hosted API and get the generated PDF.
     
     Args:
         resume_text: Extracted text from PDF
@@ -75,61 +53,68 @@ def send_to_aws_api(resume_text, job_description, api_url):
         api_url: AWS API endpoint URL
         
     Returns:
-        Base64 encoded PDF data from API
+        bytes: the PDF (the API returns it base64 encoded; it is decoded once here)
     """
     try:
-        # Clean the resume text for LaTeX compatibility
-        cleaned_resume_text = clean_text_for_latex(resume_text)
+        # Clean the resume text for LaTeX compatibility, then drop boilerplate,
+        # repeated lines and extra whitespace (size-limited by whole sections)
+        cleaned_resume_text = minimize_resume_text(clean_text_for_latex(resume_text))
+        minimized_job_description = minimize_job_description(job_description) if job_description else ""
         
         # Prepare the payload matching the API structure
         payload = {
             "resume_data": cleaned_resume_text,
-            "job_description": job_description if job_description else ""
+            "job_description": minimized_job_description
         }
         
+        original_chars = len(resume_text or '') + len(job_description or '')
+        minimized_chars = len(cleaned_resume_text) + len(minimized_job_description)
         print("\nSending request to AWS API...")
-        print(f"Payload size: {len(json.dumps(payload))} bytes")
+        print(f"Payload text: {minimized_chars} chars (from {original_chars}, "
+              f"{100 - minimized_chars * 100 // max(original_chars, 1)}% removed)")
         
         # Record start time
         start_time = time.time()
         
-        # Send POST request to API with timeout
-        response = requests.post(api_url, json=payload, timeout=60)
+        # Send POST request through the shared keep-alive pool. Generation is expensive and
+        # not idempotent: only attempts that never reached the upstream (connect errors) are
+        # retried, never a read timeout or an error status, so a slow or failing upstream
+        # costs one attempt per request. The body is streamed so it is held once, not as
+        # content + text + parsed JSON.
+        response = upstream_client.post(api_url, json=payload, stream=True)
         
         # Calculate time taken
         end_time = time.time()
         time_taken = end_time - start_time
         
         print(f"Response received in {time_taken:.2f} seconds")
+        print(f"Upstream request: {response.upstream_bytes_sent} bytes sent "
+              f"({response.upstream_bytes_raw} bytes uncompressed), "
+              f"{response.upstream_seconds:.2f}s to response headers")
         print(f"HTTP Status Code: {response.status_code}")
         
         # Check if request was successful
         if response.status_code == 200:
             try:
-                # Parse JSON response
-                response_data = response.json()
+                # Locate the base64 PDF (pdf_base64 or body field) in the raw body and
+                # decode it from there; only the PDF bytes are kept
+                body = read_body(response)
+                pdf_bytes = extract_pdf_bytes(body)
+                del body
                 
-                # Extract base64 PDF data (handling different response structures)
-                base64_pdf = (
-                    response_data.get('pdf_base64') or 
-                    response_data.get('body') or 
-                    response_data
-                )
-                
-                # Ensure it's a string
-                if isinstance(base64_pdf, str):
-                    pdf_data = base64_pdf
-                else:
-                    pdf_data = str(base64_pdf)
+                print("[OK] Successfully received PDF data")
+                return pdf_bytes
                 
-                print("[OK] Successfully received base64 PDF data")
-                return pdf_data
-                
-            except json.JSONDecodeError as e:
-                raise Exception(f"Failed to parse JSON response: {str(e)}")
+            except InvalidPdfPayload as e:
+                raise Exception(str(e))
             except Exception as e:
                 raise Exception(f"Error processing response: {str(e)}")
+            finally:
+                response.close()
         else:
+            # 4xx: the service is up but refused this input (does not count against the circuit)
+            error_class = UpstreamRejected if response.status_code < 500 else Exception
+            
             # Try to parse error response for more details
             try:
                 error_data = response.json()
@@ -147,16 +132,16 @@ def send_to_aws_api(resume_text, job_description, api_url):
                         error_message += "4. Check that all text is properly encoded (no special symbols)\n"
                 
                 error_message += f"\nFull Response: {response.text[:1000]}"
-                raise Exception(error_message)
+                raise error_class(error_message)
                 
             except json.JSONDecodeError:
-                raise Exception(
+                raise error_class(
                     f"API request failed with status {response.status_code}\n"
                     f"Response: {response.text[:500]}"
                 )
     
     except requests.exceptions.Timeout:
-        raise Exception("Request timed out after 60 seconds")
+        raise Exception(f"Request timed out after {UPSTREAM_READ_TIMEOUT:g} seconds")
     except requests.exceptions.ConnectionError:
         raise Exception("Failed to connect to API endpoint")
     except requests.exceptions.RequestException as e:
@@ -250,57 +235,45 @@ def token_required(f):
     
     return decorated
 
-def extract_text_from_pdf(file_content):
-    """Extract text from PDF using pdfplumber"""
+def extract_text_from_pdf(file_content, report=None):
+    """
+    Extract text from PDF (bytes or path of a spooled upload) in the extraction process pool.
+    Pages use the fast tier and fall back to full layout analysis when the output looks broken;
+    the tier used and time per tier are written into report.
+    """
     try:
-        extracted_text = []
-        with pdfplumber.open(BytesIO(file_content)) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    extracted_text.append(text)
-        
-        full_text = '\n'.join(extracted_text)
-        return full_text.strip()
-    
+        return extract_pdf_text(file_content, report=report)
+
+    except ExtractionTimeout as e:
+        print(f"PDF extraction stopped: {str(e)}")
+        return None
     except Exception as e:
         print(f"Error extracting PDF text: {str(e)}")
         return None
 
-def extract_text_from_docx(file_content):
-    """Extract text from DOCX using python-docx"""
+def extract_text_from_docx(file_content, report=None):
+    """Extract text from DOCX (body, tables, text boxes, headers, footers) in the extraction process pool"""
     try:
-        # Save content to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_file:
-            tmp_file.write(file_content)
-            tmp_file.flush()
-            
-            # Extract text from docx
-            doc = docx.Document(tmp_file.name)
-            text_content = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text.strip())
-            
-            # Clean up temporary file
-            os.unlink(tmp_file.name)
-            
-            full_text = '\n'.join(text_content)
-            return full_text.strip()
+        return extract_docx_text(file_content, report=report)
     
+    except ExtractionTimeout as e:
+        print(f"DOCX extraction stopped: {str(e)}")
+        return None
     except Exception as e:
         print(f"Error extracting DOCX text: {str(e)}")
         return None
 
-def extract_text_from_doc(file_content):
-    """Extract text from DOC files - basic implementation"""
+def extract_text_from_doc(file_content, report=None):
+    """Extract text from legacy Word 97-2003 DOC files (OLE2 piece table) in the extraction process pool"""
     try:
-        # For .doc files, we'll need a different approach
-        # This is a placeholder - you might need to use additional libraries
-        print("Warning: .doc file processing is limited. Please use .docx or .pdf format")
-        return "DOC file detected. Please convert to PDF or DOCX for better text extraction."
+        return extract_doc_text(file_content, report=report)
     
+    except ExtractionTimeout as e:
+        print(f"DOC extraction stopped: {str(e)}")
+        return None
+    except DocFormatError as e:
+        print(f"Unreadable DOC file: {str(e)}")
+        return None
     except Exception as e:
         print(f"Error processing DOC file: {str(e)}")
         return None
@@ -313,6 +286,13 @@ def process_resume(current_user_id):
         print(f"\n=== RESUME PROCESSING STARTED ===")
         print(f"User ID: {current_user_id}")
         
+        # Parse the body (read once; MAX_CONTENT_LENGTH and the per-file limit are
+        # enforced while it is read, so oversized uploads stop early)
+        try:
+            form, files = request.form, request.files
+        except RequestEntityTooLarge:
+            return jsonify({'error': 'File size exceeds 10MB limit'}), 400
+        
         # Initialize extraction results
         extraction_results = {
             'user_id': current_user_id,
@@ -322,7 +302,7 @@ def process_resume(current_user_id):
         }
         
         # Get job description from form data
-        job_description = request.form.get('jobDescription', '').strip()
+        job_description = form.get('jobDescription', '').strip()
         if job_description:
             extraction_results['job_description'] = job_description
             print(f"\nJob Description extracted:")
@@ -332,22 +312,34 @@ def process_resume(current_user_id):
             print("\nNo job description provided")
         
         # Check if file was uploaded
-        if 'resumeFile' not in request.files:
+        if 'resumeFile' not in files:
             return jsonify({'error': 'No file uploaded'}), 400
         
-        file = request.files['resumeFile']
+        file = files['resumeFile']
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Get file information
+        # Pick the extractor based on file type
         filename = file.filename.lower()
-        file_size = len(file.read())
-        file.seek(0)  # Reset file pointer
+        if filename.endswith('.pdf'):
+            file_type, extractor = 'pdf', extract_text_from_pdf
+        elif filename.endswith('.docx'):
+            file_type, extractor = 'docx', extract_text_from_docx
+        elif filename.endswith('.doc'):
+            file_type, extractor = 'doc', extract_text_from_doc
+        else:
+            return jsonify({'error': 'Unsupported file format. Please use PDF, DOC, or DOCX'}), 400
+        
+        # Read the upload once: size check, hash and (for large files) spool to disk
+        try:
+            upload = ingest_upload(file)
+        except UploadTooLarge:
+            return jsonify({'error': 'File size exceeds 10MB limit'}), 400
         
         file_info = {
             'filename': file.filename,
-            'size': file_size,
-            'size_mb': round(file_size / (1024 * 1024), 2)
+            'size': upload.size,
+            'size_mb': round(upload.size / (1024 * 1024), 2)
         }
         extraction_results['file_info'] = file_info
         
@@ -355,29 +347,23 @@ def process_resume(current_user_id):
         print(f"Filename: {file.filename}")
         print(f"Size: {file_info['size_mb']} MB")
         
-        # Validate file size (max 10MB)
-        if file_size > 10 * 1024 * 1024:
-            return jsonify({'error': 'File size exceeds 10MB limit'}), 400
-        
-        # Read file content
-        file_content = file.read()
-        extracted_text = None
-        
-        # Extract text based on file type
-        if filename.endswith('.pdf'):
-            print("Processing PDF file...")
-            extracted_text = extract_text_from_pdf(file_content)
-            
-        elif filename.endswith('.docx'):
-            print("Processing DOCX file...")
-            extracted_text = extract_text_from_docx(file_content)
+        with upload:
+            # Re-uploads of the same file are served from the extraction cache
+            cache_key = make_cache_key(None, file_type, digest=upload.sha256)
+            extracted_text = extraction_cache.get(cache_key)
+            extraction_cached = extracted_text is not None
+            extraction_report = {'mode': 'cache'} if extraction_cached else {}
             
-        elif filename.endswith('.doc'):
-            print("Processing DOC file...")
-            extracted_text = extract_text_from_doc(file_content)
-            
-        else:
-            return jsonify({'error': 'Unsupported file format. Please use PDF, DOC, or DOCX'}), 400
+            if extraction_cached:
+                print(f"[OK] Extraction cache hit for {file_type.upper()} file")
+            else:
+                print(f"Processing {file_type.upper()} file...")
+                extracted_text = extractor(upload.source, extraction_report)
+                print(f"Extraction report: {extraction_report}")
+                # Truncated text is not cached: a hit would lose the truncation flags, and the
+                # key does not cover the budget that cut it
+                if extracted_text and not extraction_report.get('truncated'):
+                    extraction_cache.put(cache_key, extracted_text)
         
         if extracted_text:
             extraction_results['resume_text'] = extracted_text
@@ -409,7 +395,9 @@ def process_resume(current_user_id):
             'data': {
                 'resume_text_length': len(extracted_text) if extracted_text else 0,
                 'job_description_length': len(job_description) if job_description else 0,
-                'file_info': file_info
+                'file_info': file_info,
+                'extraction_cached': extraction_cached,
+                'extraction': extraction_report
             }
         }), 200
         
@@ -478,10 +466,176 @@ def list_extracted_files():
         print(f"Error listing files: {str(e)}")
         return jsonify({'error': 'Failed to list files'}), 500
 
+def _pdf_delivery(request_data=None):
+    """
+    How the client wants a generated PDF delivered.
+
+    Returns:
+        str: 'pdf' when Accept prefers application/pdf (the PDF itself as the response body),
+            'url' for pdf_delivery=url in the query or JSON body (metadata plus pdf_url),
+            'base64' otherwise (the PDF inline as pdf_base64, for older clients)
+    """
+    if request.accept_mimetypes.best_match(['application/json', 'application/pdf']) == 'application/pdf':
+        return 'pdf'
+    mode = request.args.get('pdf_delivery') or (request_data or {}).get('pdf_delivery')
+    return 'url' if mode == 'url' else 'base64'
+
+def _saved_pdf_bytes(resume_id):
+    """The saved PDF of a generation, or None if the resume cannot be read"""
+    resume_doc = Resume.find_by_id(resume_id, Resume.DOWNLOAD_FIELDS)
+    if not resume_doc:
+        return None
+    try:
+        return resume_pdf_bytes(resume_doc)
+    except PdfStorageError as storage_error:
+        print(f"✗ {str(storage_error)}")
+        return None
+
+def _with_pdf_delivery(data, delivery):
+    """
+    Shape a generation result for the delivery mode: 'base64' gets the PDF inline as
+    pdf_base64, anything else a download URL instead (the PDF is inlined only when no
+    saved resume exists to point at).
+
+    The PDF comes from the result's pdf_bytes when it carries them (cache hits, unsaved
+    generations), otherwise it is read back from the saved resume.
+    """
+    pdf_bytes = data.get('pdf_bytes')
+    data = {key: value for key, value in data.items() if key != 'pdf_bytes'}
+    if delivery == 'base64' or not data.get('resume_id'):
+        if pdf_bytes is None and data.get('resume_id'):
+            pdf_bytes = _saved_pdf_bytes(data['resume_id'])
+        data['pdf_base64'] = base64.b64encode(pdf_bytes).decode('ascii') if pdf_bytes else None
+    else:
+        data['pdf_url'] = f"/api/resume/download/{data['resume_id']}"
+    return data
+
+def _generated_pdf_response(resume_id, extra_headers):
+    """The saved PDF of a generation as the response body, or None if the resume cannot be read"""
+    resume_doc = Resume.find_by_id(resume_id, Resume.DOWNLOAD_FIELDS)
+    if not resume_doc:
+        return None
+    response = make_response(_send_resume_pdf(resume_id, resume_doc))
+    if response.status_code in (404, 500):
+        return None  # PDF unreadable: the caller answers with the JSON result instead
+    response.headers['X-Resume-Id'] = str(resume_id)
+    response.headers.update(extra_headers)
+    return response
+
+class GenerationUnavailable(Exception):
+    """The upstream circuit is open or saturated; the request never reached the generation API"""
+    pass
+
+def run_generation(current_user_id, resume_text, job_description, original_filename, api_url,
+                   generation_key=None, charge=True):
+    """
+    Generation job body: deduct a credit, call the AWS API, validate and save the PDF.
+
+    Runs on the generation worker pool, not in a request worker.
+
+    Args:
+        charge: Deduct the credit here; False when the caller already charged (batches)
+
+    Returns:
+        dict: the result reported by the job status endpoint. It holds the resume ID and
+            metadata, not the PDF (the job table keeps results for JOB_RESULT_TTL); the
+            PDF is included only when the resume could not be saved
+
+    Raises:
+        GenerationUnavailable: if the upstream was not called (no credit deducted here)
+        Exception: with a user-facing message if any other step fails
+    """
+    from models.user import User
+
+    # Take an upstream slot (bulkhead) and pass the circuit breaker BEFORE charging:
+    # when the service is down or saturated the job fails fast and no credit is used
+    try:
+        with upstream_bulkhead, upstream_breaker.guard() as upstream_call:
+            # Step 3: DEDUCT CREDIT NOW (when API is about to be hit)
+            if charge:
+                deduction_success = User.deduct_credits(current_user_id, 1)
+                if not deduction_success:
+                    upstream_call.cancel()
+                    raise Exception('Failed to deduct credits. Please try again.')
+                print(f"[OK] Credit deducted before API call")
+
+            # Step 4: Send to AWS API (the response is decoded once, as strict base64 PDF data;
+            # the PDF is kept as bytes from here on)
+            try:
+                pdf_bytes = send_to_aws_api(resume_text, job_description, api_url)
+            except Exception as api_error:
+                # API FAILED - Credit already deducted, resumes_generated NOT incremented
+                print(f"API Error: {str(api_error)}")
+                print("✗ Credit was deducted but API failed - resumes_generated NOT incremented")
+                error_class = UpstreamRejected if isinstance(api_error, UpstreamRejected) else Exception
+                raise error_class(f'Resume generation failed: {str(api_error)}')
+    except (CircuitOpen, BulkheadFull) as e:
+        print(f"[WARNING] Generation rejected before charging: {str(e)}")
+        raise GenerationUnavailable('Resume generation is temporarily unavailable. No credit was used - please try again shortly.')
+
+    pdf_size_kb = len(pdf_bytes) / 1024
+    print(f"[OK] Generated PDF size: {pdf_size_kb:.2f} KB")
+
+    # Step 5: API SUCCESS - Increment resumes_generated counter
+    User.increment_resumes_generated(current_user_id)
+    print(f"[OK] resumes_generated incremented")
+
+    # Save resume to database (the hashes make it findable by the generation cache)
+    resume_hash, job_description_hash = generation_key or (None, None)
+    resume = Resume(
+        user_id=current_user_id,
+        original_filename=original_filename,
+        job_description=job_description,
+        resume_text=resume_text,
+        pdf_bytes=pdf_bytes,
+        file_size_kb=round(pdf_size_kb, 2),
+        resume_hash=resume_hash,
+        job_description_hash=job_description_hash
+    )
+
+    resume_id = resume.save()
+    print(f" Resume saved to database with ID: {resume_id}")
+
+    if resume_id and generation_key:
+        generation_cache.put(current_user_id, generation_key, {
+            'resume_id': resume_id,
+            'pdf_bytes': pdf_bytes,
+            'file_size_kb': round(pdf_size_kb, 2),
+            'original_filename': original_filename,
+            'created_at': resume.created_at
+        })
+
+    # Fetch updated credit info
+    updated_credits = User.get_current_credits(current_user_id)
+
+    result = {
+        'resume_id': resume_id,
+        'pdf_size_kb': round(pdf_size_kb, 2),
+        'resume_text_length': len(resume_text),
+        'job_description_length': len(job_description) if job_description else 0,
+        'generation_timestamp': datetime.now().isoformat(),
+        'original_filename': original_filename,
+        'credits_remaining': updated_credits.get('credits', 0) if updated_credits else 0,
+        'credits_used': updated_credits.get('credits_used', 0) if updated_credits else 0,
+        'resumes_generated': updated_credits.get('resumes_generated', 0) if updated_credits else 0
+    }
+    if not resume_id:
+        result['pdf_bytes'] = pdf_bytes  # Nothing saved to read it back from
+    return result
+
 @resume_bp.route('/generate-resume', methods=['POST'])
 @token_required
 def generate_resume(current_user_id):
-    """Generate optimized resume using AWS API"""
+    """
+    Queue optimized resume generation using AWS API.
+
+    Returns 202 with a job ID at once; the upstream call, credit deduction and save run on
+    the generation worker pool. Poll /generation-status/<job_id> for the result.
+
+    The PDF comes back the way the client asks (see _pdf_delivery): inline as pdf_base64
+    (default), as a pdf_url to the download endpoint ("pdf_delivery": "url"), or as the
+    application/pdf body itself when Accept prefers it.
+    """
     try:
         print(f"\n=== RESUME GENERATION STARTED ===")
         print(f"User ID: {current_user_id}")
@@ -523,6 +677,39 @@ def generate_resume(current_user_id):
         # Get optional job description from request
         request_data = request.get_json() if request.is_json else {}
         job_description = request_data.get('job_description', user_data.get('job_description', ''))
+        delivery = _pdf_delivery(request_data)
+        
+        # Same resume text and job description as an earlier generation: return that PDF
+        # without another upstream call or credit ("regenerate": true skips the cache)
+        generation_key = make_generation_key(resume_text, job_description)
+        if not request_data.get('regenerate'):
+            cached = generation_cache.get(current_user_id, generation_key)
+            if cached:
+                print(f"[OK] Generation cache hit: resume {cached['resume_id']}")
+                if delivery == 'pdf':
+                    response = _generated_pdf_response(cached['resume_id'], {
+                        'X-Generation-Cached': 'true',
+                        'X-Credits-Remaining': str(available_credits)
+                    })
+                    if response is not None:
+                        return response
+                return jsonify({
+                    'success': True,
+                    'message': 'Resume generated successfully',
+                    'data': _with_pdf_delivery({
+                        'resume_id': cached['resume_id'],
+                        'pdf_bytes': cached['pdf_bytes'],
+                        'pdf_size_kb': cached['file_size_kb'],
+                        'resume_text_length': len(resume_text),
+                        'job_description_length': len(job_description) if job_description else 0,
+                        'generation_timestamp': cached['created_at'].isoformat(),
+                        'original_filename': cached['original_filename'],
+                        'credits_remaining': available_credits,
+                        'credits_used': credit_info.get('credits_used', 0),
+                        'resumes_generated': credit_info.get('resumes_generated', 0),
+                        'cached': True
+                    }, delivery)
+                }), 200
         
         # Get AWS API URL from environment config (NOT hardcoded)
         aws_api_url = Config.AWS_RESUME_API
@@ -532,89 +719,365 @@ def generate_resume(current_user_id):
                 'error': 'Resume generation service is not configured. Please contact support.'
             }), 500
         
+        # Fail fast while the upstream circuit is open (nothing queued, no credit deducted)
+        try:
+            upstream_breaker.check()
+        except CircuitOpen as e:
+            print(f"[WARNING] {str(e)}")
+            return jsonify({
+                'error': 'Resume generation is temporarily unavailable. No credit was used - please try again shortly.',
+                'retry_after': round(e.retry_after)
+            }), 503, {'Retry-After': str(max(1, round(e.retry_after)))}
+        
         print(f"Using AWS API: {aws_api_url}")
         print(f"Resume text length: {len(resume_text)} characters")
         print(f"Job description length: {len(job_description) if job_description else 0} characters")
         
-        # Step 3: DEDUCT CREDIT NOW (when API is about to be hit)
-        deduction_success = User.deduct_credits(current_user_id, 1)
-        if not deduction_success:
+        # Steps 3-5 run on the generation worker pool. Identical requests from the same user
+        # (double clicks, several tabs) join the job already in flight instead of paying twice.
+        original_filename = user_data.get('file_info', {}).get('filename', 'unknown.pdf')
+        try:
+            job, created = generation_jobs.submit(
+                current_user_id, 'generate_resume', run_generation,
+                current_user_id, resume_text, job_description, original_filename, aws_api_url,
+                generation_key=generation_key, key=(current_user_id,) + generation_key
+            )
+        except JobQueueFull as e:
+            print(f"[WARNING] Generation queue full: {str(e)}")
             return jsonify({
-                'error': 'Failed to deduct credits. Please try again.',
-                'credits_available': available_credits
+                'error': 'The resume generator is busy. Please try again in a minute.'
+            }), 503, {'Retry-After': '30'}
+        
+        if created:
+            print(f"[OK] Generation job queued: {job.id}")
+        else:
+            print(f"[OK] Identical generation already in progress, joined job: {job.id}")
+        status_url = f"/api/resume/generation-status/{job.id}"
+        if delivery == 'url':
+            status_url += '?pdf_delivery=url'  # Polls keep the delivery mode
+        
+        return jsonify({
+            'success': True,
+            'message': 'Resume generation started' if created else 'Resume generation already in progress',
+            'data': {
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': status_url,
+                'coalesced': not created
+            }
+        }), 202, {'Location': status_url}
+            
+    except Exception as e:
+        print(f"Error generating resume: {str(e)}")
+        return jsonify({
+            'error': f'Failed to generate resume: {str(e)}'
+        }), 500
+
+@resume_bp.route('/generation-status/<job_id>', methods=['GET'])
+@token_required
+def generation_status(current_user_id, job_id):
+    """
+    Report the state of a generation job, with the generated resume once it has succeeded.
+
+    The resume is delivered as _pdf_delivery asks; a client accepting application/pdf gets
+    202 with the job state while it is still queued or running, then the PDF itself.
+    """
+    job = generation_jobs.get(job_id)
+    
+    if not job:
+        return jsonify({'error': 'Generation job not found or expired'}), 404
+    
+    # Check if job belongs to current user
+    if job.user_id != current_user_id:
+        return jsonify({'error': 'Access denied'}), 403
+    
+    delivery = _pdf_delivery()
+    data = job.to_dict()
+    if job.status == SUCCEEDED:
+        if delivery == 'pdf' and job.result.get('resume_id'):
+            response = _generated_pdf_response(job.result['resume_id'], {
+                'X-Credits-Remaining': str(job.result.get('credits_remaining', 0))
+            })
+            if response is not None:
+                return response
+        data['result'] = _with_pdf_delivery(job.result, delivery)
+    elif delivery == 'pdf' and job.status in (QUEUED, RUNNING):
+        return jsonify({'success': True, 'data': data}), 202
+    
+    return jsonify({
+        'success': True,
+        'data': data
+    }), 200
+
+def _batch_item(index, generation_key, job_description):
+    return {'index': index, 'job_description_length': len(job_description), 'job_description_hash': generation_key[1]}
+
+@resume_bp.route('/generate-batch', methods=['POST'])
+@token_required
+def generate_batch(current_user_id):
+    """
+    Generate resumes for one processed resume against several job descriptions.
+
+    Body: {"job_descriptions": [...], "regenerate": false, "pdf_delivery": "url"}. Credits for the whole batch are
+    deducted in one step up front; up to BATCH_CONCURRENCY generations run at once on the
+    generation worker pool. The response is NDJSON, one line per event as it happens:
+        {"type": "batch", ...}   what will be generated and what was charged
+        {"type": "result", "index": i, "status": "succeeded"|"failed", ...}   per job description
+        {"type": "done", ...}    totals and remaining credits
+    Job descriptions answered by the generation cache (or repeated in the batch) cost nothing;
+    credits for generations that never reached the API (circuit open, queue full) are refunded.
+    """
+    try:
+        print(f"\n=== BATCH GENERATION STARTED ===")
+        print(f"User ID: {current_user_id}")
+        
+        from models.user import User
+        
+        if current_user_id not in extracted_data_storage:
+            return jsonify({
+                'error': 'No resume data found. Please upload and process a resume first.'
+            }), 404
+        
+        user_data = extracted_data_storage[current_user_id]
+        resume_text = user_data.get('resume_text')
+        if not resume_text:
+            return jsonify({
+                'error': 'No resume text found. Please upload and process a resume first.'
+            }), 404
+        
+        request_data = request.get_json(silent=True) or {}
+        job_descriptions = request_data.get('job_descriptions')
+        if (not isinstance(job_descriptions, list) or not job_descriptions
+                or not all(isinstance(jd, str) and jd.strip() for jd in job_descriptions)):
+            return jsonify({
+                'error': 'job_descriptions must be a non-empty list of job descriptions'
+            }), 400
+        if len(job_descriptions) > BATCH_MAX_JOB_DESCRIPTIONS:
+            return jsonify({
+                'error': f'A batch can hold at most {BATCH_MAX_JOB_DESCRIPTIONS} job descriptions'
+            }), 400
+        
+        aws_api_url = Config.AWS_RESUME_API
+        if not aws_api_url:
+            print("ERROR: AWS_RESUME_API not configured in environment")
+            return jsonify({
+                'error': 'Resume generation service is not configured. Please contact support.'
             }), 500
-        print(f"[OK] Credit deducted before API call")
         
-        # Step 4: Send to AWS API
-        try:
-            base64_pdf_data = send_to_aws_api(resume_text, job_description, aws_api_url)
+        # Sort the batch into cache hits, repeats within the batch and real generations
+        regenerate = bool(request_data.get('regenerate'))
+        delivery = _pdf_delivery(request_data)
+        cached_items = []
+        to_generate = {}  # generation_key -> [indexes]
+        for index, job_description in enumerate(job_descriptions):
+            generation_key = make_generation_key(resume_text, job_description)
+            if generation_key in to_generate:
+                to_generate[generation_key].append(index)
+                continue
+            cached = None if regenerate else generation_cache.get(current_user_id, generation_key)
+            if cached:
+                cached_items.append((index, generation_key, job_description, cached))
+            else:
+                to_generate[generation_key] = [index]
+        cost = len(to_generate)
+        
+        if cost:
+            try:
+                upstream_breaker.check()
+            except CircuitOpen as e:
+                print(f"[WARNING] {str(e)}")
+                return jsonify({
+                    'error': 'Resume generation is temporarily unavailable. No credit was used - please try again shortly.',
+                    'retry_after': round(e.retry_after)
+                }), 503, {'Retry-After': str(max(1, round(e.retry_after)))}
+            
+            # One deduction for the whole batch (atomic, fails if the balance is too low)
+            if not User.deduct_credits(current_user_id, cost):
+                credit_info = User.get_current_credits(current_user_id)
+                return jsonify({
+                    'error': f'Insufficient credits. This batch needs {cost} credit(s).',
+                    'credits_available': credit_info.get('credits', 0) if credit_info else 0,
+                    'credits_required': cost
+                }), 402
+            print(f"[OK] Deducted {cost} credit(s) for the batch")
+        
+        original_filename = user_data.get('file_info', {}).get('filename', 'unknown.pdf')
+        print(f"Batch: {len(job_descriptions)} job descriptions, {len(cached_items)} cached, {cost} to generate")
+        
+        def stream():
+            succeeded = failed = refunded = 0
             
-            # Validate base64 data
-            if not base64_pdf_data:
-                raise Exception("Received empty base64 data from API")
+            # Generations run as jobs on the shared worker pool; each reports to this queue
+            # when it finishes, so results stream in completion order
+            finished = queue.Queue()
             
-            # Try to decode to validate it's proper base64
+            def generate_one(generation_key, job_description):
+                try:
+                    result = run_generation(current_user_id, resume_text, job_description, original_filename,
+                                            aws_api_url, generation_key=generation_key, charge=False)
+                except GenerationUnavailable as e:
+                    # Never reached the API: give the credit back here, so it is returned
+                    # even when the client has gone and nobody reads the queue
+                    finished.put((generation_key, None, e, User.refund_credits(current_user_id, 1)))
+                    raise
+                except Exception as e:
+                    finished.put((generation_key, None, e, False))
+                    raise
+                finished.put((generation_key, result, None, False))
+                return {'resume_id': result['resume_id']}  # The job table keeps no PDF copy
+            
+            pending = [(key, job_descriptions[indexes[0]]) for key, indexes in to_generate.items()]
+            running = 0
             try:
-                pdf_bytes = base64.b64decode(base64_pdf_data)
-                pdf_size_kb = len(pdf_bytes) / 1024
-                
-                print(f"[OK] Generated PDF size: {pdf_size_kb:.2f} KB")
-                
-                # Step 5: API SUCCESS - Increment resumes_generated counter
-                User.increment_resumes_generated(current_user_id)
-                print(f"[OK] resumes_generated incremented")
-                
-                # Save resume to database
-                resume = Resume(
-                    user_id=current_user_id,
-                    original_filename=user_data.get('file_info', {}).get('filename', 'unknown.pdf'),
-                    job_description=job_description,
-                    resume_text=resume_text,
-                    pdf_base64=base64_pdf_data,
-                    file_size_kb=round(pdf_size_kb, 2)
-                )
-                
-                resume_id = resume.save()
-                print(f" Resume saved to database with ID: {resume_id}")
+                yield json.dumps({
+                    'type': 'batch',
+                    'total': len(job_descriptions),
+                    'cached': len(cached_items),
+                    'generating': cost,
+                    'credits_charged': cost
+                }) + '\n'
                 
-                # Fetch updated credit info
-                updated_credits = User.get_current_credits(current_user_id)
-                
-                # Return success response with resume ID and updated credits
-                return jsonify({
-                    'success': True,
-                    'message': 'Resume generated successfully',
-                    'data': {
-                        'resume_id': resume_id,
-                        'pdf_base64': base64_pdf_data,
-                        'pdf_size_kb': round(pdf_size_kb, 2),
-                        'resume_text_length': len(resume_text),
-                        'job_description_length': len(job_description) if job_description else 0,
-                        'generation_timestamp': datetime.now().isoformat(),
-                        'original_filename': user_data.get('file_info', {}).get('filename', 'unknown.pdf'),
-                        'credits_remaining': updated_credits.get('credits', 0) if updated_credits else 0,
-                        'credits_used': updated_credits.get('credits_used', 0) if updated_credits else 0,
-                        'resumes_generated': updated_credits.get('resumes_generated', 0) if updated_credits else 0
-                    }
-                }), 200
-                
-            except binascii.Error:
-                raise Exception("Invalid base64 data received from API")
+                for index, generation_key, job_description, cached in cached_items:
+                    succeeded += 1
+                    item = _batch_item(index, generation_key, job_description)
+                    item.update({
+                        'type': 'result',
+                        'status': 'succeeded',
+                        'cached': True,
+                        'resume_id': cached['resume_id'],
+                        'pdf_bytes': cached['pdf_bytes'],
+                        'pdf_size_kb': cached['file_size_kb'],
+                        'generation_timestamp': cached['created_at'].isoformat()
+                    })
+                    yield json.dumps(_with_pdf_delivery(item, delivery)) + '\n'
                 
-        except Exception as api_error:
-            # API FAILED - Credit already deducted, resumes_generated NOT incremented
-            print(f"API Error: {str(api_error)}")
-            print("✗ Credit was deducted but API failed - resumes_generated NOT incremented")
-            return jsonify({
-                'error': f'Resume generation failed: {str(api_error)}'
-            }), 500
+                while pending or running:
+                    while pending and running < BATCH_CONCURRENCY:
+                        generation_key, job_description = pending.pop(0)
+                        try:
+                            generation_jobs.submit(current_user_id, 'generate_batch_item', generate_one,
+                                                   generation_key, job_description)
+                        except JobQueueFull:
+                            finished.put((generation_key, None, GenerationUnavailable(
+                                'The resume generator is busy. No credit was used - please try again in a minute.'),
+                                User.refund_credits(current_user_id, 1)))
+                        running += 1
+                    
+                    generation_key, result, error, was_refunded = finished.get()
+                    running -= 1
+                    if was_refunded:
+                        refunded += 1
+                    
+                    for index in to_generate[generation_key]:
+                        item = _batch_item(index, generation_key, job_descriptions[index])
+                        item['type'] = 'result'
+                        if error is None:
+                            succeeded += 1
+                            item.update({
+                                'status': 'succeeded',
+                                'cached': False,
+                                'resume_id': result['resume_id'],
+                                'pdf_bytes': result.get('pdf_bytes'),
+                                'pdf_size_kb': result['pdf_size_kb'],
+                                'generation_timestamp': result['generation_timestamp']
+                            })
+                        else:
+                            failed += 1
+                            item.update({'status': 'failed', 'error': str(error)})
+                        yield json.dumps(_with_pdf_delivery(item, delivery)) + '\n'
+            finally:
+                # Client gone (GeneratorExit) or the stream failed: job descriptions never handed
+                # to the worker pool were charged up front but will not be generated
+                if pending:
+                    if User.refund_credits(current_user_id, len(pending)):
+                        refunded += len(pending)
+                    print(f"[WARNING] Batch stopped early: refunded {len(pending)} credit(s) for unsubmitted job descriptions")
             
+            updated_credits = User.get_current_credits(current_user_id)
+            print(f"[OK] Batch finished: {succeeded} succeeded, {failed} failed, {refunded} credit(s) refunded")
+            print(f"\n=== BATCH GENERATION COMPLETED ===\n")
+            yield json.dumps({
+                'type': 'done',
+                'succeeded': succeeded,
+                'failed': failed,
+                'credits_refunded': refunded,
+                'credits_remaining': updated_credits.get('credits', 0) if updated_credits else 0,
+                'credits_used': updated_credits.get('credits_used', 0) if updated_credits else 0
+            }) + '\n'
+        
+        # If the client disconnects, submitted generations still finish and are saved;
+        # the rest are refunded by the generator's finally block
+        return Response(stream_with_context(stream()), mimetype='application/x-ndjson',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
     except Exception as e:
-        print(f"Error generating resume: {str(e)}")
+        print(f"Error generating batch: {str(e)}")
         return jsonify({
-            'error': f'Failed to generate resume: {str(e)}'
+            'error': f'Failed to generate batch: {str(e)}'
         }), 500
 
+def _send_resume_pdf(resume_id, resume_doc):
+    """
+    Stream a saved resume's PDF as the response body.
+
+    Answers If-None-Match with 304 and Range with 206 (416 if unsatisfiable). Counts a download
+    for a 200 and for a 206 starting at byte 0, never for a 304 (the client already has the PDF).
+
+    Args:
+        resume_doc: The resume with at least Resume.DOWNLOAD_FIELDS, already checked for ownership
+    """
+    # Generate filename
+    timestamp = resume_doc['created_at'].strftime('%Y%m%d_%H%M%S')
+    filename = f"optimized_resume_{timestamp}.pdf"
+    
+    # Stored PDFs never change: a client holding the current ETag gets a 304
+    # before the PDF is even read
+    etag = pdf_etag(resume_doc)
+    if etag and request.if_none_match.contains(etag):
+        print(f"[OK] PDF not modified, 304 sent")
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    
+    # Open the stored PDF (seekable; legacy documents are decoded)
+    try:
+        pdf = open_resume_pdf(resume_doc)
+    except PdfStorageError as storage_error:
+        print(f"✗ {str(storage_error)}")
+        return jsonify({'error': 'Failed to read PDF data'}), 500
+    if not pdf:
+        return jsonify({'error': 'PDF data not available'}), 404
+    pdf_size, pdf_file, etag = pdf
+    
+    # Stream the PDF; make_conditional answers If-None-Match with 304 and
+    # Range with 206, reading only the requested bytes
+    response = send_file(
+        pdf_file,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=filename,
+        etag=etag,
+        conditional=False
+    )
+    response.content_length = pdf_size
+    response.cache_control.private = True
+    response.cache_control.no_cache = True  # Revalidate; the 304 is cheap
+    try:
+        response = response.make_conditional(request, accept_ranges=True, complete_length=pdf_size)
+    except RequestedRangeNotSatisfiable:
+        response.close()
+        return Response(status=416, headers={'Content-Range': f'bytes */{pdf_size}'})
+    
+    # Count a download once: not for revalidations (304) or the follow-up ranges of a resumed download
+    if response.status_code == 200 or (response.status_code == 206 and request.range
+                                       and request.range.ranges[0][0] == 0):
+        Resume.update_download_count(resume_id, resume_doc['user_id'])
+    
+    print(f"[OK] Sending PDF download: {pdf_size} bytes ({response.status_code})")
+    return response
+
 @resume_bp.route('/download/<resume_id>', methods=['GET'])
 @token_required
 def download_resume(current_user_id, resume_id):
@@ -624,8 +1087,8 @@ def download_resume(current_user_id, resume_id):
         print(f"User ID: {current_user_id}")
         print(f"Resume ID: {resume_id}")
         
-        # Find resume in database
-        resume_doc = Resume.find_by_id(resume_id)
+        # Find resume in database (owner, date and PDF reference only)
+        resume_doc = Resume.find_by_id(resume_id, Resume.DOWNLOAD_FIELDS)
         
         if not resume_doc:
             return jsonify({'error': 'Resume not found'}), 404
@@ -634,36 +1097,7 @@ def download_resume(current_user_id, resume_id):
         if resume_doc['user_id'] != current_user_id:
             return jsonify({'error': 'Access denied'}), 403
         
-        # Get PDF data
-        pdf_base64 = resume_doc['pdf_base64']
-        if not pdf_base64:
-            return jsonify({'error': 'PDF data not available'}), 404
-        
-        # Decode base64 to bytes
-        try:
-            pdf_bytes = base64.b64decode(pdf_base64)
-        except Exception as decode_error:
-            return jsonify({'error': 'Failed to decode PDF data'}), 500
-        
-        # Update download count
-        Resume.update_download_count(resume_id)
-        
-        # Generate filename
-        timestamp = resume_doc['created_at'].strftime('%Y%m%d_%H%M%S')
-        filename = f"optimized_resume_{timestamp}.pdf"
-        
-        print(f"[OK] Sending PDF download: {len(pdf_bytes)} bytes")
-        
-        # Return PDF as download
-        return Response(
-            pdf_bytes,
-            mimetype='application/pdf',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Type': 'application/pdf',
-                'Content-Length': str(len(pdf_bytes))
-            }
-        )
+        return _send_resume_pdf(resume_id, resume_doc)
         
     except Exception as e:
         print(f"Error downloading resume: {str(e)}")
@@ -672,29 +1106,43 @@ def download_resume(current_user_id, resume_id):
 @resume_bp.route('/user-resumes', methods=['GET'])
 @token_required
 def get_user_resumes(current_user_id):
-    """Get all resumes for current user"""
+    """
+    Get one page of the current user's resumes, newest first.
+
+    Query params: limit (page size, default HISTORY_PAGE_SIZE, at most HISTORY_MAX_PAGE_SIZE) and
+    cursor (next_cursor of the previous page). Stats are only computed for the first page.
+    """
     try:
         print(f"\n=== FETCHING USER RESUMES ===")
         print(f"User ID: {current_user_id}")
         
-        # Get limit from query params
-        limit = request.args.get('limit', type=int)
+        # Get page size and position from query params
+        limit = request.args.get('limit', type=int) or HISTORY_PAGE_SIZE
+        limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+        cursor = request.args.get('cursor') or None
         
-        # Fetch resumes from database
-        resumes = Resume.find_by_user_id(current_user_id, limit=limit)
+        # Fetch one page of resumes from database
+        try:
+            resumes, next_cursor = Resume.find_by_user_id(current_user_id, limit=limit, cursor=cursor)
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        data = {
+            'resumes': resumes,
+            'total_count': len(resumes),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }
         
         # Get user stats
-        stats = Resume.get_user_stats(current_user_id)
+        if not cursor:
+            data['stats'] = Resume.get_user_stats(current_user_id)
         
         print(f"[OK] Found {len(resumes)} resumes for user")
         
         return jsonify({
             'success': True,
-            'data': {
-                'resumes': resumes,
-                'stats': stats,
-                'total_count': len(resumes)
-            }
+            'data': data
         }), 200
         
     except Exception as e:
@@ -710,8 +1158,8 @@ def get_resume_details(current_user_id, resume_id):
         print(f"User ID: {current_user_id}")
         print(f"Resume ID: {resume_id}")
         
-        # Find resume in database
-        resume_doc = Resume.find_by_id(resume_id)
+        # Find resume in database (without resume text or PDF data for performance)
+        resume_doc = Resume.find_by_id(resume_id, Resume.DETAIL_FIELDS)
         
         if not resume_doc:
             return jsonify({'error': 'Resume not found'}), 404
@@ -720,7 +1168,7 @@ def get_resume_details(current_user_id, resume_id):
         if resume_doc['user_id'] != current_user_id:
             return jsonify({'error': 'Access denied'}), 403
         
-        # Return resume details (without PDF data for performance)
+        # Return resume details
         resume_details = {
             'id': str(resume_doc['_id']),
             'original_filename': resume_doc['original_filename'],
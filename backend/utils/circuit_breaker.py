@@ -0,0 +1,236 @@
+"""
+Circuit breaker and bulkhead for calls to the resume-generation API.
+
+Circuit breaker: outcomes of the last CIRCUIT_WINDOW calls are kept. Once
+at least CIRCUIT_MIN_CALLS are recorded and either the failure rate or the
+slow-call rate reaches its threshold, the circuit opens and calls fail
+fast (CircuitOpen) for CIRCUIT_OPEN_SECONDS. After that the circuit is
+half-open: up to CIRCUIT_HALF_OPEN_TRIALS trial calls go through, and the
+circuit closes if they all succeed or re-opens on the first failure.
+
+Bulkhead: a per-process cap on concurrent upstream calls
+(UPSTREAM_MAX_CONCURRENT), so a slow upstream cannot tie up every worker.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+CIRCUIT_WINDOW = int(os.getenv('CIRCUIT_WINDOW', 20))                        # Calls remembered
+CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', 5))                   # Before rates count
+CIRCUIT_FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', 0.5))         # Open at this error rate
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', 30))
+CIRCUIT_SLOW_CALL_RATE = float(os.getenv('CIRCUIT_SLOW_CALL_RATE', 0.8))     # Open at this slow rate
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', 30))          # Fail fast this long
+CIRCUIT_HALF_OPEN_TRIALS = int(os.getenv('CIRCUIT_HALF_OPEN_TRIALS', 1))
+
+UPSTREAM_MAX_CONCURRENT = int(os.getenv('UPSTREAM_MAX_CONCURRENT', 8))       # Per process
+UPSTREAM_BULKHEAD_WAIT = float(os.getenv('UPSTREAM_BULKHEAD_WAIT', 5))       # Seconds to wait for a slot
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Upstream circuit is open, retry in {retry_after:.0f}s")
+
+
+class BulkheadFull(Exception):
+    """Raised when no upstream call slot frees up in time"""
+    pass
+
+
+class CircuitBreaker:
+    """Failure-rate / slow-call-rate circuit breaker; safe to share between threads"""
+
+    def __init__(self, name, window=CIRCUIT_WINDOW, min_calls=CIRCUIT_MIN_CALLS,
+                 failure_rate=CIRCUIT_FAILURE_RATE, slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+                 slow_call_rate=CIRCUIT_SLOW_CALL_RATE, open_seconds=CIRCUIT_OPEN_SECONDS,
+                 half_open_trials=CIRCUIT_HALF_OPEN_TRIALS, ignore=()):
+        """
+        Args:
+            name: Label used in log lines
+            ignore: Exception types that say nothing about upstream health (e.g. the
+                upstream rejecting bad input); they are not recorded as calls
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_trials = half_open_trials
+        self.ignore = ignore
+
+        self._outcomes = deque(maxlen=window)  # (failed, slow) per call
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trials = 0        # Trial calls in progress while half-open
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _retry_after(self):
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def _current_state(self):
+        """State with the open -> half-open timeout applied (lock held)"""
+        if self._state == OPEN and self._retry_after() == 0:
+            self._state = HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+            print(f"[WARNING] Circuit '{self.name}' half-open: sending trial requests")
+        return self._state
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def check(self):
+        """
+        Fail fast if a call would be rejected now, without reserving a trial slot.
+
+        Raises:
+            CircuitOpen: while the circuit is open (or half-open with all trial slots taken)
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._trials >= self.half_open_trials):
+                raise CircuitOpen(self._retry_after() or self.open_seconds)
+
+    def _acquire(self):
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN:
+                self.rejected += 1
+                raise CircuitOpen(self._retry_after())
+            if state == HALF_OPEN:
+                if self._trials >= self.half_open_trials:
+                    self.rejected += 1
+                    raise CircuitOpen(self.open_seconds)
+                self._trials += 1
+            return state
+
+    def _trip(self, reason):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        print(f"✗ Circuit '{self.name}' opened ({reason}); failing fast for {self.open_seconds:g}s")
+
+    def _record(self, entered_state, failed, duration):
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if entered_state == HALF_OPEN and self._state == HALF_OPEN:
+                self._trials -= 1
+                if failed or slow:
+                    self._trip('trial request failed' if failed else 'trial request slow')
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_trials:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    print(f"[OK] Circuit '{self.name}' closed: upstream recovered")
+                return
+            if self._state != CLOSED:
+                return  # Late result of a call started before the circuit opened
+
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if failures / calls >= self.failure_rate:
+                self._trip(f"{failures}/{calls} calls failed")
+            elif slow_calls / calls >= self.slow_call_rate:
+                self._trip(f"{slow_calls}/{calls} calls slower than {self.slow_call_seconds:g}s")
+
+    def _release(self, entered_state):
+        """Give back a trial slot without recording an outcome"""
+        if entered_state == HALF_OPEN:
+            with self._lock:
+                if self._state == HALF_OPEN:
+                    self._trials -= 1
+
+    def guard(self):
+        """
+        Context manager around one upstream call.
+
+        Raises CircuitOpen on entry while the circuit is open; on exit records success,
+        failure (any exception not in ignore) and latency, unless the guard was cancelled.
+        """
+        return _Guard(self)
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            return {
+                'state': state,
+                'calls_in_window': calls,
+                'failures_in_window': sum(1 for f, _ in self._outcomes if f),
+                'slow_in_window': sum(1 for _, s in self._outcomes if s),
+                'retry_after': round(self._retry_after(), 1) if state == OPEN else 0,
+                'rejected': self.rejected,
+            }
+
+
+class _Guard:
+    def __init__(self, breaker):
+        self.breaker = breaker
+        self.cancelled = False
+
+    def __enter__(self):
+        self.state = self.breaker._acquire()
+        self.started = time.monotonic()
+        return self
+
+    def cancel(self):
+        """The call never reached the upstream (e.g. a precondition failed): record nothing"""
+        self.cancelled = True
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.cancelled or (exc_type is not None and issubclass(exc_type, self.breaker.ignore)):
+            self.breaker._release(self.state)
+        else:
+            self.breaker._record(self.state, exc_type is not None, time.monotonic() - self.started)
+        return False
+
+
+class Bulkhead:
+    """Caps concurrent calls; callers wait up to `wait` seconds for a slot"""
+
+    def __init__(self, name, max_concurrent=UPSTREAM_MAX_CONCURRENT, wait=UPSTREAM_BULKHEAD_WAIT):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._active = 0
+        self.rejected = 0
+
+    def __enter__(self):
+        if not self._slots.acquire(timeout=self.wait):
+            with self._lock:
+                self.rejected += 1
+            raise BulkheadFull(f"All {self.max_concurrent} '{self.name}' slots busy")
+        with self._lock:
+            self._active += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {'max_concurrent': self.max_concurrent, 'active': self._active,
+                    'rejected': self.rejected}
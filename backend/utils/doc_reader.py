@@ -0,0 +1,258 @@
+"""
+Text extraction for legacy Word 97-2003 (.doc) files, in pure Python.
+
+A .doc file is an OLE2 compound file (a small FAT filesystem inside one
+file). The text lives in the 'WordDocument' stream, split into pieces that
+are described by the piece table (the CLX structure) stored in the
+'0Table' or '1Table' stream. Each piece is either 8-bit (cp1252) or
+UTF-16LE text. See [MS-CFB] and [MS-DOC] for the formats.
+
+Only the main document story is returned (footnotes, comments and
+header stories follow it in the character stream and are skipped).
+"""
+import struct
+
+CFB_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+WORD_IDENT = 0xA5EC
+
+# Sector numbers above this are special markers (end of chain, free...)
+_MAX_REGSECT = 0xFFFFFFFA
+
+# Word control characters -> plain text
+_CONTROL_CHARS = {
+    '\r': '\n',    # Paragraph end
+    '\x0b': '\n',  # Line break
+    '\x0c': '\n',  # Page / section break
+    '\x07': '\t',  # Table cell / row end
+    '\x1e': '-',   # Non-breaking hyphen
+    '\xa0': ' ',   # Non-breaking space
+}
+_DROP_CHARS = {'\x01', '\x02', '\x05', '\x08', '\x1f'}  # Objects, notes, soft hyphens
+
+
+class DocFormatError(Exception):
+    """Raised when a file is not a readable Word 97-2003 document"""
+    pass
+
+
+class CompoundFile:
+    """Minimal read-only OLE2 compound file reader"""
+
+    def __init__(self, data):
+        if len(data) < 512 or data[:8] != CFB_SIGNATURE:
+            raise DocFormatError("Not an OLE2 compound file")
+        self.data = memoryview(data)
+
+        (sector_shift, mini_shift) = struct.unpack_from('<HH', data, 0x1E)
+        (num_fat, first_dir, _, self.mini_cutoff, first_minifat, num_minifat,
+         first_difat, num_difat) = struct.unpack_from('<IIIIIIII', data, 0x2C)
+        if sector_shift not in (9, 12) or mini_shift != 6:
+            raise DocFormatError("Unsupported compound file sector size")
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_shift
+        self.max_sectors = max(0, -(-(len(data) - self.sector_size) // self.sector_size))
+
+        self.fat = self._read_fat(num_fat, first_difat, num_difat)
+        self.entries = self._read_directory(first_dir)
+
+        root = self.entries[0] if self.entries else None
+        if root is None:
+            raise DocFormatError("Compound file has no root entry")
+        self.minifat = []
+        if num_minifat:
+            raw = self._read_chain(first_minifat)
+            self.minifat = list(struct.unpack_from(f'<{len(raw) // 4}I', raw))
+        self.mini_stream = self._read_chain(root[1], root[2]) if root[2] else b''
+
+    def _sector(self, number):
+        if number >= self.max_sectors:
+            raise DocFormatError("Sector number out of range")
+        offset = (number + 1) * self.sector_size
+        return self.data[offset:offset + self.sector_size]
+
+    def _read_fat(self, num_fat, first_difat, num_difat):
+        sectors = list(struct.unpack_from('<109I', self.data, 0x4C))
+        per_difat = self.sector_size // 4 - 1
+        difat = first_difat
+        for _ in range(num_difat):
+            if difat > _MAX_REGSECT:
+                break
+            entries = struct.unpack_from(f'<{per_difat + 1}I', self._sector(difat))
+            sectors.extend(entries[:per_difat])
+            difat = entries[per_difat]
+
+        fat = []
+        for number in sectors[:num_fat]:
+            if number > _MAX_REGSECT:
+                break
+            fat.extend(struct.unpack_from(f'<{self.sector_size // 4}I', self._sector(number)))
+        return fat
+
+    def _chain(self, start, table, limit):
+        """Follow a sector chain, guarding against loops in damaged files"""
+        chain = []
+        sector = start
+        while sector <= _MAX_REGSECT:
+            if len(chain) > limit or sector >= len(table):
+                raise DocFormatError("Corrupt sector chain")
+            chain.append(sector)
+            sector = table[sector]
+        return chain
+
+    def _read_chain(self, start, size=None):
+        raw = b''.join(self._sector(n) for n in self._chain(start, self.fat, len(self.fat)))
+        return raw if size is None else raw[:size]
+
+    def _read_directory(self, first_dir):
+        raw = self._read_chain(first_dir)
+        entries = []
+        for offset in range(0, len(raw) - 127, 128):
+            name_len, entry_type = struct.unpack_from('<HB', raw, offset + 64)
+            start, size = struct.unpack_from('<IQ', raw, offset + 116)
+            name = bytes(raw[offset:offset + max(0, name_len - 2)]).decode('utf-16-le', 'replace')
+            if self.sector_size == 512:
+                size &= 0xFFFFFFFF  # Version 3 files: high dword is undefined
+            entries.append((name, start, size, entry_type))
+        return entries
+
+    def read_stream(self, name):
+        """Return the contents of the stream called name"""
+        for entry_name, start, size, entry_type in self.entries:
+            if entry_type == 2 and entry_name == name:
+                break
+        else:
+            raise DocFormatError(f"Stream '{name}' not found")
+
+        if size < self.mini_cutoff:
+            chain = self._chain(start, self.minifat, len(self.minifat))
+            step = self.mini_sector_size
+            raw = b''.join(bytes(self.mini_stream[n * step:(n + 1) * step]) for n in chain)
+        else:
+            raw = self._read_chain(start)
+        if len(raw) < size:
+            raise DocFormatError(f"Stream '{name}' is truncated")
+        return raw[:size]
+
+
+def _read_fib(word_stream):
+    """Read the FIB fields we need: table stream name, main text length, CLX location"""
+    if len(word_stream) < 34:
+        raise DocFormatError("WordDocument stream too short")
+    ident, n_fib = struct.unpack_from('<HH', word_stream, 0)
+    flags, = struct.unpack_from('<H', word_stream, 0x0A)
+    if ident != WORD_IDENT:
+        raise DocFormatError("Not a Word document")
+    if n_fib < 0x00C1:
+        raise DocFormatError("Word 6/95 documents are not supported")
+    if flags & 0x0100:
+        raise DocFormatError("Document is encrypted")
+    table_name = '1Table' if flags & 0x0200 else '0Table'
+
+    # FibBase (32 bytes), then csw + fibRgW, cslw + fibRgLw, cbRgFcLcb + fibRgFcLcb
+    offset = 32
+    csw, = struct.unpack_from('<H', word_stream, offset)
+    offset += 2 + csw * 2
+    cslw, = struct.unpack_from('<H', word_stream, offset)
+    rg_lw = offset + 2
+    offset = rg_lw + cslw * 4
+    cb_fc_lcb, = struct.unpack_from('<H', word_stream, offset)
+    rg_fc_lcb = offset + 2
+    if cslw < 4 or cb_fc_lcb < 34:
+        raise DocFormatError("FIB is too short")
+
+    ccp_text, = struct.unpack_from('<i', word_stream, rg_lw + 3 * 4)  # FibRgLw97.ccpText
+    fc_clx, lcb_clx = struct.unpack_from('<II', word_stream, rg_fc_lcb + 33 * 8)  # fcClx/lcbClx
+    return table_name, ccp_text, fc_clx, lcb_clx
+
+
+def _read_pieces(table_stream, fc_clx, lcb_clx):
+    """
+    Parse the CLX: skip Prc entries, then read the PlcPcd piece table.
+
+    Returns:
+        list of (cp_start, cp_end, byte offset, compressed) tuples
+    """
+    clx = table_stream[fc_clx:fc_clx + lcb_clx]
+    offset = 0
+    while offset < len(clx) and clx[offset] == 0x01:  # Prc
+        cb_grpprl, = struct.unpack_from('<h', clx, offset + 1)
+        offset += 3 + cb_grpprl
+    if offset >= len(clx) or clx[offset] != 0x02:  # Pcdt
+        raise DocFormatError("Piece table not found")
+    lcb, = struct.unpack_from('<I', clx, offset + 1)
+    plc = clx[offset + 5:offset + 5 + lcb]
+
+    count = (len(plc) - 4) // 12
+    if count <= 0:
+        raise DocFormatError("Empty piece table")
+    cps = struct.unpack_from(f'<{count + 1}I', plc, 0)
+    pieces = []
+    for i in range(count):
+        fc, = struct.unpack_from('<I', plc, (count + 1) * 4 + i * 8 + 2)
+        compressed = bool(fc & 0x40000000)
+        fc &= 0x3FFFFFFF
+        pieces.append((cps[i], cps[i + 1], fc // 2 if compressed else fc, compressed))
+    return pieces
+
+
+def _clean(text):
+    """Turn Word's control characters into plain text and keep only field results"""
+    out = []
+    field_depth = 0      # Nesting of \x13 ... \x15 fields
+    in_instruction = []  # Per open field: still inside the instruction part?
+    for ch in text:
+        if ch == '\x13':
+            field_depth += 1
+            in_instruction.append(True)
+            continue
+        if ch == '\x14' and field_depth:
+            in_instruction[-1] = False
+            continue
+        if ch == '\x15' and field_depth:
+            field_depth -= 1
+            in_instruction.pop()
+            continue
+        if field_depth and in_instruction[-1]:
+            continue
+        if ch in _DROP_CHARS:
+            continue
+        out.append(_CONTROL_CHARS.get(ch, ch))
+
+    lines = (line.strip() for line in ''.join(out).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def read_doc_text(data, max_chars=None):
+    """
+    Extract the main document text from a Word 97-2003 .doc file.
+
+    Args:
+        data: Raw file bytes
+        max_chars: Stop decoding once this many characters have been read
+
+    Returns:
+        str: Plain text, one paragraph per line
+
+    Raises:
+        DocFormatError: if the file is not a readable Word 97-2003 document
+    """
+    try:
+        ole = CompoundFile(data)
+        word_stream = ole.read_stream('WordDocument')
+        table_name, ccp_text, fc_clx, lcb_clx = _read_fib(word_stream)
+        pieces = _read_pieces(ole.read_stream(table_name), fc_clx, lcb_clx)
+    except struct.error:
+        raise DocFormatError("Truncated or corrupt document structure")
+
+    limit = ccp_text if max_chars is None else min(ccp_text, max_chars)
+    parts = []
+    for cp_start, cp_end, fc, compressed in pieces:
+        if cp_start >= limit:
+            break
+        count = min(cp_end, limit) - cp_start
+        if compressed:
+            parts.append(bytes(word_stream[fc:fc + count]).decode('cp1252', 'replace'))
+        else:
+            parts.append(bytes(word_stream[fc:fc + count * 2]).decode('utf-16-le', 'replace'))
+
+    return _clean(''.join(parts))
@@ -0,0 +1,723 @@
+"""
+Process-pool text extraction engine.
+
+PDF, DOCX and DOC extraction runs in a pool of worker processes so that pdfplumber's
+layout analysis never holds a Flask worker (or the GIL) for the duration
+of a large upload. Page ranges are spread across workers and documents
+that get stuck are stopped after EXTRACTION_TIMEOUT seconds: only the
+workers running that document's tasks are killed and replaced, so
+extractions of other uploads running at the same time are not affected.
+"""
+import multiprocessing
+import os
+import posixpath
+import queue
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, wait, FIRST_EXCEPTION
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+from io import BytesIO
+
+import pdfplumber
+from lxml import etree
+
+from utils.doc_reader import read_doc_text
+from utils.pdf_text import FastPdfReader, looks_broken
+
+# Pool settings (override through environment variables)
+EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', min(4, os.cpu_count() or 1)))
+EXTRACTION_PAGES_PER_TASK = int(os.getenv('EXTRACTION_PAGES_PER_TASK', 4))
+EXTRACTION_TIMEOUT = float(os.getenv('EXTRACTION_TIMEOUT', 20))
+# Extraction budget per document: stop early and mark the text truncated
+EXTRACTION_MAX_PAGES = int(os.getenv('EXTRACTION_MAX_PAGES', 10))
+EXTRACTION_MAX_CHARS = int(os.getenv('EXTRACTION_MAX_CHARS', 60000))
+EXTRACTION_TIME_BUDGET = float(os.getenv('EXTRACTION_TIME_BUDGET', 8))
+# 'auto' (fast tier, layout fallback per page), 'fast' or 'layout'
+PDF_EXTRACTION_MODE = os.getenv('PDF_EXTRACTION_MODE', 'auto')
+
+# Bump whenever extractor output changes so cached text is not reused
+EXTRACTOR_VERSION = '6'
+
+
+class ExtractionTimeout(Exception):
+    """Raised when a document does not finish extracting in time"""
+    pass
+
+
+class ExtractionWorkerLost(Exception):
+    """Raised when the worker process running a task died (crash, out of memory) before answering"""
+    pass
+
+
+class ExtractionBudget:
+    """
+    Limits for extracting one document: pages, characters and wall-clock seconds.
+
+    Unlike EXTRACTION_TIMEOUT (which kills the document's workers and fails the upload),
+    running out of budget stops extraction early and keeps what was read so far.
+    The deadline is absolute wall-clock time so it survives pickling to workers.
+    """
+
+    def __init__(self, max_pages=None, max_chars=None, seconds=None):
+        self.max_pages = max_pages or EXTRACTION_MAX_PAGES
+        self.max_chars = max_chars or EXTRACTION_MAX_CHARS
+        self.seconds = seconds or EXTRACTION_TIME_BUDGET
+        self.deadline = None
+
+    def start(self):
+        """Start the clock (once per document)"""
+        if self.deadline is None:
+            self.deadline = time.time() + self.seconds
+        return self
+
+    def out_of_time(self):
+        return self.deadline is not None and time.time() > self.deadline
+
+    def clip(self, text):
+        """
+        Cut text down to max_chars, preferring a line boundary.
+
+        Returns:
+            tuple: (text, whether it was cut)
+        """
+        if len(text) <= self.max_chars:
+            return text, False
+        cut = text.rfind('\n', 0, self.max_chars)
+        if cut < self.max_chars // 2:
+            cut = self.max_chars
+        return text[:cut].rstrip(), True
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _open_source(source):
+    """Open bytes or a file path as something pdfplumber / python-docx can read"""
+    if isinstance(source, (bytes, bytearray)):
+        return BytesIO(source)
+    return source
+
+
+def _extract_pdf_pages(source, start, end, mode, budget):
+    """
+    Extract text from pages [start, end) of a PDF. Runs inside a worker process.
+
+    In 'auto' mode each page goes through the fast tier first and is only
+    re-extracted with pdfplumber's full layout analysis when the fast text
+    looks broken. 'fast' and 'layout' force a single tier. The range stops
+    early once the budget's character or time limit is reached.
+
+    Args:
+        source: PDF bytes, or the path of a spooled upload
+        mode: 'auto', 'fast' or 'layout'
+        budget: ExtractionBudget for the document
+
+    Returns:
+        tuple: (total page count, page texts, per-page reports, reason the range
+        stopped early or None)
+    """
+    texts, reports = [], []
+    chars = 0
+    stopped = None
+    reader = None
+    layout_pdf = None
+    try:
+        if mode == 'layout':
+            layout_pdf = pdfplumber.open(_open_source(source))
+            total_pages = len(layout_pdf.pages)
+        else:
+            reader = FastPdfReader(_open_source(source))
+            total_pages = len(reader.pages)
+
+        for index in range(start, min(end, total_pages)):
+            if budget.out_of_time():
+                stopped = 'time'
+                break
+
+            text, reason = None, 'forced'
+            report = {'tier': 'fast', 'fast_ms': 0.0, 'layout_ms': 0.0}
+            if reader is not None:
+                began = time.perf_counter()
+                text, stats = reader.extract_page(index)
+                report['fast_ms'] = (time.perf_counter() - began) * 1000
+                reason = looks_broken(text, stats) if mode == 'auto' else None
+
+            if reason:
+                began = time.perf_counter()
+                if layout_pdf is None:
+                    layout_pdf = pdfplumber.open(_open_source(source))
+                text = layout_pdf.pages[index].extract_text() or ''
+                report.update(tier='layout', reason=reason,
+                              layout_ms=(time.perf_counter() - began) * 1000)
+
+            texts.append(text)
+            reports.append(report)
+            chars += len(text) + 1
+            if chars >= budget.max_chars:
+                stopped = 'chars'
+                break
+
+        return total_pages, texts, reports, stopped
+    finally:
+        if layout_pdf is not None:
+            layout_pdf.close()
+
+
+def _summarize_pdf_reports(reports):
+    """Fold per-page reports into the summary returned to the client"""
+    layout_pages = {
+        page: report['reason']
+        for page, report in enumerate(reports, start=1) if report['tier'] == 'layout'
+    }
+    if not layout_pages:
+        mode = 'fast'
+    elif len(layout_pages) == len(reports):
+        mode = 'layout'
+    else:
+        mode = 'mixed'
+
+    return {
+        'mode': mode,
+        'pages': len(reports),
+        'layout_pages': layout_pages,
+        'tiers_ms': {
+            'fast': round(sum(report['fast_ms'] for report in reports), 2),
+            'layout': round(sum(report['layout_ms'] for report in reports), 2)
+        }
+    }
+
+
+def _worker_main(conn):
+    """Worker process loop: run (func, args, kwargs) messages one at a time until told to stop"""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        func, args, kwargs = message
+        try:
+            reply = (True, func(*args, **kwargs))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # Result or exception could not be pickled
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _WorkerSlot:
+    """One worker process and the thread that feeds it tasks from the pool queue"""
+
+    def __init__(self, pool, index):
+        self.pool = pool
+        self.process = None
+        self.conn = None
+        self.current = None  # Future of the task in the worker; guarded by pool._lock
+        self.killed = False
+        self.thread = threading.Thread(target=self._run, name=f'extraction-slot-{index}', daemon=True)
+        self.thread.start()
+
+    def _start_process(self):
+        parent, child = self.pool._context.Pipe()
+        self.process = self.pool._context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.conn = parent
+
+    def _discard_process(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(timeout=5)
+            self.conn.close()
+        self.process = self.conn = None
+
+    def _run(self):
+        while True:
+            task = self.pool._tasks.get()
+            if task is None:
+                self._discard_process()
+                return
+            future, func, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue  # Cancelled while queued
+
+            with self.pool._lock:
+                if self.killed or (self.process is not None and not self.process.is_alive()):
+                    self._discard_process()
+                    self.killed = False
+                if self.process is None:
+                    self._start_process()
+                self.current = future
+
+            try:
+                self.conn.send((func, args, kwargs))
+                ok, value = self.conn.recv()
+            except (EOFError, OSError) as e:
+                with self.pool._lock:
+                    self.current = None
+                    self.killed = True  # Replace the process before the next task
+                future.set_exception(ExtractionWorkerLost(f"Extraction worker stopped: {type(e).__name__}"))
+                continue
+            with self.pool._lock:
+                self.current = None
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def kill(self, future):
+        """Kill the worker if it is still running future's task (caller holds pool._lock)"""
+        if self.current is future and self.process is not None:
+            self.process.terminate()
+            self.killed = True
+            return True
+        return False
+
+
+class ExtractionPool:
+    """
+    Fixed set of spawned worker processes that run one task each at a time.
+
+    Unlike ProcessPoolExecutor, where one dead worker breaks the whole pool and
+    fails every task in it, each worker here is fed through its own pipe, so a
+    task can be stopped by killing just the process running it; the slot starts
+    a fresh process for its next task.
+    """
+
+    def __init__(self, workers=EXTRACTION_WORKERS):
+        # spawn, not fork: the web process has threads and an open MongoDB client
+        self._context = multiprocessing.get_context('spawn')
+        self._tasks = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._slots = [_WorkerSlot(self, index) for index in range(workers)]
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        self._tasks.put((future, func, args, kwargs))
+        return future
+
+    def stop(self, future):
+        """Stop a task: cancel it if still queued, else kill (and replace) the worker running it"""
+        if future.cancel() or future.done():
+            return
+        with self._lock:
+            for slot in self._slots:
+                if slot.kill(future):
+                    print("[WARNING] Extraction worker killed (its document failed or timed out)")
+                    return
+
+    def worker_pids(self):
+        with self._lock:
+            return [slot.process.pid for slot in self._slots
+                    if slot.process is not None and slot.process.is_alive()]
+
+    def shutdown(self):
+        for _ in self._slots:
+            self._tasks.put(None)
+        for slot in self._slots:
+            slot.thread.join(timeout=10)
+
+
+class _Submissions:
+    """Submits to the shared pool and remembers the futures, so a timeout stops exactly those tasks"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.futures = []
+
+    def submit(self, func, *args, **kwargs):
+        future = self.pool.submit(func, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def stop_all(self):
+        for future in self.futures:
+            self.pool.stop(future)
+
+
+def get_pool():
+    """Get (or lazily create) the shared extraction process pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractionPool(EXTRACTION_WORKERS)
+            print(f"[OK] Extraction pool started with {EXTRACTION_WORKERS} worker(s)")
+        return _pool
+
+
+class _Deadline:
+    """Wall-clock budget shared by every wait of one extraction"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.expires = time.monotonic() + limit
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+
+def _run_pdf_extraction(pool, file_content, deadline, mode, budget):
+    """Fan page ranges out over the pool and collect them in page order"""
+    per_task = max(1, EXTRACTION_PAGES_PER_TASK)
+    truncated_by = set()
+
+    # The first range also tells us how many pages there are; one-task
+    # documents (most resumes) are finished after this single round trip.
+    first = pool.submit(_extract_pdf_pages, file_content, 0, min(per_task, budget.max_pages),
+                        mode, budget)
+    total_pages, texts, reports, stopped = first.result(timeout=deadline.remaining())
+
+    last_page = min(total_pages, budget.max_pages)
+    if total_pages > budget.max_pages:
+        truncated_by.add('pages')
+    if stopped:
+        # Budget already used up - don't schedule the remaining ranges at all
+        truncated_by.add(stopped)
+        last_page = 0
+
+    futures = [
+        pool.submit(_extract_pdf_pages, file_content, start, min(start + per_task, last_page),
+                    mode, budget)
+        for start in range(per_task, last_page, per_task)
+    ]
+    if futures:
+        done, not_done = wait(futures, timeout=deadline.remaining(), return_when=FIRST_EXCEPTION)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            # Either a range failed (re-raised below) or we ran out of time
+            for future in done:
+                future.result()
+            raise ExtractionTimeout(f"PDF extraction exceeded {deadline.limit:g} seconds")
+        for future in futures:
+            _, range_texts, range_reports, stopped = future.result()
+            texts.extend(range_texts)
+            reports.extend(range_reports)
+            if stopped:
+                truncated_by.add(stopped)
+                if stopped == 'time':
+                    break  # Later ranges are past the deadline too; keep the text contiguous
+
+    return texts, reports, total_pages, truncated_by
+
+
+def _run_in_pool(runner, source, timeout, label):
+    """
+    Run one extraction against the shared pool with a hard deadline.
+
+    When a document times out or one of its tasks fails, its other tasks are
+    stopped (queued ones cancelled, running ones' workers killed and replaced);
+    other uploads' tasks keep running.
+    """
+    deadline = _Deadline(timeout or EXTRACTION_TIMEOUT)
+    submissions = _Submissions(get_pool())
+    try:
+        return runner(submissions, source, deadline)
+    except FutureTimeout:
+        raise ExtractionTimeout(f"{label} extraction exceeded {deadline.limit:g} seconds")
+    finally:
+        # After a result every task is done and this is a no-op; after any error the
+        # document's remaining tasks are of no use
+        submissions.stop_all()
+
+
+def extract_pdf_text(file_content, timeout=None, mode=None, report=None, budget=None):
+    """
+    Extract text from a PDF using the process pool.
+
+    Args:
+        file_content: Raw PDF bytes, or the path of a spooled upload
+        timeout: Seconds before the document is abandoned (default EXTRACTION_TIMEOUT)
+        mode: 'auto', 'fast' or 'layout' (default PDF_EXTRACTION_MODE)
+        report: Optional dict filled with the tier used per page, time spent in
+            each tier and whether the budget truncated the text
+        budget: ExtractionBudget (default limits from the environment)
+
+    Returns:
+        Page texts joined with newlines, stripped
+
+    Raises:
+        ExtractionTimeout: if the document did not finish in time
+    """
+    mode = mode or PDF_EXTRACTION_MODE
+    budget = (budget or ExtractionBudget()).start()
+    began = time.perf_counter()
+    texts, reports, total_pages, truncated_by = _run_in_pool(
+        partial(_run_pdf_extraction, mode=mode, budget=budget), file_content, timeout, 'PDF'
+    )
+
+    text, cut = budget.clip('\n'.join(text for text in texts if text).strip())
+    if cut:
+        truncated_by.add('chars')
+
+    if report is not None:
+        report.update(_summarize_pdf_reports(reports))
+        report.update(
+            total_pages=total_pages,
+            truncated=bool(truncated_by),
+            truncated_by=sorted(truncated_by),
+            total_ms=round((time.perf_counter() - began) * 1000, 2)
+        )
+    if truncated_by:
+        print(f"[WARNING] PDF extraction truncated by budget: {sorted(truncated_by)}")
+    return text
+
+
+# --- DOCX -------------------------------------------------------------------
+
+_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_BODY = f'{{{_W}}}body'
+W_P = f'{{{_W}}}p'
+W_T = f'{{{_W}}}t'
+W_TAB = f'{{{_W}}}tab'
+W_BR = f'{{{_W}}}br'
+W_CR = f'{{{_W}}}cr'
+W_TBL = f'{{{_W}}}tbl'
+W_TR = f'{{{_W}}}tr'
+W_TC = f'{{{_W}}}tc'
+W_TXBX = f'{{{_W}}}txbxContent'
+# Text boxes are stored twice (DrawingML + VML fallback); only read the first copy
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Uploads are untrusted: no entity expansion, no network access
+_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+RT_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+RT_HEADER = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/header'
+RT_FOOTER = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer'
+
+
+def _paragraph_text(paragraph, text_boxes):
+    """Text of one w:p; text boxes found inside it are queued, not inlined"""
+    parts = []
+    stack = [iter(paragraph)]
+    while stack:
+        for element in stack[-1]:
+            tag = element.tag
+            if tag == W_T:
+                parts.append(element.text or '')
+            elif tag == W_TAB:
+                parts.append('\t')
+            elif tag in (W_BR, W_CR):
+                parts.append('\n')
+            elif tag == W_TXBX:
+                text_boxes.append(element)
+            elif tag != MC_FALLBACK and len(element):
+                stack.append(iter(element))
+                break
+        else:
+            stack.pop()
+    return ''.join(parts).strip()
+
+
+def _block_texts(container, out):
+    """Append the text lines of a block container (body, cell, header, text box)"""
+    for element in container:
+        tag = element.tag
+        if tag == W_P:
+            text_boxes = []
+            text = _paragraph_text(element, text_boxes)
+            if text:
+                out.append(text)
+            for box in text_boxes:
+                _block_texts(box, out)
+        elif tag == W_TBL:
+            for row in element.iterchildren(W_TR):
+                cells = []
+                for cell in row.iterchildren(W_TC):
+                    cell_lines = []
+                    _block_texts(cell, cell_lines)
+                    if cell_lines:
+                        cells.append(' '.join(cell_lines))
+                if cells:
+                    out.append(' | '.join(cells))
+        elif tag != MC_FALLBACK and len(element):
+            # Content controls, custom XML, smart tags... wrap ordinary blocks
+            _block_texts(element, out)
+
+
+def _docx_part_names(package):
+    """Find the main document part and its header/footer parts in the zip package"""
+    rels = etree.fromstring(package.read('_rels/.rels'), _XML_PARSER)
+    main = next(
+        rel.get('Target').lstrip('/') for rel in rels
+        if rel.get('Type') == RT_OFFICE_DOCUMENT
+    )
+    base, name = posixpath.split(main)
+
+    headers, footers = [], []
+    rels_name = posixpath.join(base, '_rels', f'{name}.rels')
+    if rels_name in package.namelist():
+        for rel in etree.fromstring(package.read(rels_name), _XML_PARSER):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = posixpath.normpath(posixpath.join(base, rel.get('Target')))
+            if rel.get('Type') == RT_HEADER:
+                headers.append(target)
+            elif rel.get('Type') == RT_FOOTER:
+                footers.append(target)
+    return main, headers, footers
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+class _LineSink:
+    """Collects extracted lines and stops the walk once the budget is used up"""
+
+    def __init__(self, budget):
+        self.lines = []
+        self.chars = 0
+        self.budget = budget
+        self.stopped = None
+
+    def append(self, line):
+        self.lines.append(line)
+        self.chars += len(line) + 1
+        if self.chars >= self.budget.max_chars:
+            self.stopped = 'chars'
+        elif self.budget.out_of_time():
+            self.stopped = 'time'
+        if self.stopped:
+            raise _BudgetExhausted()
+
+
+def _part_lines(package, part_names):
+    """Text lines of header or footer parts, each once (they repeat per section)"""
+    lines = []
+    for part_name in part_names:
+        _block_texts(etree.fromstring(package.read(part_name), _XML_PARSER), lines)
+    return list(dict.fromkeys(lines))
+
+
+def _extract_docx(source, budget):
+    """
+    Extract text from a DOCX in one pass over its parts. Runs inside a worker process.
+
+    The zip package is read directly: only the document, header and footer
+    XML is parsed (python-docx would also load styles, numbering, theme...).
+    Headers come first (that is where resumes keep name and contact details),
+    then the body including tables and text boxes, then footers. Header and
+    footer lines the body repeats (a name in both) are dropped.
+
+    Returns:
+        tuple: (text, reason extraction stopped early or None)
+    """
+    sink = _LineSink(budget)
+    with zipfile.ZipFile(_open_source(source)) as package:
+        main, headers, footers = _docx_part_names(package)
+        body = etree.fromstring(package.read(main), _XML_PARSER).find(W_BODY)
+
+        # Header lines are only known to be new once the body is read: reserve their room first
+        header_lines = _part_lines(package, headers)
+        sink.chars = sum(len(line) + 1 for line in header_lines)
+        try:
+            if body is not None:
+                _block_texts(body, sink)
+            seen = set(sink.lines).union(header_lines)
+            for line in _part_lines(package, footers):
+                if line not in seen:
+                    sink.append(line)
+        except _BudgetExhausted:
+            pass
+
+    in_body = set(sink.lines)
+    lines = [line for line in header_lines if line not in in_body] + sink.lines
+    return '\n'.join(lines).strip(), sink.stopped
+
+
+def _run_docx_extraction(pool, source, deadline, budget):
+    return pool.submit(_extract_docx, source, budget).result(timeout=deadline.remaining())
+
+
+def extract_docx_text(file_content, timeout=None, report=None, budget=None):
+    """
+    Extract text from a DOCX (body, tables, text boxes, headers and footers).
+
+    Args:
+        file_content: Raw DOCX bytes, or the path of a spooled upload
+        timeout: Seconds before the document is abandoned (default EXTRACTION_TIMEOUT)
+        report: Optional dict filled with the extraction mode, time taken and truncation
+        budget: ExtractionBudget (character and time limits apply; DOCX has no pages)
+
+    Raises:
+        ExtractionTimeout: if the document did not finish in time
+    """
+    budget = (budget or ExtractionBudget()).start()
+    began = time.perf_counter()
+    text, stopped = _run_in_pool(
+        partial(_run_docx_extraction, budget=budget), file_content, timeout, 'DOCX'
+    )
+    text, cut = budget.clip(text)
+    truncated_by = sorted({stopped, 'chars' if cut else None} - {None})
+
+    if report is not None:
+        report.update(
+            mode='docx',
+            truncated=bool(truncated_by),
+            truncated_by=truncated_by,
+            total_ms=round((time.perf_counter() - began) * 1000, 2)
+        )
+    if truncated_by:
+        print(f"[WARNING] DOCX extraction truncated by budget: {truncated_by}")
+    return text
+
+
+# --- DOC (Word 97-2003) -------------------------------------------------------
+
+def _extract_doc(source, budget):
+    """
+    Extract text from a legacy .doc file. Runs inside a worker process.
+
+    Returns:
+        tuple: (text, reason extraction stopped early or None)
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = source
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+    text = read_doc_text(data, max_chars=budget.max_chars)
+    return text, 'chars' if len(text) >= budget.max_chars else None
+
+
+def _run_doc_extraction(pool, source, deadline, budget):
+    return pool.submit(_extract_doc, source, budget).result(timeout=deadline.remaining())
+
+
+def extract_doc_text(file_content, timeout=None, report=None, budget=None):
+    """
+    Extract text from a Word 97-2003 .doc file (OLE2 + piece table, no external tools).
+
+    Args:
+        file_content: Raw DOC bytes, or the path of a spooled upload
+        timeout: Seconds before the document is abandoned (default EXTRACTION_TIMEOUT)
+        report: Optional dict filled with the extraction mode, time taken and truncation
+        budget: ExtractionBudget (the character limit applies)
+
+    Raises:
+        ExtractionTimeout: if the document did not finish in time
+        DocFormatError: if the file is not a readable Word 97-2003 document
+    """
+    budget = (budget or ExtractionBudget()).start()
+    began = time.perf_counter()
+    text, stopped = _run_in_pool(
+        partial(_run_doc_extraction, budget=budget), file_content, timeout, 'DOC'
+    )
+    text, cut = budget.clip(text)
+    truncated_by = sorted({stopped, 'chars' if cut else None} - {None})
+
+    if report is not None:
+        report.update(
+            mode='doc',
+            truncated=bool(truncated_by),
+            truncated_by=truncated_by,
+            total_ms=round((time.perf_counter() - began) * 1000, 2)
+        )
+    return text
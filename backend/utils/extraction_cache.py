@@ -0,0 +1,159 @@
+"""
+Content-addressed cache for extracted resume text.
+
+Entries are keyed by the SHA-256 of the uploaded bytes plus the extractor
+version, so re-uploading the same file skips pdfplumber / python-docx
+entirely. Two tiers:
+    - in-memory LRU (bounded by total characters)
+    - on-disk files (bounded by total bytes, least recently used evicted first)
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from utils.extraction import EXTRACTOR_VERSION
+
+EXTRACTION_CACHE_DIR = os.getenv(
+    'EXTRACTION_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'extraction_cache')
+)
+EXTRACTION_CACHE_MEMORY_CHARS = int(os.getenv('EXTRACTION_CACHE_MEMORY_CHARS', 8 * 1024 * 1024))
+EXTRACTION_CACHE_DISK_BYTES = int(os.getenv('EXTRACTION_CACHE_DISK_BYTES', 256 * 1024 * 1024))
+
+
+def make_cache_key(file_content, file_type, digest=None):
+    """
+    Build the cache key for an upload.
+
+    Args:
+        file_content: Raw uploaded bytes
+        file_type: Extractor used ('pdf', 'docx', 'doc')
+        digest: Precomputed SHA-256 hex digest of file_content, if known
+
+    Returns:
+        str: '<sha256>-<file_type>-v<extractor version>'
+    """
+    digest = digest or hashlib.sha256(file_content).hexdigest()
+    return f"{digest}-{file_type}-v{EXTRACTOR_VERSION}"
+
+
+class ExtractionCache:
+    """Two-tier (memory LRU + disk) extracted text cache"""
+
+    def __init__(self, directory=EXTRACTION_CACHE_DIR,
+                 memory_chars=EXTRACTION_CACHE_MEMORY_CHARS,
+                 disk_bytes=EXTRACTION_CACHE_DISK_BYTES):
+        self.directory = directory
+        self.memory_chars = memory_chars
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = None  # Scanned lazily on first disk write
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def get(self, key):
+        """Return cached text for key, or None on a miss"""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                return text
+
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            os.utime(path)  # Mark as recently used for disk eviction
+        except OSError:
+            return None
+
+        with self._lock:
+            self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        """Store extracted text under key in both tiers"""
+        if not text:
+            return
+
+        with self._lock:
+            self._remember(key, text)
+
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Could not write extraction cache entry: {str(e)}")
+            return
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = self._scan_disk_size()
+            else:
+                self._disk_size += size
+            if self._disk_size > self.disk_bytes:
+                self._evict_disk()
+
+    def _remember(self, key, text):
+        """Insert into the memory tier and evict least recently used entries (lock held)"""
+        if len(text) > self.memory_chars:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = text
+        self._memory_size += len(text)
+        while self._memory_size > self.memory_chars:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def _disk_entries(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.txt'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+        return entries
+
+    def _scan_disk_size(self):
+        return sum(size for _, size, _ in self._disk_entries())
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits again (lock held)"""
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% so we don't rescan on every write near the limit
+        target = int(self.disk_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_size = total
+
+    def clear(self):
+        """Drop the memory tier (disk entries are left for other processes)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+
+
+# Shared instance used by the resume routes
+extraction_cache = ExtractionCache()
@@ -0,0 +1,147 @@
+"""
+Cache of generated resumes, keyed by (resume text, job description).
+
+Pressing "generate" again with the same resume and job description returns
+the PDF that was already generated instead of another 10-60 s upstream call
+and another Resume document. Two tiers:
+    - in-memory LRU of the PDF bytes (bounded by their total size)
+    - the resumes collection itself (resume_hash / job_description_hash fields)
+Entries are per user and only served while younger than GENERATION_CACHE_TTL.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from models.resume import Resume
+from utils.pdf_storage import resume_pdf_bytes, PdfStorageError
+
+GENERATION_CACHE_TTL = int(os.getenv('GENERATION_CACHE_TTL', 7 * 24 * 3600))  # Seconds; 0 disables
+GENERATION_CACHE_MEMORY_BYTES = int(os.getenv('GENERATION_CACHE_MEMORY_BYTES', 24 * 1024 * 1024))
+
+
+def _text_hash(text):
+    """SHA-256 of text with whitespace normalized (runs collapsed, ends stripped)"""
+    normalized = ' '.join((text or '').split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def make_generation_key(resume_text, job_description):
+    """
+    Build the cache key for a generation request.
+
+    Returns:
+        tuple: (resume_hash, job_description_hash)
+    """
+    return _text_hash(resume_text), _text_hash(job_description)
+
+
+class GenerationCache:
+    """Two-tier (memory LRU + resumes collection) generated resume cache"""
+
+    def __init__(self, ttl=GENERATION_CACHE_TTL, memory_bytes=GENERATION_CACHE_MEMORY_BYTES):
+        self.ttl = ttl
+        self.memory_bytes = memory_bytes
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _fresh(self, entry):
+        return entry['created_at'] >= datetime.utcnow() - timedelta(seconds=self.ttl)
+
+    def get(self, user_id, key):
+        """
+        Return the cached generation for this user and key, or None on a miss.
+
+        Returns:
+            dict: resume_id, pdf_bytes, file_size_kb, original_filename, created_at
+        """
+        if not self.enabled:
+            return None
+        memory_key = (user_id,) + tuple(key)
+
+        with self._lock:
+            entry = self._memory.get(memory_key)
+            if entry is not None:
+                if self._fresh(entry):
+                    self._memory.move_to_end(memory_key)
+                    self.hits += 1
+                    return entry
+                self._forget(memory_key)
+
+        resume_hash, job_description_hash = key
+        doc = Resume.find_by_generation_key(
+            user_id, resume_hash, job_description_hash,
+            newer_than=datetime.utcnow() - timedelta(seconds=self.ttl)
+        )
+        try:
+            pdf_bytes = resume_pdf_bytes(doc) if doc else None
+        except PdfStorageError as e:
+            print(f"[WARNING] Cached resume {doc['_id']} has no readable PDF: {str(e)}")
+            pdf_bytes = None
+        if not pdf_bytes:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        entry = {
+            'resume_id': str(doc['_id']),
+            'pdf_bytes': pdf_bytes,
+            'file_size_kb': doc.get('file_size_kb', 0),
+            'original_filename': doc.get('original_filename'),
+            'created_at': doc['created_at'],
+        }
+        with self._lock:
+            self._remember(memory_key, entry)
+            self.hits += 1
+        return entry
+
+    def put(self, user_id, key, entry):
+        """Remember a freshly generated resume (the database tier is written by Resume.save)"""
+        if not self.enabled or not entry.get('pdf_bytes'):
+            return
+        with self._lock:
+            self._remember((user_id,) + tuple(key), entry)
+
+    def _remember(self, memory_key, entry):
+        """Insert into the memory tier and evict least recently used entries (lock held)"""
+        size = len(entry['pdf_bytes'])
+        if size > self.memory_bytes:
+            return
+        self._forget(memory_key)
+        self._memory[memory_key] = entry
+        self._memory_size += size
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted['pdf_bytes'])
+
+    def _forget(self, memory_key):
+        old = self._memory.pop(memory_key, None)
+        if old is not None:
+            self._memory_size -= len(old['pdf_bytes'])
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ttl_seconds': self.ttl,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+# Shared instance used by resume_routes
+generation_cache = GenerationCache()
@@ -0,0 +1,166 @@
+"""
+Background jobs for slow upstream work (resume generation).
+
+Jobs run on a bounded thread pool so Flask request workers return at once
+(202 + job ID) instead of blocking on the generation API. Job state lives
+in this process, like the extracted-text storage in resume_routes:
+finished jobs are kept for JOB_RESULT_TTL seconds so clients can poll for
+the result, then pruned.
+
+Jobs submitted with a key are single-flight: while a job with that key is
+queued or running, submitting the same key again returns the existing job
+instead of starting a second one.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Job settings (override via environment)
+GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', 4))          # Concurrent upstream calls
+GENERATION_QUEUE_LIMIT = int(os.getenv('GENERATION_QUEUE_LIMIT', 50))  # Queued + running jobs
+JOB_RESULT_TTL = int(os.getenv('JOB_RESULT_TTL', 900))                # Seconds finished jobs are kept
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at GENERATION_QUEUE_LIMIT"""
+    pass
+
+
+class Job:
+    """One unit of background work and its outcome"""
+
+    def __init__(self, user_id, kind, key=None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.kind = kind
+        self.key = key
+        self.coalesced = 0  # Duplicate submissions answered by this job
+        self.status = QUEUED
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self):
+        """Convert job to a JSON-friendly dictionary"""
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if self.status == SUCCEEDED:
+            data['result'] = self.result
+        elif self.status == FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobRunner:
+    """Bounded thread pool plus an in-memory job table"""
+
+    def __init__(self, workers=GENERATION_WORKERS, queue_limit=GENERATION_QUEUE_LIMIT,
+                 result_ttl=JOB_RESULT_TTL, name='jobs'):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.result_ttl = result_ttl
+        self._jobs = {}
+        self._in_flight = {}  # key -> unfinished job
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def _prune(self):
+        """Drop finished jobs older than the TTL (caller holds the lock)"""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at.timestamp() < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _run(self, job, func, args, kwargs):
+        job.status = RUNNING
+        job.started_at = datetime.utcnow()
+        status = FAILED
+        try:
+            job.result = func(*args, **kwargs)
+            status = SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+            print(f"✗ Job {job.id} ({job.kind}) failed: {str(e)}")
+        finally:
+            # finished_at first: _prune reads it as soon as the status says finished
+            job.finished_at = datetime.utcnow()
+            job.status = status
+            if job.key is not None:
+                with self._lock:
+                    if self._in_flight.get(job.key) is job:
+                        del self._in_flight[job.key]
+            job.done.set()
+
+    def submit(self, user_id, kind, func, *args, key=None, **kwargs):
+        """
+        Queue func(*args, **kwargs) as a job.
+
+        Args:
+            key: Single-flight key; if a job with this key is still queued or running,
+                it is returned instead of queueing a new one
+
+        Returns:
+            tuple: (Job, created) - created is False when an in-flight job was reused
+
+        Raises:
+            JobQueueFull: if queue_limit jobs are already queued or running
+        """
+        with self._lock:
+            self._prune()
+            if key is not None and key in self._in_flight:
+                job = self._in_flight[key]
+                job.coalesced += 1
+                self.coalesced += 1
+                return job, False
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.queue_limit:
+                raise JobQueueFull(f"{pending} jobs already pending")
+            job = Job(user_id, kind, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._in_flight[key] = job
+        self.executor.submit(self._run, job, func, args, kwargs)
+        return job, True
+
+    def get(self, job_id):
+        """Return the job with this ID, or None if unknown or expired"""
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            coalesced = self.coalesced
+        return {'workers': self.workers, 'queue_limit': self.queue_limit,
+                'coalesced': coalesced, **counts}
+
+
+# Shared runner for resume generation
+generation_jobs = JobRunner(name='generation')
@@ -0,0 +1,131 @@
+"""
+LaTeX-safe text sanitizer for resume text sent to the generation API.
+
+All character-level rewriting (LaTeX special characters, control
+characters, Unicode transliteration) comes from one translation table,
+applied in a single regex pass that only stops at runs of characters that
+need it - plain ASCII text is skipped at C speed. The table is precomputed
+for ASCII and common symbols; any other code point is resolved the first
+time it is seen (NFKD decomposition with accents stripped, e.g. "José" ->
+"Jose") and cached in the table. Whitespace collapsing (keeping line
+breaks) happens in the same pass: each match takes the whitespace around
+the characters it rewrites, so the collapse never has to look past it.
+"""
+import re
+import unicodedata
+
+# LaTeX special characters and their replacements
+LATEX_REPLACEMENTS = {
+    '\\': '',
+    '{': '(',
+    '}': ')',
+    '$': 'USD',
+    '#': 'No.',
+    '%': ' percent',
+    '&': ' and ',
+    '_': ' ',
+    '^': '',
+    '~': '',
+}
+
+# Characters NFKD cannot reduce to ASCII, or reduces badly
+TRANSLITERATIONS = {
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'",
+    '“': '"', '”': '"', '„': '"', '‟': '"', '″': '"',
+    '«': '"', '»': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '―': '-',
+    '−': '-', '⁃': '-',
+    '•': '-', '·': '-', '●': '-', '▪': '-', '■': '-', '◦': '-',
+    '‣': '-', '➢': '-', '✓': '-', '✔': '-', '': '-',
+    '…': '...', '⁄': '/', '×': 'x', '÷': '/',
+    '→': '->', '←': '<-', '↔': '<->',
+    '©': '(c)', '®': '(R)', '™': '(TM)', '°': ' deg',
+    '€': 'EUR', '£': 'GBP', '¥': 'JPY', '₹': 'INR',
+    'ß': 'ss', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE',
+    'ø': 'o', 'Ø': 'O', 'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D',
+    'ł': 'l', 'Ł': 'L', 'þ': 'th', 'Þ': 'Th', 'ı': 'i',
+}
+
+
+def _ascii_replacement(ch):
+    """Replacement for an ASCII character (LaTeX specials and control characters)"""
+    if ch in LATEX_REPLACEMENTS:
+        return LATEX_REPLACEMENTS[ch]
+    if ch == '\n':
+        return '\n'
+    if ch == '\r':
+        return '\n'  # '\r\n' becomes a blank line, which the whitespace pass collapses
+    if ch < ' ' or ch == '\x7f':
+        return ' '   # Tabs, form feeds and other control characters
+    return ch
+
+
+def _transliterate(ch):
+    """ASCII spelling of a non-ASCII character, or a space when there is none"""
+    if ch in TRANSLITERATIONS:
+        return TRANSLITERATIONS[ch]
+    if ch.isspace():
+        return ' '
+    out = []
+    for part in unicodedata.normalize('NFKD', ch):
+        if part < '\x80':
+            out.append(_ascii_replacement(part))
+        elif part in TRANSLITERATIONS:
+            out.append(TRANSLITERATIONS[part])
+        # Combining accents and anything else without an ASCII form are dropped
+    return ''.join(out) or ' '
+
+
+class _TranslationTable(dict):
+    """str.translate() table that fills itself in for code points it has not seen"""
+
+    def __missing__(self, codepoint):
+        replacement = _transliterate(chr(codepoint))
+        self[codepoint] = replacement
+        return replacement
+
+
+_TABLE = _TranslationTable(
+    {code: _ascii_replacement(chr(code)) for code in range(128)}
+)
+_TABLE.update({ord(ch): value for ch, value in TRANSLITERATIONS.items()})
+
+# Characters the table rewrites: LaTeX specials, control characters other
+# than newline, and everything outside ASCII
+_SPECIAL = r'\\{}$#%&_^~\x00-\x09\x0b-\x1f\x7f-\U0010ffff'
+
+# What the single pass stops at: a run of characters to rewrite together with
+# the spaces and newlines around and between them, or a run of whitespace
+# that needs collapsing. A match only starts at such a character or at
+# whitespace followed by more whitespace or one, so lone spaces and newlines
+# between words cost one lookahead.
+_NEEDS_CLEANING = re.compile(rf'[{_SPECIAL}][ \n{_SPECIAL}]*|[ \n](?:[ \n]|(?=[{_SPECIAL}]))[ \n{_SPECIAL}]*')
+
+# Within a match: runs of spaces collapse to one space; any run of spaces and
+# newlines collapses to a single newline (so line structure survives)
+_SPACES = re.compile(r'  +')
+_NEWLINES = re.compile(r' ?\n[ \n]*')
+
+
+def _clean_run(match):
+    run = match.group().translate(_TABLE)
+    if '  ' in run:
+        run = _SPACES.sub(' ', run)
+    if '\n' in run:
+        run = _NEWLINES.sub('\n', run)
+    return run
+
+
+def clean_text_for_latex(text):
+    """
+    Clean extracted text to make it compatible with LaTeX compilation.
+
+    Args:
+        text: Raw extracted text from PDF
+
+    Returns:
+        Cleaned ASCII text safe for LaTeX processing, one line per input line
+    """
+    if not text:
+        return text
+    return _NEEDS_CLEANING.sub(_clean_run, text).strip()
@@ -0,0 +1,75 @@
+"""
+Opaque cursors for keyset pagination.
+
+A page of a newest-first listing ends at some (created_at, _id); the
+next page is everything strictly older than that pair, which an index on
+(user_id, created_at, _id) answers directly no matter how deep the page
+is (unlike skip/offset). Clients get the pair as an opaque URL-safe
+token and hand it back unchanged.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor this server did not issue"""
+    pass
+
+
+def encode_cursor(created_at, doc_id):
+    """
+    Encode the sort key of the last item on a page.
+
+    Args:
+        created_at: datetime of the last item
+        doc_id: ObjectId of the last item
+
+    Returns:
+        str: URL-safe cursor
+    """
+    payload = json.dumps({'t': created_at.isoformat(), 'i': str(doc_id)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor from encode_cursor.
+
+    Returns:
+        tuple: (created_at datetime, ObjectId)
+
+    Raises:
+        InvalidCursor: if the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(payload['t']), ObjectId(payload['i'])
+    except (binascii.Error, ValueError, KeyError, TypeError, InvalidId, UnicodeEncodeError):
+        raise InvalidCursor("Invalid pagination cursor")
+
+
+def keyset_query(query, cursor, field='created_at'):
+    """
+    Restrict a newest-first query to items after the cursor.
+
+    Args:
+        query: Base MongoDB filter
+        cursor: Cursor from the previous page, or None for the first page
+        field: Date field the listing is sorted on (with _id as tie-breaker)
+
+    Returns:
+        dict: the filter for the page
+    """
+    if not cursor:
+        return query
+    created_at, doc_id = decode_cursor(cursor)
+    return dict(query, **{'$or': [
+        {field: {'$lt': created_at}},
+        {field: created_at, '_id': {'$lt': doc_id}}
+    ]})
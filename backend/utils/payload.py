@@ -0,0 +1,205 @@
+"""
+Payload minimizer for the resume-generation API.
+
+Runs on the LaTeX-cleaned resume text and the job description before they
+are sent upstream:
+    - collapses whitespace and drops empty lines
+    - drops boilerplate lines ("Page 2 of 3", "references available upon
+      request", separator rules; in job descriptions, lines that are mostly
+      equal-opportunity or "apply now" boilerplate). Bare numbers are kept:
+      in a resume they are dates ("2019", "06/2021")
+    - drops repeated lines (page headers/footers repeated on every page,
+      copy-pasted bullets)
+    - enforces a size limit by whole sections: optional sections (hobbies,
+      references...) are dropped first, then the section that crosses the
+      limit is cut at a line or sentence boundary, never mid-sentence
+"""
+import os
+import re
+
+PAYLOAD_MAX_RESUME_CHARS = int(os.getenv('PAYLOAD_MAX_RESUME_CHARS', 12000))
+PAYLOAD_MAX_JD_CHARS = int(os.getenv('PAYLOAD_MAX_JD_CHARS', 6000))
+
+# Lines shorter than this may legitimately repeat (job titles, "Present", skills)
+_MIN_DEDUP_CHARS = 20
+
+_BOILERPLATE = re.compile(
+    r'^(?:'
+    r'page\s*\d+(?:\s*(?:of|/)\s*\d+)?'
+    r'|(?:curriculum\s+vitae|resume|cv)'
+    r'|references?\s+(?:are\s+)?(?:available\s+)?(?:up)?on\s+request\.?'
+    r'|[\W_]+'
+    r')$',
+    re.IGNORECASE
+)
+_PROTECTED_CLASSES = (
+    r'(?:[\s,]*(?:(?:and|or)\s+)?(?:race|colou?r|religion|creed|sex|gender(?:\s+identity)?'
+    r'|sexual\s+orientation|national\s+origin|ancestry|age|disability|(?:protected\s+)?veteran\s+status'
+    r'|genetic\s+information|marital\s+status|pregnancy|citizenship(?:\s+status)?'
+    r'|(?:any\s+other\s+)?(?:legally\s+)?protected\s+(?:status|characteristics?)))+'
+)
+_JD_BOILERPLATE = re.compile(
+    r'\b(?:'
+    r'(?:(?:is|are)\s+(?:proud\s+to\s+be\s+)?an?\s+)?equal\s+(?:employment\s+)?opportunity'
+    r'(?:\s*(?:/|and)\s*affirmative\s+action)?\s+employer'
+    r'|all\s+qualified\s+applicants\s+will\s+receive\s+consideration\s+for\s+employment'
+    r'|without\s+regard\s+to' + _PROTECTED_CLASSES +
+    r'|(?:need|require|request)s?\s+(?:an?\s+)?reasonable\s+accommodations?'
+    r'(?:\s+(?:during|in|for)\s+the\s+(?:application|hiring|interview|recruiting)\s+process)?'
+    r'|(?:participates?\s+in\s+)?e-?verify'
+    r'|(?:apply\s+now|click\s+(?:on\s+)?(?:the\s+)?apply(?:\s+button)?)(?:\s+(?:below|here|today))?'
+    r')\b',
+    re.IGNORECASE
+)
+# A job description line is boilerplate only if the phrases above make up this share of it;
+# requirement sentences that merely mention one ("apply now if you know Kafka...") stay
+_JD_BOILERPLATE_SHARE = 0.5
+
+_SECTION_NAMES = {
+    'summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me',
+    'experience', 'work experience', 'professional experience', 'employment history',
+    'education', 'skills', 'technical skills', 'core competencies', 'projects',
+    'certifications', 'certificates', 'achievements', 'awards', 'publications',
+    'languages', 'interests', 'hobbies', 'hobbies and interests', 'volunteer',
+    'volunteering', 'activities', 'extracurricular activities', 'references',
+    'personal details', 'declaration',
+}
+# Dropped first (in this order) when the resume is over the limit
+_OPTIONAL_SECTIONS = ('declaration', 'references', 'personal details', 'hobbies', 'interests',
+                      'hobbies and interests', 'activities', 'extracurricular activities',
+                      'volunteer', 'volunteering', 'publications', 'languages')
+
+_SENTENCE_END = re.compile(r'[.!?](?=\s)')
+
+
+def _normalize(line):
+    return ' '.join(line.split())
+
+
+def _dedup_key(line):
+    return re.sub(r'[\W_]+', '', line.lower())
+
+
+def _clean_lines(text, is_boilerplate):
+    """Whitespace-normalized lines with boilerplate and repeated lines removed"""
+    lines = []
+    seen = set()
+    previous = None
+    for raw in (text or '').splitlines():
+        line = _normalize(raw)
+        if not line or is_boilerplate(line):
+            continue
+        key = _dedup_key(line)
+        if key == previous or (len(line) >= _MIN_DEDUP_CHARS and key in seen):
+            continue
+        seen.add(key)
+        previous = key
+        lines.append(line)
+    return lines
+
+
+def _is_jd_boilerplate(line):
+    covered = sum(len(match.group()) for match in _JD_BOILERPLATE.finditer(line))
+    return covered >= _JD_BOILERPLATE_SHARE * len(line)
+
+
+def _section_name(line):
+    """Canonical section name if line is a section heading, else None"""
+    name = line.strip(' :-').lower()
+    if name in _SECTION_NAMES:
+        return name
+    return None
+
+
+def _split_sections(lines):
+    """Group lines into (name, lines) sections; text before the first heading is the header"""
+    sections = [('header', [])]
+    for line in lines:
+        name = _section_name(line)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def _cut(lines, budget):
+    """Longest prefix of lines fitting budget, ending on a whole line, a whole sentence or a whole word"""
+    kept = []
+    used = 0
+    for line in lines:
+        cost = len(line) + 1
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+        # Keep the complete sentences of the line that crosses the limit
+        room = budget - used - 1
+        ends = [m.end() for m in _SENTENCE_END.finditer(line + ' ') if m.end() <= room]
+        if ends:
+            kept.append(line[:ends[-1]])
+        else:
+            # No sentence ends in time (a long requirement line): cut at the last word boundary
+            space = max(line.rfind(' ', 0, room + 1), line.rfind('\t', 0, room + 1))
+            if space > 0:
+                kept.append(line[:space].rstrip())
+        break
+    return kept
+
+
+def _size(sections):
+    return sum(len(line) + 1 for _, lines in sections for line in lines)
+
+
+def minimize_resume_text(text, max_chars=PAYLOAD_MAX_RESUME_CHARS):
+    """
+    Shrink cleaned resume text for the upstream request.
+
+    Args:
+        text: LaTeX-cleaned resume text (one item per line)
+        max_chars: Size limit; 0 disables it
+
+    Returns:
+        str: Minimized text
+    """
+    sections = _split_sections(_clean_lines(text, _BOILERPLATE.match))
+
+    if max_chars and _size(sections) > max_chars:
+        for optional in _OPTIONAL_SECTIONS:
+            if _size(sections) <= max_chars:
+                break
+            sections = [section for section in sections if section[0] != optional]
+
+    if max_chars and _size(sections) > max_chars:
+        kept = []
+        budget = max_chars
+        for name, lines in sections:
+            cost = sum(len(line) + 1 for line in lines)
+            if cost <= budget:
+                kept.append((name, lines))
+                budget -= cost
+                continue
+            partial = _cut(lines, budget)
+            if len(partial) > 1 or (partial and not _section_name(partial[0])):
+                kept.append((name, partial))
+            break
+        sections = kept
+
+    return '\n'.join(line for _, lines in sections for line in lines)
+
+
+def minimize_job_description(text, max_chars=PAYLOAD_MAX_JD_CHARS):
+    """
+    Shrink a job description for the upstream request.
+
+    Args:
+        text: Job description as entered by the user
+        max_chars: Size limit; 0 disables it
+
+    Returns:
+        str: Minimized text
+    """
+    lines = _clean_lines(text, _is_jd_boilerplate)
+    if max_chars:
+        lines = _cut(lines, max_chars)
+    return '\n'.join(lines)
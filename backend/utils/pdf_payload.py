@@ -0,0 +1,134 @@
+"""
+Low-copy handling of the base64 PDF returned by the generation API.
+
+The response body is streamed into one buffer and the base64 value is
+located in place (no full JSON parse), then decoded straight from the
+buffer with validate=True.
+"""
+import base64
+import binascii
+import json
+import os
+import re
+
+UPSTREAM_MAX_RESPONSE_BYTES = int(os.getenv('UPSTREAM_MAX_RESPONSE_BYTES', 32 * 1024 * 1024))
+
+PDF_FIELDS = ('pdf_base64', 'body')
+_READ_CHUNK = 64 * 1024
+
+
+class InvalidPdfPayload(Exception):
+    """Raised when the upstream response does not hold a usable base64 PDF"""
+    pass
+
+
+def _field_pattern(name):
+    return re.compile(rb'"' + re.escape(name.encode()) + rb'"\s*:\s*"')
+
+
+_FIELD_PATTERNS = [(name, _field_pattern(name)) for name in PDF_FIELDS]
+
+
+def read_body(response, max_bytes=UPSTREAM_MAX_RESPONSE_BYTES):
+    """
+    Read a streamed response body into a single buffer.
+
+    Args:
+        response: requests.Response opened with stream=True
+
+    Returns:
+        bytearray: the body
+
+    Raises:
+        InvalidPdfPayload: if the body is larger than max_bytes
+    """
+    expected = response.headers.get('Content-Length')
+    expected = int(expected) if expected and expected.isdigit() else None
+    if expected and expected > max_bytes:
+        raise InvalidPdfPayload(f"Response too large ({expected} bytes)")
+    if expected and not response.headers.get('Content-Encoding'):
+        # Known length: fill one preallocated buffer instead of growing it
+        body = bytearray(expected)
+        filled = 0
+        for chunk in response.iter_content(_READ_CHUNK):
+            if filled + len(chunk) > expected:
+                raise InvalidPdfPayload("Response longer than its Content-Length")
+            body[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        del body[filled:]
+        return body
+
+    body = bytearray()
+    for chunk in response.iter_content(_READ_CHUNK):
+        body += chunk
+        if len(body) > max_bytes:
+            raise InvalidPdfPayload(f"Response larger than {max_bytes} bytes")
+    return body
+
+
+def _locate_pdf_base64(body):
+    """
+    Find the base64 PDF value in a JSON response body.
+
+    The value is found in place; only when it contains JSON escapes (e.g. '\\/')
+    is the body fully parsed.
+
+    Returns:
+        bytes-like: the base64 text (a memoryview into body when found in place)
+
+    Raises:
+        InvalidPdfPayload: if no pdf_base64/body field holds a value
+    """
+    view = memoryview(body)
+    for name, pattern in _FIELD_PATTERNS:
+        match = pattern.search(body)
+        if not match:
+            continue
+        start = match.end()
+        end = body.find(b'"', start)
+        if end == -1:
+            break
+        if end == start:
+            continue  # Empty value: try the next field, as the old `or` chain did
+        if body.find(b'\\', start, end) != -1:
+            break  # Escaped value: let the JSON parser unescape it
+        return view[start:end]
+
+    # Fallback: full parse (escaped or unusually shaped responses)
+    try:
+        data = json.loads(bytes(body))
+    except ValueError as e:
+        raise InvalidPdfPayload(f"Failed to parse JSON response: {str(e)}")
+    value = next((data[name] for name in PDF_FIELDS if isinstance(data, dict) and data.get(name)), None)
+    if not isinstance(value, str):
+        raise InvalidPdfPayload("API response has no pdf_base64 or body field")
+    value = ''.join(value.split())  # Drop line breaks of MIME-style base64
+    try:
+        return value.encode('ascii')
+    except UnicodeEncodeError:
+        raise InvalidPdfPayload("Invalid base64 data received from API")
+
+
+def extract_pdf_bytes(body):
+    """
+    Pull the PDF out of a JSON response body, decoded in one pass.
+
+    Args:
+        body: Raw JSON response body (bytes-like)
+
+    Returns:
+        bytes: the PDF
+
+    Raises:
+        InvalidPdfPayload: if no pdf_base64/body field holds valid base64 PDF data
+    """
+    value = _locate_pdf_base64(body)
+    if len(value) % 4:
+        raise InvalidPdfPayload("Invalid base64 data received from API")
+    try:
+        pdf_bytes = base64.b64decode(value, validate=True)
+    except binascii.Error:
+        raise InvalidPdfPayload("Invalid base64 data received from API")
+    if not pdf_bytes.startswith(b'%PDF'):
+        raise InvalidPdfPayload("API response is not a PDF")
+    return pdf_bytes
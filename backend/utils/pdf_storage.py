@@ -0,0 +1,204 @@
+"""
+Binary storage for generated PDFs.
+
+Resume documents used to carry the PDF as a base64 string (pdf_base64):
+a third larger than the PDF itself, loaded with every resume read and
+decoded again on every download. PDFs are now stored once as raw bytes
+outside the resumes collection and referenced from the resume by
+`pdf_ref` ({'store': ..., 'id': ..., 'size': ..., 'sha256': ...}):
+    - up to PDF_INLINE_MAX_BYTES: one document in `pdf_blobs` holding BSON Binary
+    - larger: a GridFS file in the `pdfs` bucket (BSON documents max out at 16MB)
+Downloads stream the stored bytes as they are; only resumes saved before
+the migration (migrate_pdf_storage.py) still need a base64 decode.
+
+Stored PDFs never change, so pdf_etag() gives a strong ETag without
+reading the PDF: the content hash recorded at store time (or, for PDFs
+stored before hashes were recorded, the immutable blob ID).
+"""
+import base64
+import binascii
+import hashlib
+import io
+import os
+
+import gridfs
+from bson.binary import Binary
+from bson.objectid import ObjectId
+
+from database import Database
+
+PDF_INLINE_MAX_BYTES = int(os.getenv('PDF_INLINE_MAX_BYTES', 4 * 1024 * 1024))  # Larger PDFs go to GridFS
+
+BLOB_COLLECTION = 'pdf_blobs'
+GRIDFS_BUCKET = 'pdfs'
+BINARY = 'binary'
+GRIDFS = 'gridfs'
+
+
+class PdfStorageError(Exception):
+    """Raised when a PDF cannot be stored or read back"""
+    pass
+
+
+def _get_db(db):
+    db = db if db is not None else Database.get_db()
+    if db is None:
+        raise PdfStorageError("Database not available")
+    return db
+
+
+def store_pdf(pdf_bytes, db=None, filename=None):
+    """
+    Store raw PDF bytes and return the reference to keep on the resume document.
+
+    Args:
+        pdf_bytes: The PDF
+        db: Database to use (defaults to Database.get_db())
+        filename: Stored with GridFS files, for inspection only
+
+    Returns:
+        dict: {'store': 'binary'|'gridfs', 'id': ObjectId, 'size': bytes, 'sha256': hex digest}
+    """
+    db = _get_db(db)
+    size = len(pdf_bytes)
+    sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+    if size <= PDF_INLINE_MAX_BYTES:
+        blob_id = db[BLOB_COLLECTION].insert_one({
+            'data': Binary(bytes(pdf_bytes)),
+            'size': size,
+            'content_type': 'application/pdf'
+        }).inserted_id
+        return {'store': BINARY, 'id': blob_id, 'size': size, 'sha256': sha256}
+
+    bucket = gridfs.GridFSBucket(db, bucket_name=GRIDFS_BUCKET)
+    file_id = bucket.upload_from_stream(filename or 'resume.pdf', bytes(pdf_bytes),
+                                        metadata={'content_type': 'application/pdf'})
+    return {'store': GRIDFS, 'id': file_id, 'size': size, 'sha256': sha256}
+
+
+def store_pdf_base64(pdf_base64, db=None, filename=None):
+    """
+    Decode a base64 PDF once and store the raw bytes.
+
+    Returns:
+        dict: the reference, as returned by store_pdf
+
+    Raises:
+        PdfStorageError: if pdf_base64 is not valid base64
+    """
+    try:
+        pdf_bytes = base64.b64decode(pdf_base64, validate=True)
+    except (binascii.Error, ValueError):
+        raise PdfStorageError("Stored PDF is not valid base64")
+    return store_pdf(pdf_bytes, db=db, filename=filename)
+
+
+def open_pdf(pdf_ref, db=None):
+    """
+    Open a stored PDF as a seekable binary file, for streaming and byte ranges.
+
+    Args:
+        pdf_ref: Reference returned by store_pdf
+
+    Returns:
+        tuple: (size in bytes, file object) - the caller closes the file
+
+    Raises:
+        PdfStorageError: if the PDF is missing
+    """
+    db = _get_db(db)
+    blob_id = ObjectId(pdf_ref['id'])
+
+    if pdf_ref.get('store') == GRIDFS:
+        bucket = gridfs.GridFSBucket(db, bucket_name=GRIDFS_BUCKET)
+        try:
+            grid_out = bucket.open_download_stream(blob_id)
+        except gridfs.errors.NoFile:
+            raise PdfStorageError(f"PDF {blob_id} not found")
+        return grid_out.length, grid_out  # Reads chunk documents on demand
+
+    blob = db[BLOB_COLLECTION].find_one({'_id': blob_id}, {'data': 1})
+    if not blob:
+        raise PdfStorageError(f"PDF {blob_id} not found")
+    data = blob['data']
+    return len(data), io.BytesIO(data)  # Shares the bytes until written to (never)
+
+
+def read_pdf(pdf_ref, db=None):
+    """Read a stored PDF into memory (bytes)"""
+    size, pdf_file = open_pdf(pdf_ref, db=db)
+    with pdf_file:
+        return pdf_file.read()
+
+
+def pdf_etag(resume_doc):
+    """
+    Strong ETag for a resume's PDF, without reading the PDF.
+
+    Returns:
+        str: unquoted ETag, or None for resumes still holding inline base64
+    """
+    pdf_ref = resume_doc.get('pdf_ref')
+    if not pdf_ref:
+        return None
+    if pdf_ref.get('sha256'):
+        return pdf_ref['sha256']
+    return f"{pdf_ref.get('store', BINARY)}-{pdf_ref['id']}"
+
+
+def delete_pdf(pdf_ref, db=None):
+    """Delete a stored PDF; missing PDFs are ignored"""
+    db = _get_db(db)
+    blob_id = ObjectId(pdf_ref['id'])
+    if pdf_ref.get('store') == GRIDFS:
+        try:
+            gridfs.GridFSBucket(db, bucket_name=GRIDFS_BUCKET).delete(blob_id)
+        except gridfs.errors.NoFile:
+            pass
+    else:
+        db[BLOB_COLLECTION].delete_one({'_id': blob_id})
+
+
+def open_resume_pdf(resume_doc, db=None):
+    """
+    Open the PDF of a resume document, whichever way it was saved.
+
+    Returns:
+        tuple: (size in bytes, seekable file object, strong ETag), or None if the resume has no PDF
+
+    Raises:
+        PdfStorageError: if the PDF is missing or (legacy documents) not valid base64
+    """
+    if resume_doc.get('pdf_ref'):
+        size, pdf_file = open_pdf(resume_doc['pdf_ref'], db=db)
+        return size, pdf_file, pdf_etag(resume_doc)
+
+    # Saved before binary storage: decode the inline base64
+    pdf_base64 = resume_doc.get('pdf_base64')
+    if not pdf_base64:
+        return None
+    try:
+        pdf_bytes = base64.b64decode(pdf_base64)
+    except (binascii.Error, ValueError):
+        raise PdfStorageError("Failed to decode PDF data")
+    return len(pdf_bytes), io.BytesIO(pdf_bytes), hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def resume_pdf_bytes(resume_doc, db=None):
+    """
+    Read a resume's PDF into memory, whichever way it was saved.
+
+    Returns:
+        bytes: the PDF, or None if the resume has no PDF
+
+    Raises:
+        PdfStorageError: if the PDF is missing or (legacy documents) not valid base64
+    """
+    if resume_doc.get('pdf_ref'):
+        return read_pdf(resume_doc['pdf_ref'], db=db)
+    if not resume_doc.get('pdf_base64'):
+        return None
+    try:
+        return base64.b64decode(resume_doc['pdf_base64'])
+    except (binascii.Error, ValueError):
+        raise PdfStorageError("Failed to decode PDF data")
@@ -0,0 +1,129 @@
+"""
+Fast-tier PDF text extraction.
+
+pdfplumber turns every glyph into a dict and then clusters them into lines
+and words - accurate, but most resumes are single-column documents whose
+content stream is already in reading order. The fast tier runs pdfminer's
+interpreter with a device that writes characters straight into a string
+(no layout objects), using only baseline changes and horizontal gaps to
+place newlines and spaces.
+
+looks_broken() decides whether a fast-tier page should be re-extracted
+with the full layout tier.
+"""
+import os
+
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+# Fallback thresholds (tunable from the numbers reported by /api/resume/process)
+PDF_FAST_MAX_CID_RATIO = float(os.getenv('PDF_FAST_MAX_CID_RATIO', 0.01))
+PDF_FAST_MIN_WORD_DENSITY = float(os.getenv('PDF_FAST_MIN_WORD_DENSITY', 0.08))
+PDF_FAST_MAX_GAP_LINE_RATIO = float(os.getenv('PDF_FAST_MAX_GAP_LINE_RATIO', 0.3))
+
+# Gaps are measured in multiples of the font size
+_SPACE_GAP = 0.15
+_COLUMN_GAP = 3.0
+
+
+class StreamTextDevice(PDFTextDevice):
+    """pdfminer device that emits text in content-stream order"""
+
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        self.text = ''
+        self.stats = {}
+
+    def begin_page(self, page, ctm):
+        super().begin_page(page, ctm)
+        self._parts = []
+        self._last = None  # (x where the previous glyph ended, baseline y, font size)
+        self._line_has_gap = False
+        self.stats = {'chars': 0, 'cid_chars': 0, 'lines': 0, 'gap_lines': 0}
+
+    def end_page(self, page):
+        self._end_line()
+        lines = (line.rstrip() for line in ''.join(self._parts).split('\n'))
+        self.text = '\n'.join(line for line in lines if line.strip())
+        self._parts = []
+
+    def _end_line(self):
+        if self._last is not None:
+            self.stats['lines'] += 1
+            if self._line_has_gap:
+                self.stats['gap_lines'] += 1
+        self._line_has_gap = False
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = f"(cid:{cid})"
+            self.stats['cid_chars'] += 1
+        self.stats['chars'] += 1
+
+        a, b, c, d, x, y = matrix
+        size = abs(fontsize * (d or b)) or 1.0
+        adv = font.char_width(cid) * fontsize * scaling
+
+        if self._last is not None:
+            last_x, last_y, last_size = self._last
+            if abs(y - last_y) > 0.5 * max(size, last_size):
+                self._end_line()
+                self._parts.append('\n')
+            else:
+                gap = x - last_x
+                if gap > _COLUMN_GAP * size:
+                    self._line_has_gap = True
+                if gap > _SPACE_GAP * size and self._parts and not self._parts[-1].isspace() \
+                        and not text.isspace():
+                    self._parts.append(' ')
+
+        self._parts.append(text)
+        self._last = (x + adv * (a or 1.0), y, size)
+        return adv
+
+
+class FastPdfReader:
+    """Opens a PDF once with pdfminer and extracts single pages on demand"""
+
+    def __init__(self, fp):
+        self._rsrcmgr = PDFResourceManager(caching=True)
+        self._device = StreamTextDevice(self._rsrcmgr)
+        self._interpreter = PDFPageInterpreter(self._rsrcmgr, self._device)
+        self.pages = list(PDFPage.create_pages(PDFDocument(PDFParser(fp))))
+
+    def extract_page(self, index):
+        """Return (text, stats) for the page at index"""
+        self._interpreter.process_page(self.pages[index])
+        return self._device.text, dict(self._device.stats)
+
+
+def looks_broken(text, stats):
+    """
+    Check a fast-tier page for signs that the layout tier would do better.
+
+    Returns:
+        str or None: the reason ('cid_glyphs', 'low_word_density',
+        'merged_columns') or None when the fast text looks fine
+    """
+    chars = stats.get('chars', 0)
+    if not chars:
+        return None
+
+    if stats.get('cid_chars', 0) / chars > PDF_FAST_MAX_CID_RATIO:
+        return 'cid_glyphs'
+
+    non_space = sum(1 for ch in text if not ch.isspace())
+    if non_space >= 200 and len(text.split()) / non_space < PDF_FAST_MIN_WORD_DENSITY:
+        return 'low_word_density'
+
+    lines = stats.get('lines', 0)
+    if lines >= 5 and stats.get('gap_lines', 0) / lines > PDF_FAST_MAX_GAP_LINE_RATIO:
+        return 'merged_columns'
+
+    return None
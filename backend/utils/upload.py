@@ -0,0 +1,194 @@
+"""
+Streaming, single-read handling of uploaded resume files.
+
+The request body is read exactly once, by Werkzeug's form parser. With
+UploadRequest as the app's request class, the parser writes each uploaded
+file into an UploadSpool, which counts the bytes (rejecting the file as
+soon as it crosses the limit), hashes them for the extraction cache, and
+moves anything larger than UPLOAD_SPOOL_BYTES to a named temp file.
+Extractors then get either the in-memory bytes or the spooled file path -
+never another copy. upload_body_limit() is the app's MAX_CONTENT_LENGTH,
+which Werkzeug enforces on the raw body as it reads it (chunked bodies
+without a Content-Length included).
+"""
+import hashlib
+import io
+import os
+import tempfile
+
+from flask import Request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+UPLOAD_MAX_BYTES = int(os.getenv('UPLOAD_MAX_BYTES', 10 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = int(os.getenv('UPLOAD_CHUNK_BYTES', 64 * 1024))
+UPLOAD_SPOOL_BYTES = int(os.getenv('UPLOAD_SPOOL_BYTES', 1024 * 1024))
+
+# Allowance for multipart boundaries and the job description form field
+UPLOAD_FORM_OVERHEAD = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload is larger than the allowed size"""
+    pass
+
+
+def upload_body_limit():
+    """Largest request body accepted (the app's MAX_CONTENT_LENGTH)"""
+    return UPLOAD_MAX_BYTES + UPLOAD_FORM_OVERHEAD
+
+
+class UploadSpool:
+    """
+    Destination Werkzeug writes an uploaded file to while parsing the request body.
+
+    Hashes and counts the bytes as they arrive; small files stay in memory, larger ones
+    move to a named temp file that extraction workers can open by path. Closed (and the
+    temp file removed) by Flask at the end of the request.
+    """
+
+    def __init__(self, max_bytes=UPLOAD_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.path = None
+        self._file = io.BytesIO()
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise RequestEntityTooLarge(f"Upload exceeds {self.max_bytes} bytes")
+        self.digest.update(data)
+        if self.path is None and self.size > UPLOAD_SPOOL_BYTES:
+            # Switch to disk; extraction workers will open it by path
+            spool = tempfile.NamedTemporaryFile(prefix='upload_', delete=False)
+            spool.write(self._file.getvalue())
+            self._file.close()
+            self._file, self.path = spool, spool.name
+        return self._file.write(data)
+
+    def close(self):
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __getattr__(self, name):
+        # read, seek, flush... go to the current file
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Request class that parses uploaded files straight into UploadSpools"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Also closed here, not only via request.files: a body rejected half way never gets there
+        self._upload_spools = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool = UploadSpool()
+        self._upload_spools.append(spool)
+        return spool
+
+    def close(self):
+        super().close()
+        for spool in self._upload_spools:
+            spool.close()
+        self._upload_spools = []
+
+
+class Upload:
+    """A fully read upload: size, SHA-256 and its content (bytes or spooled file)"""
+
+    def __init__(self, size, sha256, content=None, path=None):
+        self.size = size
+        self.sha256 = sha256
+        self.content = content
+        self.path = path
+
+    @property
+    def source(self):
+        """What extractors receive: the bytes, or the path of the spooled file"""
+        return self.path if self.path is not None else self.content
+
+    def close(self):
+        """Remove the spooled file, if any"""
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+        self.content = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ingest_upload(file_storage, max_bytes=UPLOAD_MAX_BYTES):
+    """
+    Take over an uploaded file without reading it again.
+
+    Files parsed by UploadRequest were already hashed, counted and spooled while the
+    body was read. Anything else (a FileStorage built by hand) is read once here,
+    hashing and size-checking as we go.
+
+    Args:
+        file_storage: werkzeug FileStorage from request.files
+        max_bytes: Maximum accepted file size
+
+    Returns:
+        Upload: the ingested file (call close() when done)
+
+    Raises:
+        UploadTooLarge: as soon as more than max_bytes have been read
+    """
+    stream = file_storage.stream
+    if isinstance(stream, UploadSpool):
+        if stream.size > max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+        if stream.path is not None:
+            stream.flush()  # Workers read the file by path
+            return Upload(stream.size, stream.digest.hexdigest(), path=stream.path)
+        return Upload(stream.size, stream.digest.hexdigest(), content=stream.getvalue())
+
+    digest = hashlib.sha256()
+    chunks = []
+    spool = None
+    size = 0
+
+    try:
+        while True:
+            chunk = stream.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+            digest.update(chunk)
+
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                chunks.append(chunk)
+                if size > UPLOAD_SPOOL_BYTES:
+                    # Switch to disk; extraction workers will open it by path
+                    spool = tempfile.NamedTemporaryFile(prefix='upload_', delete=False)
+                    spool.writelines(chunks)
+                    chunks = None
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.remove(spool.name)
+        raise
+
+    if spool is not None:
+        spool.close()
+        return Upload(size, digest.hexdigest(), path=spool.name)
+    return Upload(size, digest.hexdigest(), content=b''.join(chunks))
@@ -0,0 +1,275 @@
+"""
+Shared HTTP client for the resume-generation API.
+
+One requests.Session is shared by every request thread, so TCP and TLS
+connections to the upstream are kept alive and reused instead of being
+set up for each generation. Connect and read timeouts are separate, and
+failures that are safe to repeat are retried with jittered exponential
+backoff. pool_stats() reports how busy the pool is, which is what you need
+to size UPSTREAM_POOL_MAXSIZE for the number of server workers.
+
+JSON request bodies can optionally be sent gzip-compressed
+(UPSTREAM_GZIP_REQUESTS); bytes sent and upstream latency are tracked per
+request-size bucket so the effect of compression can be measured.
+"""
+import gzip
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+
+from utils.circuit_breaker import CircuitBreaker, Bulkhead
+
+# Pool settings (override via environment)
+UPSTREAM_POOL_CONNECTIONS = int(os.getenv('UPSTREAM_POOL_CONNECTIONS', 4))   # Hosts kept pooled
+UPSTREAM_POOL_MAXSIZE = int(os.getenv('UPSTREAM_POOL_MAXSIZE', 10))          # Keep-alive connections per host
+UPSTREAM_POOL_BLOCK = os.getenv('UPSTREAM_POOL_BLOCK', 'false').lower() == 'true'
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv('UPSTREAM_CONNECT_TIMEOUT', 5))   # Seconds
+UPSTREAM_READ_TIMEOUT = float(os.getenv('UPSTREAM_READ_TIMEOUT', 60))        # Seconds
+
+# Retry settings
+UPSTREAM_RETRIES = int(os.getenv('UPSTREAM_RETRIES', 2))                      # Extra attempts
+UPSTREAM_BACKOFF = float(os.getenv('UPSTREAM_BACKOFF', 0.5))                  # Base delay, seconds
+UPSTREAM_BACKOFF_MAX = float(os.getenv('UPSTREAM_BACKOFF_MAX', 8))            # Cap on one delay
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Request body compression (only enable if the upstream accepts Content-Encoding: gzip)
+UPSTREAM_GZIP_REQUESTS = os.getenv('UPSTREAM_GZIP_REQUESTS', 'false').lower() == 'true'
+UPSTREAM_GZIP_MIN_BYTES = int(os.getenv('UPSTREAM_GZIP_MIN_BYTES', 1024))     # Smaller bodies go as-is
+UPSTREAM_GZIP_LEVEL = int(os.getenv('UPSTREAM_GZIP_LEVEL', 6))
+
+# Upper bounds (bytes sent) of the latency buckets in pool_stats()
+SIZE_BUCKETS = (4 * 1024, 16 * 1024, 64 * 1024)
+
+
+class UpstreamRejected(Exception):
+    """The upstream answered but refused the request (4xx): a problem with the input, not the service"""
+    pass
+
+
+class UpstreamClient:
+    """Pooled keep-alive client with retries; safe to share between threads"""
+
+    def __init__(self, pool_connections=UPSTREAM_POOL_CONNECTIONS, pool_maxsize=UPSTREAM_POOL_MAXSIZE,
+                 pool_block=UPSTREAM_POOL_BLOCK, connect_timeout=UPSTREAM_CONNECT_TIMEOUT,
+                 read_timeout=UPSTREAM_READ_TIMEOUT, retries=UPSTREAM_RETRIES,
+                 backoff=UPSTREAM_BACKOFF, backoff_max=UPSTREAM_BACKOFF_MAX,
+                 gzip_requests=UPSTREAM_GZIP_REQUESTS, gzip_min_bytes=UPSTREAM_GZIP_MIN_BYTES):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.gzip_requests = gzip_requests
+        self.gzip_min_bytes = gzip_min_bytes
+
+        # Retries are handled here (with jitter), not by urllib3
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+        self._bytes_raw = 0
+        self._bytes_sent = 0
+        self._latency_by_size = {}  # bucket label -> [requests, total seconds]
+
+    def _encode_json(self, payload, headers):
+        """
+        Serialize a JSON body once, gzip-compressing it when enabled and worthwhile.
+
+        Returns:
+            tuple: (body bytes, headers, uncompressed size)
+        """
+        body = json.dumps(payload).encode('utf-8')
+        headers = dict(headers or {})
+        headers['Content-Type'] = 'application/json'
+        raw_size = len(body)
+        if self.gzip_requests and raw_size >= self.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=UPSTREAM_GZIP_LEVEL)
+            headers['Content-Encoding'] = 'gzip'
+        return body, headers, raw_size
+
+    @staticmethod
+    def _size_bucket(size):
+        previous = 0
+        for limit in SIZE_BUCKETS:
+            if size < limit:
+                return f"{previous // 1024}-{limit // 1024}KB"
+            previous = limit
+        return f">={previous // 1024}KB"
+
+    def _record_sent(self, raw_size, sent_size, seconds):
+        bucket = self._size_bucket(sent_size)
+        with self._lock:
+            self._bytes_raw += raw_size
+            self._bytes_sent += sent_size
+            entry = self._latency_by_size.setdefault(bucket, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def _backoff_delay(self, attempt):
+        """Full jitter: uniform between 0 and the capped exponential delay"""
+        return random.uniform(0, min(self.backoff_max, self.backoff * (2 ** attempt)))
+
+    @staticmethod
+    def _never_sent(error):
+        """True when the connection failed before any of the request reached the server"""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = error.args[0] if error.args else None
+        reason = getattr(reason, 'reason', reason)  # MaxRetryError wraps the real cause
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+    def _should_retry(self, idempotent, response=None, error=None):
+        if error is not None:
+            if self._never_sent(error):
+                return True
+            return idempotent and isinstance(error, (requests.exceptions.ConnectionError,
+                                                     requests.exceptions.Timeout))
+        return idempotent and response.status_code in RETRY_STATUSES
+
+    def request(self, method, url, idempotent=None, timeout=None, **kwargs):
+        """
+        Send a request through the shared pool, retrying failures that are safe to repeat.
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            idempotent: Whether the request may be repeated after it reached the server
+                (defaults to True for GET/HEAD/PUT/DELETE/OPTIONS). Connection failures
+                before anything was sent are always retried.
+            timeout: (connect, read) seconds; defaults to the configured timeouts
+            **kwargs: Passed to requests.Session.request; a json= body is serialized
+                here (once for all attempts) and gzip-compressed when enabled
+
+        Returns:
+            requests.Response (the last one, if retryable statuses ran out of attempts),
+            with upstream_bytes_raw / upstream_bytes_sent / upstream_seconds set
+
+        Raises:
+            requests.exceptions.RequestException: once retries are exhausted
+        """
+        if idempotent is None:
+            idempotent = method.upper() in ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+        timeout = timeout or self.timeout
+
+        raw_size = None
+        if kwargs.get('json') is not None:
+            body, kwargs['headers'], raw_size = self._encode_json(kwargs.pop('json'), kwargs.get('headers'))
+            kwargs['data'] = body
+        elif isinstance(kwargs.get('data'), (bytes, bytearray)):
+            raw_size = len(kwargs['data'])
+
+        with self._lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            attempt = 0
+            while True:
+                with self._lock:
+                    self._requests += 1
+                began = time.perf_counter()
+                try:
+                    response = self.session.request(method, url, timeout=timeout, **kwargs)
+                except requests.exceptions.RequestException as e:
+                    if attempt >= self.retries or not self._should_retry(idempotent, error=e):
+                        with self._lock:
+                            self._failures += 1
+                        raise
+                    print(f"[WARNING] Upstream {method} failed ({type(e).__name__}), "
+                          f"retry {attempt + 1}/{self.retries}")
+                else:
+                    if attempt >= self.retries or not self._should_retry(idempotent, response=response):
+                        # Time to the response headers: the upstream's own latency
+                        seconds = time.perf_counter() - began
+                        sent_size = len(kwargs['data']) if raw_size is not None else 0
+                        self._record_sent(raw_size or 0, sent_size, seconds)
+                        response.upstream_bytes_raw = raw_size or 0
+                        response.upstream_bytes_sent = sent_size
+                        response.upstream_seconds = seconds
+                        return response
+                    print(f"[WARNING] Upstream {method} returned {response.status_code}, "
+                          f"retry {attempt + 1}/{self.retries}")
+                    response.close()
+
+                with self._lock:
+                    self._retries += 1
+                time.sleep(self._backoff_delay(attempt))
+                attempt += 1
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def post(self, url, idempotent=False, **kwargs):
+        return self.request('POST', url, idempotent=idempotent, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def pool_stats(self):
+        """
+        Report pool usage.
+
+        connections_opened counts sockets the pool has ever created; when it grows with
+        requests instead of levelling off, or peak_in_flight exceeds pool_maxsize,
+        the pool is too small for the number of workers.
+        """
+        hosts = []
+        opened = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            opened += pool.num_connections
+            hosts.append({
+                'host': f"{pool.scheme}://{pool.host}:{pool.port}",
+                'connections_opened': pool.num_connections,
+                'idle_connections': idle,
+                'requests': pool.num_requests,
+            })
+        with self._lock:
+            latency_by_size = {
+                bucket: {'requests': count, 'avg_ms': round(total * 1000 / count, 1)}
+                for bucket, (count, total) in self._latency_by_size.items()
+            }
+            return {
+                'pool_maxsize': self.pool_maxsize,
+                'in_flight': self._in_flight,
+                'peak_in_flight': self._peak_in_flight,
+                'requests': self._requests,
+                'retries': self._retries,
+                'failures': self._failures,
+                'connections_opened': opened,
+                'connection_reuse': round(1 - opened / self._requests, 3) if self._requests else None,
+                'hosts': hosts,
+                'gzip_requests': self.gzip_requests,
+                'bytes_raw': self._bytes_raw,
+                'bytes_sent': self._bytes_sent,
+                'compression_ratio': round(self._bytes_raw / self._bytes_sent, 2) if self._bytes_sent else None,
+                'latency_by_request_size': latency_by_size,
+            }
+
+    def close(self):
+        self.session.close()
+
+
+# Shared client for the generation API
+upstream_client = UpstreamClient()
+
+# Circuit breaker and per-process concurrency cap for the generation API
+upstream_breaker = CircuitBreaker('generation-api', ignore=(UpstreamRejected,))
+upstream_bulkhead = Bulkhead('generation-api')
@@ -0,0 +1,146 @@
+"""
+Write-behind buffer for counters.
+
+Counter increments are merged in memory per key and written by a
+background thread in one batch: every flush_interval seconds, as soon as
+max_keys distinct keys are pending, and once more at interpreter exit.
+The request that caused the increment never waits for the database, and
+a burst of N increments to the same key becomes one write.
+
+A failed flush puts its increments back so the next flush retries them.
+Increments still pending when the process is killed (not a normal exit)
+are lost; counters like download counts tolerate that.
+"""
+import atexit
+import os
+import threading
+from datetime import datetime
+
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL', 5))  # Seconds; 0 writes at once
+WRITE_BEHIND_MAX_KEYS = int(os.getenv('WRITE_BEHIND_MAX_KEYS', 500))             # Pending keys before an early flush
+
+
+class WriteBehindBuffer:
+    """Merges counter increments per key and flushes them in batches from a background thread"""
+
+    def __init__(self, flush_func, name='write-behind', flush_interval=WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_keys=WRITE_BEHIND_MAX_KEYS):
+        """
+        Args:
+            flush_func: Called with {key: {'count': n, 'last_at': datetime, 'meta': ...}}; returns
+                the keys it could not write (None when all were written) or raises if nothing was
+            name: Used in log lines and the thread name
+        """
+        self.flush_func = flush_func
+        self.name = name
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._pending = {}
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+        self._increments = 0
+        self._flushes = 0
+        self._writes = 0
+        self._failures = 0
+
+    def add(self, key, count=1, meta=None):
+        """Record an increment; returns at once (flushes inline only when write-behind is off)"""
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = {'count': count, 'last_at': now, 'meta': meta}
+            else:
+                entry['count'] += count
+                entry['last_at'] = now
+                if meta is not None:
+                    entry['meta'] = meta
+            self._increments += count
+            full = len(self._pending) >= self.max_keys
+
+        if self.flush_interval <= 0 or self._stopped:
+            self.flush()
+            return
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything pending now.
+
+        Returns:
+            int: number of keys written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                failed = set(self.flush_func(batch) or ())
+            except Exception as e:
+                print(f"[WARNING] {self.name} flush failed, {len(batch)} key(s) kept for retry: {str(e)}")
+                self._requeue(batch)
+                return 0
+            if failed:
+                print(f"[WARNING] {self.name} flush partly failed, {len(failed)} key(s) kept for retry")
+                self._requeue({key: batch[key] for key in failed})
+            with self._lock:
+                self._flushes += 1
+                self._writes += len(batch) - len(failed)
+            return len(batch) - len(failed)
+
+    def _requeue(self, batch):
+        """Put unwritten increments back, merged with any that arrived meanwhile, for the next flush"""
+        with self._lock:
+            for key, entry in batch.items():
+                current = self._pending.get(key)
+                if current is None:
+                    self._pending[key] = entry
+                else:
+                    current['count'] += entry['count']
+                    current['last_at'] = max(current['last_at'], entry['last_at'])
+                    if current['meta'] is None:
+                        current['meta'] = entry['meta']
+            self._failures += 1
+
+    def stop(self):
+        """Flush what is pending and stop the background thread (registered with atexit)"""
+        self._stopped = True
+        self._wake.set()
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending_keys': len(self._pending),
+                'pending_increments': sum(entry['count'] for entry in self._pending.values()),
+                'increments': self._increments,
+                'flushes': self._flushes,
+                'keys_written': self._writes,
+                'failed_flushes': self._failures,
+                'flush_interval': self.flush_interval,
+                'max_keys': self.max_keys,
+            }
@@ -1,5 +1,39 @@
-// Load resume history from backend
-async function loadResumeHistory() {
+// Resume history is paged by the backend; this is the cursor for the next page
+const RESUME_HISTORY_PAGE_SIZE = 5;
+let resumeHistoryCursor = null;
+
+function renderResumeRow(resume) {
+    return `
+                <tr>
+                    <td class="table-cell">${resume.date}</td>
+                    <td class="table-cell">
+                        ${resume.originalFile}
+                        ${resume.file_size_kb ? `<br><small style="color: #666;">${resume.file_size_kb} KB</small>` : ''}
+                    </td>
+                    <td class="table-cell"><span class="badge badge-success">${resume.status}</span></td>
+                    <td class="table-cell">
+                        <button class="btn btn-primary" onclick="downloadResumeFromBackend('${resume.id}')">
+                            <i class="fas fa-download"></i> Download
+                        </button>
+                    </td>
+                </tr>
+            `;
+}
+
+function renderLoadMoreRow() {
+    return `
+                <tr id="loadMoreResumesRow">
+                    <td colspan="4" style="text-align: center; padding: 1rem;">
+                        <button class="btn btn-secondary" onclick="loadResumeHistory(true)">
+                            <i class="fas fa-chevron-down"></i> Load more
+                        </button>
+                    </td>
+                </tr>
+            `;
+}
+
+// Load resume history from backend (append: fetch the next page below the rows already shown)
+async function loadResumeHistory(append = false) {
     try {
         const authToken = localStorage.getItem('authToken');
         if (!authToken) {
@@ -9,8 +43,12 @@ async function loadResumeHistory() {
 
         console.log('📥 Fetching resume history from backend...');
 
-        // Fetch resumes from backend
-        const response = await fetch('/api/resume/user-resumes?limit=5', {
+        // Fetch one page of resumes from backend
+        let url = `/api/resume/user-resumes?limit=${RESUME_HISTORY_PAGE_SIZE}`;
+        if (append && resumeHistoryCursor) {
+            url += `&cursor=${encodeURIComponent(resumeHistoryCursor)}`;
+        }
+        const response = await fetch(url, {
             method: 'GET',
             headers: {
                 'Authorization': `Bearer ${authToken}`
@@ -40,24 +78,26 @@ async function loadResumeHistory() {
 
         if (result.success && result.data && result.data.resumes && result.data.resumes.length > 0) {
             const resumes = result.data.resumes;
-
-            tableBody.innerHTML = resumes.map(resume => `
-                <tr>
-                    <td class="table-cell">${resume.date}</td>
-                    <td class="table-cell">
-                        ${resume.originalFile}
-                        ${resume.file_size_kb ? `<br><small style="color: #666;">${resume.file_size_kb} KB</small>` : ''}
-                    </td>
-                    <td class="table-cell"><span class="badge badge-success">${resume.status}</span></td>
-                    <td class="table-cell">
-                        <button class="btn btn-primary" onclick="downloadResumeFromBackend('${resume.id}')">
-                            <i class="fas fa-download"></i> Download
-                        </button>
-                    </td>
-                </tr>
-            `).join('');
+            resumeHistoryCursor = result.data.next_cursor || null;
+
+            const rows = resumes.map(renderResumeRow).join('') + (resumeHistoryCursor ? renderLoadMoreRow() : '');
+            if (append) {
+                const loadMoreRow = document.getElementById('loadMoreResumesRow');
+                if (loadMoreRow) {
+                    loadMoreRow.remove();
+                }
+                tableBody.insertAdjacentHTML('beforeend', rows);
+            } else {
+                tableBody.innerHTML = rows;
+            }
 
             console.log(`✅ Loaded ${resumes.length} resumes`);
+        } else if (append) {
+            resumeHistoryCursor = null;
+            const loadMoreRow = document.getElementById('loadMoreResumesRow');
+            if (loadMoreRow) {
+                loadMoreRow.remove();
+            }
         } else {
             console.log('📥 No resumes found or empty response');
             tableBody.innerHTML = `
@@ -100,9 +140,10 @@ async function downloadResumeFromBackend(resumeId) {
         // Show loading indicator
         showAlert('Preparing download...', 'info');
 
-        // Fetch resume from backend
+        // Fetch resume from backend (revalidated: an unchanged PDF comes from the browser cache via 304)
         const response = await fetch(`/api/resume/download/${resumeId}`, {
             method: 'GET',
+            cache: 'no-cache',
             headers: {
                 'Authorization': `Bearer ${authToken}`
             }
@@ -247,6 +247,79 @@ function downloadPdfFromBase64(base64Data, filename) {
     }
 }
 
+// Download a PDF from the backend as-is (no base64 round trip); an unchanged PDF
+// is revalidated with a 304 and served from the browser cache
+async function downloadPdfFromUrl(pdfUrl, filename, authToken) {
+    const response = await fetch(pdfUrl, {
+        cache: 'no-cache',
+        headers: {
+            'Authorization': `Bearer ${authToken}`
+        }
+    });
+    if (!response.ok) {
+        throw new Error(`Download failed: ${response.status}`);
+    }
+    const blob = await response.blob();
+
+    // Create download link
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = filename;
+    document.body.appendChild(a);
+    a.click();
+    window.URL.revokeObjectURL(url);
+    document.body.removeChild(a);
+
+    console.log('✅ PDF downloaded successfully');
+}
+
+// Download a generated resume: from its URL, or from inline base64 (older responses)
+async function downloadGeneratedPdf(resumeData, filename) {
+    if (resumeData.pdf_url) {
+        try {
+            await downloadPdfFromUrl(resumeData.pdf_url, filename, localStorage.getItem('authToken'));
+        } catch (error) {
+            console.error('❌ Download error:', error);
+            showAlert('Failed to download PDF. Please try again.', 'error');
+        }
+    } else {
+        downloadPdfFromBase64(resumeData.pdf_base64, filename);
+    }
+}
+
+// Poll a resume generation job until it finishes; resolves with the job result
+async function waitForGenerationJob(statusUrl, authToken) {
+    const pollIntervalMs = 2000;
+    const maxWaitMs = 5 * 60 * 1000;
+    const startedAt = Date.now();
+
+    while (Date.now() - startedAt < maxWaitMs) {
+        await new Promise(resolve => setTimeout(resolve, pollIntervalMs));
+
+        const statusResponse = await fetch(statusUrl, {
+            headers: {
+                'Authorization': `Bearer ${authToken}`
+            }
+        });
+        const statusResult = await statusResponse.json();
+
+        if (!statusResponse.ok) {
+            throw new Error(statusResult.error || `Status check failed: ${statusResponse.status}`);
+        }
+
+        const job = statusResult.data;
+        console.log('⏳ Generation job status:', job.status);
+        if (job.status === 'succeeded') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Resume generation failed');
+        }
+    }
+    throw new Error('Resume generation is taking longer than expected. Check your resume history shortly.');
+}
+
 // Form submission
 const uploadForm = document.getElementById('uploadForm');
 uploadForm.addEventListener('submit', async (e) => {
@@ -330,7 +403,8 @@ uploadForm.addEventListener('submit', async (e) => {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-                job_description: jobDescText
+                job_description: jobDescText,
+                pdf_delivery: 'url'  // Metadata plus a download URL instead of the PDF as base64
             })
         });
 
@@ -352,26 +426,34 @@ uploadForm.addEventListener('submit', async (e) => {
             throw new Error(generateResult.error || `Resume generation failed: ${generateResponse.status}`);
         }
 
+        // Generation runs as a background job (202 + job ID); wait for it to finish
+        const generatedData = generateResponse.status === 202
+            ? await waitForGenerationJob(generateResult.data.status_url, authToken)
+            : generateResult.data;
+
         console.log('✅ Resume generation successful');
 
         // Store generated resume data for manual download
         generatedResumeData = {
-            resume_id: generateResult.data.resume_id,
-            pdf_base64: generateResult.data.pdf_base64,
-            filename: generateResult.data.original_filename || resumeFile.name
+            resume_id: generatedData.resume_id,
+            pdf_url: generatedData.pdf_url,
+            pdf_base64: generatedData.pdf_base64,
+            filename: generatedData.original_filename || resumeFile.name
         };
 
         // Step 3: Auto-download the generated PDF
         console.log('📥 Step 3: Auto-downloading generated PDF...');
         const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
         const downloadFilename = `optimized_resume_${timestamp}.pdf`;
-        downloadPdfFromBase64(generateResult.data.pdf_base64, downloadFilename);
-
-        // Update user data
-        userData.credits -= 1;
-        userData.resumesGenerated = (userData.resumesGenerated || 0) + 1;
-        userData.creditsUsed = (userData.creditsUsed || 0) + 1;
-        localStorage.setItem('userData', JSON.stringify(userData));
+        await downloadGeneratedPdf(generatedData, downloadFilename);
+
+        // Update user data (a cached result is returned without using a credit)
+        if (!generatedData.cached) {
+            userData.credits -= 1;
+            userData.resumesGenerated = (userData.resumesGenerated || 0) + 1;
+            userData.creditsUsed = (userData.creditsUsed || 0) + 1;
+            localStorage.setItem('userData', JSON.stringify(userData));
+        }
 
         toggleLoading(false);
 
@@ -400,11 +482,11 @@ function closeSuccessModal() {
 }
 
 // Manual download from success modal
-function downloadFromModal() {
-    if (generatedResumeData && generatedResumeData.pdf_base64) {
+async function downloadFromModal() {
+    if (generatedResumeData && (generatedResumeData.pdf_url || generatedResumeData.pdf_base64)) {
         const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
         const filename = `optimized_resume_${timestamp}.pdf`;
-        downloadPdfFromBase64(generatedResumeData.pdf_base64, filename);
+        await downloadGeneratedPdf(generatedResumeData, filename);
         showAlert('Download started!', 'success');
     } else {
         showAlert('No resume data available. Please generate a new resume.', 'error');
@@ -427,54 +509,10 @@ async function downloadResumeFromBackend(resumeId) {
 
         console.log(`📥 Downloading resume: ${resumeId}`);
 
-        // Fetch resume from backend
-        const response = await fetch(`/api/resume/download/${resumeId}`, {
-            method: 'GET',
-            headers: {
-                'Authorization': `Bearer ${authToken}`,
-                'Content-Type': 'application/json'
-            }
-        });
-
-        if (!response.ok) {
-            if (response.status === 404) {
-                showAlert('Resume not found', 'error');
-                return;
-            }
-            if (response.status === 401) {
-                showAlert('Authentication failed', 'error');
-                return;
-            }
-            throw new Error(`Download failed: ${response.status}`);
-        }
-
-        const data = await response.json();
+        await downloadPdfFromUrl(`/api/resume/download/${resumeId}`, `resume_${resumeId}.pdf`, authToken);
 
-        if (data.success && data.pdf_data) {
-            // Convert base64 to blob
-            const byteCharacters = atob(data.pdf_data);
-            const byteNumbers = new Array(byteCharacters.length);
-            for (let i = 0; i < byteCharacters.length; i++) {
-                byteNumbers[i] = byteCharacters.charCodeAt(i);
-            }
-            const byteArray = new Uint8Array(byteNumbers);
-            const blob = new Blob([byteArray], { type: 'application/pdf' });
-
-            // Create download link
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = data.filename || `resume_${resumeId}.pdf`;
-            document.body.appendChild(a);
-            a.click();
-            window.URL.revokeObjectURL(url);
-            document.body.removeChild(a);
-
-            showAlert('Download completed successfully!', 'success');
-            console.log('✅ Resume downloaded successfully');
-        } else {
-            showAlert('Failed to download resume', 'error');
-        }
+        showAlert('Download completed successfully!', 'success');
+        console.log('✅ Resume downloaded successfully');
 
     } catch (error) {
         console.error('❌ Download error:', error);
@@ -174,8 +174,11 @@ async function loadUserData() {
     }
 }
 
-// Load resume history from backend
-async function loadResumeHistory() {
+// Resume history is paged by the backend; this is the cursor for the next page
+let resumeHistoryCursor = null;
+
+// Load resume history from backend (append: fetch the next page below the rows already shown)
+async function loadResumeHistory(append = false) {
     try {
         const authToken = localStorage.getItem('authToken');
         if (!authToken) {
@@ -187,7 +190,7 @@ async function loadResumeHistory() {
 
         // Show loading state
         const tableBody = document.getElementById('resumeHistoryTable');
-        if (tableBody) {
+        if (tableBody && !append) {
             tableBody.innerHTML = `
                 <tr>
                     <td colspan="5" style="text-align: center; padding: 2rem; color: #6c757d;">
@@ -201,7 +204,11 @@ async function loadResumeHistory() {
         }
 
         // Fetch resumes from backend
-        const response = await fetch('/api/resume/user-resumes', {
+        let url = '/api/resume/user-resumes';
+        if (append && resumeHistoryCursor) {
+            url += `?cursor=${encodeURIComponent(resumeHistoryCursor)}`;
+        }
+        const response = await fetch(url, {
             method: 'GET',
             headers: {
                 'Authorization': `Bearer ${authToken}`
@@ -239,9 +246,12 @@ async function loadResumeHistory() {
 
         if (result.success && result.data && result.data.resumes && result.data.resumes.length > 0) {
             const resumes = result.data.resumes;
-            safeUpdateElement('totalResumes', resumes.length);
+            resumeHistoryCursor = result.data.next_cursor || null;
+            if (result.data.stats) {
+                safeUpdateElement('totalResumes', result.data.stats.total_resumes);
+            }
 
-            tableBody.innerHTML = resumes.map(resume => {
+            const rows = resumes.map(resume => {
                 const date = new Date(resume.created_at).toLocaleDateString('en-US', {
                     year: 'numeric',
                     month: 'short',
@@ -281,7 +291,32 @@ async function loadResumeHistory() {
                 `;
             }).join('');
 
+            const loadMoreRow = resumeHistoryCursor ? `
+                <tr id="loadMoreResumesRow">
+                    <td colspan="5" style="text-align: center; padding: 1rem;">
+                        <button class="btn btn-secondary" onclick="loadResumeHistory(true)">
+                            <i class="fas fa-chevron-down"></i> Load more
+                        </button>
+                    </td>
+                </tr>
+            ` : '';
+            if (append) {
+                const previousLoadMoreRow = document.getElementById('loadMoreResumesRow');
+                if (previousLoadMoreRow) {
+                    previousLoadMoreRow.remove();
+                }
+                tableBody.insertAdjacentHTML('beforeend', rows + loadMoreRow);
+            } else {
+                tableBody.innerHTML = rows + loadMoreRow;
+            }
+
             console.log(`✅ Loaded ${resumes.length} resumes in profile`);
+        } else if (append) {
+            resumeHistoryCursor = null;
+            const previousLoadMoreRow = document.getElementById('loadMoreResumesRow');
+            if (previousLoadMoreRow) {
+                previousLoadMoreRow.remove();
+            }
         } else {
             safeUpdateElement('totalResumes', '0');
             tableBody.innerHTML = `
@@ -352,9 +387,10 @@ async function downloadResumeFromBackend(resumeId) {
         // Show loading indicator
         showAlert('Preparing download...', 'info');
 
-        // Fetch resume from backend
+        // Fetch resume from backend (revalidated: an unchanged PDF comes from the browser cache via 304)
         const response = await fetch(`/api/resume/download/${resumeId}`, {
             method: 'GET',
+            cache: 'no-cache',
             headers: {
                 'Authorization': `Bearer ${authToken}`
             }